@@ -0,0 +1,101 @@
+"""
+*File Name:* benchmarks/memory_usage.py
+
+Measures the memory used per object and per link, i.e. the memory allocated (as reported by ``tracemalloc``)
+for creating many objects or links divided by their number.
+
+Run it from the repository root, e.g.::
+
+    python -m benchmarks.memory_usage --count 100000
+"""
+import argparse
+import gc
+import tracemalloc
+
+from codeable_models import CMetaclass, CClass, CObject, CBundle, add_links
+
+
+def _measure(create, count):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        elements = create(count)
+        gc.collect()
+        end, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(elements) >= count
+    return (end - start) / count
+
+
+def _objects_without_values(count):
+    cl = CClass(CMetaclass("M"), "C")
+    return [CObject(cl) for _ in range(count)]
+
+
+def _named_objects_with_values(count):
+    cl = CClass(CMetaclass("M"), "C", attributes={"count": int, "name": str})
+    return [CObject(cl, f"o{i!s}", values={"count": i, "name": "object"}) for i in range(count)]
+
+
+def _objects_in_bundle(count):
+    cl = CClass(CMetaclass("M"), "C")
+    bundle = CBundle("B")
+    return [CObject(cl, bundles=bundle) for _ in range(count)]
+
+
+def _links(count):
+    cl = CClass(CMetaclass("M"), "C")
+    association = cl.association(cl, "* -> *")
+    objects = [CObject(cl) for _ in range(count + 1)]
+    gc.collect()
+    start, _ = tracemalloc.get_traced_memory()
+    links = []
+    for source, target in zip(objects, objects[1:]):
+        links.extend(add_links({source: target}, association=association))
+    gc.collect()
+    end, _ = tracemalloc.get_traced_memory()
+    # only the memory for the links is counted, not the memory for the objects
+    return links, end - start
+
+
+def measure_link_memory(count):
+    """Bytes per link (including the link registrations on the linked objects).
+
+    Args:
+        count (int): Number of links to create.
+
+    Returns:
+        float: Bytes per link.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        links, allocated = _links(count)
+    finally:
+        tracemalloc.stop()
+    assert len(links) == count
+    return allocated / count
+
+
+MEASUREMENTS = {
+    "object without values": lambda count: _measure(_objects_without_values, count),
+    "named object with 2 values": lambda count: _measure(_named_objects_with_values, count),
+    "object in a bundle": lambda count: _measure(_objects_in_bundle, count),
+    "link": measure_link_memory,
+}
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Measure memory used per object and per link.")
+    parser.add_argument("--count", type=int, default=100000, help="number of objects or links to create")
+    parsed_args = parser.parse_args(args)
+    print(f"{'element':<30} {'bytes':>10}")
+    print("-" * 41)
+    for name, measure in MEASUREMENTS.items():
+        print(f"{name:<30} {measure(parsed_args.count):>10.0f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+*File Name:* benchmarks/model_generator.py
+
+Generator for synthetic Codeable Models models of configurable size, used by the benchmark scenarios.
+
+The generated model consists of:
+
+- a meta-model of ``metaclasses`` meta-classes, arranged in inheritance chains of depth ``inheritance_depth``,
+  with a recursive meta-class association,
+- ``stereotypes`` stereotypes extending the meta-classes, each defining tagged values,
+- ``classes`` classes, instances of the leaf meta-classes, also arranged in inheritance chains, each with
+  a stereotype instance and tagged values, and associations between neighbouring inheritance chains,
+- ``objects`` objects, evenly distributed over the classes, with attribute values,
+- ``links_per_object`` links from each object to objects of the associated classes.
+
+Each stage can also be generated separately (see ``generate_metamodel()``, ``generate_classes()``,
+``generate_objects()``, and ``generate_links()``), so that a benchmark can measure a single stage.
+The generated models are deterministic for a given ``seed``.
+"""
+import random
+
+from codeable_models import CMetaclass, CStereotype, CClass, CObject, add_links
+
+
+class SyntheticModel(object):
+    def __init__(self, inheritance_depth=3, seed=0):
+        """Container for the elements of a generated model.
+
+        Args:
+            inheritance_depth (int): Depth of the inheritance chains of meta-classes and classes.
+            seed: Seed for the random choices made during generation.
+        """
+        self.inheritance_depth = inheritance_depth
+        self.random = random.Random(seed)
+        self.metaclasses = []
+        self.stereotypes = []
+        self.classes = []
+        self.associations = []
+        self.objects = []
+        self.links = []
+
+    @property
+    def leaf_metaclasses(self):
+        """list[CMetaclass]: The meta-classes at the end of an inheritance chain."""
+        return [mcl for mcl in self.metaclasses if not mcl.subclasses]
+
+    @property
+    def leaf_classes(self):
+        """list[CClass]: The classes at the end of an inheritance chain."""
+        return [cl for cl in self.classes if not cl.subclasses]
+
+    @property
+    def number_of_elements(self):
+        """int: The number of generated elements."""
+        return (len(self.metaclasses) + len(self.stereotypes) + len(self.classes) + len(self.associations) +
+                len(self.objects) + len(self.links))
+
+
+def _inheritance_chain_superclass(elements, index, inheritance_depth):
+    if inheritance_depth > 1 and index % inheritance_depth != 0:
+        return elements[index - 1]
+    return None
+
+
+def generate_metamodel(model, metaclasses=10, stereotypes=5):
+    """Generate the meta-classes and stereotypes of the model.
+
+    Args:
+        model (SyntheticModel): The model to add the elements to.
+        metaclasses (int): Number of meta-classes.
+        stereotypes (int): Number of stereotypes.
+
+    Returns:
+        SyntheticModel: The model.
+    """
+    for i in range(metaclasses):
+        superclass = _inheritance_chain_superclass(model.metaclasses, i, model.inheritance_depth)
+        model.metaclasses.append(CMetaclass(f"M{i!s}", superclasses=superclass, attributes={
+            f"m{i!s}_size": 0,
+            f"m{i!s}_kind": "default"
+        }))
+    if metaclasses > 0:
+        model.associations.append(model.metaclasses[0].association(model.metaclasses[0], "uses: * -> *"))
+    leaf_metaclasses = model.leaf_metaclasses
+    for i in range(stereotypes):
+        if not leaf_metaclasses:
+            break
+        model.stereotypes.append(CStereotype(f"S{i!s}", extended=leaf_metaclasses[i % len(leaf_metaclasses)],
+                                             attributes={
+                                                 "priority": 1,
+                                                 "owner": "nobody"
+                                             }))
+    return model
+
+
+def generate_classes(model, classes=100):
+    """Generate classes of the leaf meta-classes of the model, with stereotype instances and tagged values,
+    as well as associations between neighbouring inheritance chains of classes.
+
+    Args:
+        model (SyntheticModel): The model to add the elements to. Requires a generated meta-model.
+        classes (int): Number of classes.
+
+    Returns:
+        SyntheticModel: The model.
+    """
+    leaf_metaclasses = model.leaf_metaclasses
+    start = len(model.classes)
+    for i in range(start, start + classes):
+        # all classes of an inheritance chain are instances of the same meta-class
+        chain = i // max(model.inheritance_depth, 1)
+        metaclass = leaf_metaclasses[chain % len(leaf_metaclasses)]
+        stereotypes = metaclass.stereotypes
+        stereotype = stereotypes[i % len(stereotypes)] if stereotypes else None
+        superclass = _inheritance_chain_superclass(model.classes, i, model.inheritance_depth)
+        cl = CClass(metaclass, f"C{i!s}", superclasses=superclass, attributes={
+            f"c{i!s}_count": int,
+            f"c{i!s}_name": str,
+            f"c{i!s}_weight": 1.0
+        }, stereotype_instances=stereotype)
+        if stereotype is not None:
+            cl.set_tagged_value("priority", model.random.randint(1, 10))
+        model.classes.append(cl)
+    leaf_classes = model.leaf_classes
+    for source, target in zip(leaf_classes, leaf_classes[1:]):
+        model.associations.append(source.association(target, f"{source.name!s}_{target.name!s}: * -> *"))
+    return model
+
+
+def generate_objects(model, objects=1000):
+    """Generate objects of the leaf classes of the model with attribute values.
+
+    Args:
+        model (SyntheticModel): The model to add the elements to. Requires generated classes.
+        objects (int): Number of objects.
+
+    Returns:
+        SyntheticModel: The model.
+    """
+    leaf_classes = model.leaf_classes
+    # the attributes are defined on the first class of the inheritance chain
+    attribute_prefixes = [cl.class_path[-1].name.lower() for cl in leaf_classes]
+    start = len(model.objects)
+    for i in range(start, start + objects):
+        cl = leaf_classes[i % len(leaf_classes)]
+        prefix = attribute_prefixes[i % len(leaf_classes)]
+        obj = CObject(cl, f"o{i!s}")
+        obj.set_value(f"{prefix!s}_count", i)
+        obj.set_value(f"{prefix!s}_name", f"object {i!s}")
+        model.objects.append(obj)
+    return model
+
+
+def generate_links(model, links_per_object=2):
+    """Generate links from each object of the model to objects of the classes associated with its class.
+
+    Args:
+        model (SyntheticModel): The model to add the elements to. Requires generated objects.
+        links_per_object (int): Number of links created per object (if enough target objects exist).
+
+    Returns:
+        SyntheticModel: The model.
+    """
+    for association in model.associations:
+        if isinstance(association.source, CMetaclass):
+            continue
+        sources = association.source.objects
+        targets = association.target.objects
+        if not targets:
+            continue
+        for i, source in enumerate(sources):
+            link_targets = []
+            for j in range(min(links_per_object, len(targets))):
+                link_targets.append(targets[(i + j) % len(targets)])
+            model.links.extend(add_links({source: link_targets}, association=association))
+    return model
+
+
+def generate_model(metaclasses=10, inheritance_depth=3, stereotypes=5, classes=100, objects=1000,
+                   links_per_object=2, seed=0):
+    """Generate a complete synthetic model.
+
+    Args:
+        metaclasses (int): Number of meta-classes.
+        inheritance_depth (int): Depth of the inheritance chains of meta-classes and classes.
+        stereotypes (int): Number of stereotypes.
+        classes (int): Number of classes.
+        objects (int): Number of objects.
+        links_per_object (int): Number of links created per object.
+        seed: Seed for the random choices made during generation.
+
+    Returns:
+        SyntheticModel: The generated model.
+    """
+    model = SyntheticModel(inheritance_depth, seed)
+    generate_metamodel(model, metaclasses, stereotypes)
+    generate_classes(model, classes)
+    generate_objects(model, objects)
+    generate_links(model, links_per_object)
+    return model
@@ -0,0 +1,136 @@
+"""
+*File Name:* benchmarks/run_benchmarks.py
+
+Runs the benchmark scenarios (see :py:mod:`benchmarks.scenarios`) for one or more model sizes and reports the
+time taken, the operations per second, and the peak memory allocated while running each scenario.
+
+Run it from the repository root, e.g.::
+
+    python -m benchmarks.run_benchmarks --sizes 10000 100000 --scenarios create_objects add_links_per_source
+
+Use ``--list`` to list the available scenarios. Peak memory is measured with ``tracemalloc`` in a separate
+run of each scenario, as tracing slows down the measured code; use ``--no-memory`` to skip it.
+"""
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+
+from benchmarks.scenarios import SCENARIOS
+
+
+class BenchmarkResult(object):
+    def __init__(self, scenario, size, operations, seconds, peak_memory):
+        """Result of running a benchmark scenario.
+
+        Args:
+            scenario (str): The scenario name.
+            size (int): The model size the scenario was run with.
+            operations (int): The number of operations performed.
+            seconds (float): The time taken to perform the operations.
+            peak_memory (int): The peak memory in bytes allocated while performing the operations,
+                or ``None`` if not measured.
+        """
+        self.scenario = scenario
+        self.size = size
+        self.operations = operations
+        self.seconds = seconds
+        self.peak_memory = peak_memory
+
+    @property
+    def operations_per_second(self):
+        """float: Operations per second."""
+        if self.seconds == 0:
+            return float("inf")
+        return self.operations / self.seconds
+
+    def __str__(self):
+        peak_memory = "-" if self.peak_memory is None else f"{self.peak_memory / (1024 * 1024):.1f}"
+        return (f"{self.scenario:<24} {self.size:>9} {self.operations:>10} {self.seconds:>9.3f} "
+                f"{self.operations_per_second:>12.0f} {peak_memory:>10}")
+
+
+RESULT_HEADER = (f"{'scenario':<24} {'size':>9} {'ops':>10} {'seconds':>9} {'ops/s':>12} {'peak MiB':>10}\n" +
+                 "-" * 79)
+
+
+def _measure_time(scenario_function, size):
+    run = scenario_function(size)
+    gc.collect()
+    start = time.perf_counter()
+    operations = run()
+    return operations, time.perf_counter() - start
+
+
+def _measure_peak_memory(scenario_function, size):
+    run = scenario_function(size)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_scenario(name, size, measure_memory=True):
+    """Run a scenario with the given model size.
+
+    Args:
+        name (str): The scenario name.
+        size (int): The model size (number of objects).
+        measure_memory (bool): If ``True``, the peak memory is measured in a separate run.
+
+    Returns:
+        BenchmarkResult: The result.
+    """
+    scenario_function = SCENARIOS[name]
+    operations, seconds = _measure_time(scenario_function, size)
+    peak_memory = _measure_peak_memory(scenario_function, size) if measure_memory else None
+    return BenchmarkResult(name, size, operations, seconds, peak_memory)
+
+
+def run_benchmarks(sizes, scenario_names=None, measure_memory=True, output=sys.stdout):
+    """Run the scenarios for all sizes and print the results.
+
+    Args:
+        sizes (list[int]): The model sizes.
+        scenario_names (list[str]): The scenarios to run. If ``None``, all scenarios are run.
+        measure_memory (bool): If ``True``, the peak memory is measured.
+        output: File to print the results to.
+
+    Returns:
+        list[BenchmarkResult]: The results.
+    """
+    if scenario_names is None:
+        scenario_names = list(SCENARIOS)
+    results = []
+    print(RESULT_HEADER, file=output)
+    for size in sizes:
+        for name in scenario_names:
+            result = run_scenario(name, size, measure_memory)
+            print(result, file=output, flush=True)
+            results.append(result)
+    return results
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Run Codeable Models benchmarks on synthetic models.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000],
+                        help="model sizes (number of objects) to run the scenarios with")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=None,
+                        help="scenarios to run (default: all)")
+    parser.add_argument("--no-memory", action="store_true", help="do not measure peak memory")
+    parser.add_argument("--list", action="store_true", help="list the available scenarios")
+    parsed_args = parser.parse_args(args)
+    if parsed_args.list:
+        for name in SCENARIOS:
+            print(name)
+        return
+    run_benchmarks(parsed_args.sizes, parsed_args.scenarios, not parsed_args.no_memory)
+
+
+if __name__ == "__main__":
+    main()
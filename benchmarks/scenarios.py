@@ -0,0 +1,332 @@
+"""
+*File Name:* benchmarks/scenarios.py
+
+Timed benchmark scenarios on synthetic models (see :py:mod:`benchmarks.model_generator`).
+
+Each scenario is a function taking the model ``size`` (the number of objects; the numbers of other elements
+are derived from it). It performs all setup that shall not be measured, and returns a function that runs the
+measured operations and returns the number of operations performed. All scenarios are registered in
+``SCENARIOS`` by name.
+"""
+import os
+import tempfile
+
+from codeable_models import CClass, CObject, CStereotype, add_links, save_snapshot, load_snapshot, save_mapped_snapshot, \
+    open_mapped_snapshot, compile_path
+from plant_uml_renderer import ClassModelRenderer, ObjectModelRenderer
+from benchmarks.model_generator import SyntheticModel, generate_metamodel, generate_classes, generate_objects, \
+    generate_links, generate_model
+
+# rendering creates views that are orders of magnitude smaller than the models, so the size of the rendered
+# views is limited
+MAX_RENDERED_ELEMENTS = 5000
+# meta-model diagrams are rendered with all classifiers of large meta-models
+MAX_RENDERED_CLASSIFIERS = 10000
+
+
+def _number_of_classes(size):
+    return max(size // 100, 10)
+
+
+def _generate_model(size, links_per_object=2):
+    return generate_model(classes=_number_of_classes(size), objects=size, links_per_object=links_per_object)
+
+
+def create_classes(size):
+    model = SyntheticModel()
+    generate_metamodel(model)
+    number_of_classes = max(size // 10, 10)
+
+    def run():
+        generate_classes(model, number_of_classes)
+        return number_of_classes
+
+    return run
+
+
+def create_objects(size):
+    model = SyntheticModel()
+    generate_metamodel(model)
+    generate_classes(model, _number_of_classes(size))
+
+    def run():
+        generate_objects(model, size)
+        return size
+
+    return run
+
+
+def create_objects_in_bulk(size):
+    model = SyntheticModel()
+    generate_metamodel(model)
+    generate_classes(model, _number_of_classes(size))
+    leaf_classes = model.leaf_classes
+    objects_per_class = max(size // len(leaf_classes), 1)
+
+    def run():
+        for cl in leaf_classes:
+            chain_root = cl.class_path[-1].name.lower()
+            cl.create_objects([f"o{i!s}" for i in range(objects_per_class)], columns={
+                f"{chain_root!s}_count": range(objects_per_class),
+                f"{chain_root!s}_name": [f"object {i!s}" for i in range(objects_per_class)]
+            })
+        return objects_per_class * len(leaf_classes)
+
+    return run
+
+
+def get_values(size):
+    model = _generate_model(size, links_per_object=0)
+    attributes = [(obj, f"{obj.classifier.class_path[-1].name.lower()!s}") for obj in model.objects]
+
+    def run():
+        for obj, prefix in attributes:
+            obj.get_value(f"{prefix!s}_count")
+            obj.get_value(f"{prefix!s}_weight")
+        return 2 * len(attributes)
+
+    return run
+
+
+def set_values(size):
+    model = _generate_model(size, links_per_object=0)
+    attributes = [(obj, f"{obj.classifier.class_path[-1].name.lower()!s}") for obj in model.objects]
+
+    def run():
+        for i, (obj, prefix) in enumerate(attributes):
+            obj.set_value(f"{prefix!s}_count", i + 1)
+            obj.set_value(f"{prefix!s}_weight", 0.5)
+        return 2 * len(attributes)
+
+    return run
+
+
+def get_tagged_values(size):
+    model = SyntheticModel()
+    generate_metamodel(model)
+    generate_classes(model, max(size // 10, 10))
+    classes = [cl for cl in model.classes if cl.stereotype_instances]
+
+    def run():
+        for cl in classes:
+            cl.get_tagged_value("priority")
+        return len(classes)
+
+    return run
+
+
+def add_links_per_source(size):
+    model = _generate_model(size, links_per_object=0)
+
+    def run():
+        generate_links(model, links_per_object=2)
+        return len(model.links)
+
+    return run
+
+
+def add_links_at_once(size):
+    model = _generate_model(size, links_per_object=0)
+    link_definitions = []
+    for association in model.associations:
+        if isinstance(association.source, CClass):
+            targets = association.target.objects
+            if targets:
+                link_definitions.append(({source: [targets[i % len(targets)], targets[(i + 1) % len(targets)]]
+                                          for i, source in enumerate(association.source.objects)}, association))
+
+    def run():
+        number_of_links = 0
+        for definitions, association in link_definitions:
+            number_of_links += len(add_links(definitions, association=association))
+        return number_of_links
+
+    return run
+
+
+def get_linked(size):
+    model = _generate_model(size)
+
+    def run():
+        for obj in model.objects:
+            obj.get_linked()
+        return len(model.objects)
+
+    return run
+
+
+def navigate_paths(size):
+    # navigates two steps from each object, i.e., to the objects linked to its linked objects
+    model = _generate_model(size)
+    path = compile_path("*/*")
+
+    def run():
+        for obj in model.objects:
+            path.evaluate(obj)
+        return len(model.objects)
+
+    return run
+
+
+def get_connected_elements(size):
+    model = _generate_model(size)
+    start = model.objects[0]
+
+    def run():
+        return len(start.get_connected_elements())
+
+    return run
+
+
+def delete_objects(size):
+    model = _generate_model(size)
+
+    def run():
+        for obj in model.objects:
+            obj.delete()
+        return len(model.objects) + len(model.links)
+
+    return run
+
+
+def delete_classes(size):
+    model = _generate_model(size)
+
+    def run():
+        # deletes all objects and links of the classes, too
+        for cl in model.classes:
+            cl.delete()
+        return len(model.classes) + len(model.objects) + len(model.links)
+
+    return run
+
+
+def delete_metaclasses(size):
+    model = _generate_model(size)
+
+    def run():
+        # deletes all classes, objects, and links of the meta-classes, too
+        for mcl in model.metaclasses:
+            mcl.delete()
+        return model.number_of_elements - len(model.stereotypes)
+
+    return run
+
+
+def _temporary_file_name():
+    file_descriptor, file_name = tempfile.mkstemp(suffix=".cmsnap")
+    os.close(file_descriptor)
+    return file_name
+
+
+def save_model_snapshot(size):
+    model = _generate_model(size)
+    file_name = _temporary_file_name()
+
+    def run():
+        save_snapshot(file_name, model.metaclasses)
+        os.remove(file_name)
+        return model.number_of_elements
+
+    return run
+
+
+def load_model_snapshot(size):
+    model = _generate_model(size)
+    file_name = _temporary_file_name()
+    save_snapshot(file_name, model.metaclasses)
+
+    def run():
+        load_snapshot(file_name)
+        os.remove(file_name)
+        return model.number_of_elements
+
+    return run
+
+
+def query_mapped_snapshot(size):
+    # opens a mapped snapshot of the model and navigates from a few objects found by name
+    model = _generate_model(size)
+    file_name = _temporary_file_name()
+    save_mapped_snapshot(file_name, model.classes)
+    names = [obj.name for obj in model.objects[::max(len(model.objects) // 100, 1)]]
+
+    def run():
+        with open_mapped_snapshot(file_name) as snapshot:
+            for name in names:
+                for obj in snapshot.get_objects(name):
+                    for linked in obj.linked:
+                        linked.values
+        os.remove(file_name)
+        return len(names)
+
+    return run
+
+
+def render_class_model(size):
+    model = SyntheticModel()
+    generate_metamodel(model)
+    generate_classes(model, min(max(size // 10, 10), MAX_RENDERED_ELEMENTS))
+    renderer = ClassModelRenderer()
+    elements = model.metaclasses + model.stereotypes + model.classes
+
+    def run():
+        renderer.render_class_model(elements)
+        return len(elements)
+
+    return run
+
+
+def render_metamodel(size):
+    model = SyntheticModel()
+    metaclasses = min(size, MAX_RENDERED_CLASSIFIERS)
+    generate_metamodel(model, metaclasses, stereotypes=metaclasses // 10)
+    leaf_metaclasses = model.leaf_metaclasses
+    for i, (source, target) in enumerate(zip(leaf_metaclasses, leaf_metaclasses[1:])):
+        association = source.association(target, f"{source.name!s}_{target.name!s}: * -> *")
+        model.associations.append(association)
+        if i % 10 == 0:
+            model.stereotypes.append(CStereotype(f"AS{i!s}", extended=association))
+    renderer = ClassModelRenderer()
+    elements = model.metaclasses + model.stereotypes
+
+    def run():
+        renderer.render_class_model(elements)
+        return len(elements)
+
+    return run
+
+
+def render_object_model(size):
+    model = _generate_model(min(size, MAX_RENDERED_ELEMENTS))
+    renderer = ObjectModelRenderer()
+
+    def run():
+        renderer.render_object_model(model.objects)
+        return len(model.objects)
+
+    return run
+
+
+SCENARIOS = {
+    "create_classes": create_classes,
+    "create_objects": create_objects,
+    "create_objects_in_bulk": create_objects_in_bulk,
+    "get_values": get_values,
+    "set_values": set_values,
+    "get_tagged_values": get_tagged_values,
+    "add_links_per_source": add_links_per_source,
+    "add_links_at_once": add_links_at_once,
+    "get_linked": get_linked,
+    "navigate_paths": navigate_paths,
+    "get_connected_elements": get_connected_elements,
+    "delete_objects": delete_objects,
+    "delete_classes": delete_classes,
+    "delete_metaclasses": delete_metaclasses,
+    "save_model_snapshot": save_model_snapshot,
+    "load_model_snapshot": load_model_snapshot,
+    "query_mapped_snapshot": query_mapped_snapshot,
+    "render_class_model": render_class_model,
+    "render_metamodel": render_metamodel,
+    "render_object_model": render_object_model,
+}
@@ -41,3 +41,11 @@ from codeable_models.cenum import CEnum
 from codeable_models.cbundle import CBundle, CPackage, CLayer
 from codeable_models.cassociation import CAssociation
 from codeable_models.clink import CLink, set_links, add_links, delete_links
+from codeable_models.ctransaction import CTransaction, model_transaction
+from codeable_models.cevents import CModelEvent, CValueChanged, CLinkAdded, CLinkDeleted, CStereotypesChanged, \
+    CBundleElementAdded, CBundleElementRemoved, CSuperclassesChanged, subscribe, unsubscribe, batched_events
+from codeable_models.csnapshot import save_snapshot, load_snapshot
+from codeable_models.cndjson import export_ndjson, import_ndjson
+from codeable_models.cmapped_snapshot import CMappedSnapshot, CMappedClass, CMappedAssociation, CMappedObject, \
+    CMappedLink, save_mapped_snapshot, open_mapped_snapshot
+from codeable_models.cnavigation import CPath, compile_path, navigate
@@ -3,7 +3,7 @@ import re
 from codeable_models.cexception import CException
 from codeable_models.cclassifier import CClassifier
 from codeable_models.internal.commons import is_cmetaclass, is_cstereotype, is_cassociation, check_is_cmetaclass, \
-    check_is_cclass
+    check_is_cclass, KIND_ASSOCIATION
 from codeable_models.internal.stereotype_holders import CStereotypesHolder, CStereotypeInstancesHolder
 from codeable_models.internal.var_values import get_var_value, VarValueKind, delete_var_value, set_var_value, \
     get_var_values, set_var_values
@@ -25,6 +25,8 @@ def _check_for_classifier_and_role_name_match(classifier, role_name, association
 
 
 class CAssociation(CClassifier):
+    kind_ = KIND_ASSOCIATION
+
     STAR_MULTIPLICITY = -1
 
     def __init__(self, source, target, descriptor=None, **kwargs):
@@ -129,8 +131,8 @@ class CAssociation(CClassifier):
         """
         self.source = source
         self.target = target
-        self.role_name = None
-        self.source_role_name = None
+        self.role_name_ = None
+        self.source_role_name_ = None
         self.source_multiplicity_ = "1"
         self.source_lower_multiplicity = 1
         self.source_upper_multiplicity = 1
@@ -145,17 +147,18 @@ class CAssociation(CClassifier):
         self.stereotype_instances_holder = CStereotypeInstancesHolder(self)
         self.tagged_values_ = {}
         # we set the name here already so that either the name=... name or the descriptor name go into
-        # super().__init__(self.name, ...)
-        self.name = kwargs.pop("name", None)
+        # super().__init__(self.name_, ...)
+        self.name_ = kwargs.pop("name", None)
         self.ends = None
         if descriptor is not None:
-            # note that descriptor might overwrite self.name, if it has the form "name: ..."
+            # note that descriptor might overwrite self.name_, if it has the form "name: ..."
             self._eval_descriptor(descriptor)
-        super().__init__(self.name, **kwargs)
+        super().__init__(self.name_, **kwargs)
 
         source.associations_.append(self)
         if source != target:
             target.associations_.append(self)
+        self.associations_changed_()
 
     def _init_keyword_args(self, legal_keyword_args=None, **kwargs):
         if legal_keyword_args is None:
@@ -199,10 +202,11 @@ class CAssociation(CClassifier):
         return False
 
     def matches_target_(self, classifier, role_name):
-        return _check_for_classifier_and_role_name_match(classifier, role_name, self.target, self.role_name)
+        return _check_for_classifier_and_role_name_match(classifier, role_name, self.target, self.role_name_)
 
     def matches_source_(self, classifier, role_name):
-        return _check_for_classifier_and_role_name_match(classifier, role_name, self.source, self.source_role_name)
+        return _check_for_classifier_and_role_name_match(classifier, role_name, self.source,
+                                                         self.source_role_name_)
 
     @property
     def aggregation(self):
@@ -266,6 +270,32 @@ class CAssociation(CClassifier):
             self.source_upper_multiplicity = upper
             self.source_lower_multiplicity = lower
 
+    @property
+    def role_name(self):
+        """str: Getter and setter for the target role name of the association."""
+        return self.role_name_
+
+    @role_name.setter
+    def role_name(self, role_name):
+        self.role_name_ = role_name
+        self.associations_changed_()
+
+    @property
+    def source_role_name(self):
+        """str: Getter and setter for the source role name of the association."""
+        return self.source_role_name_
+
+    @source_role_name.setter
+    def source_role_name(self, role_name):
+        self.source_role_name_ = role_name
+        self.associations_changed_()
+
+    @staticmethod
+    def associations_changed_():
+        # associations are resolved based on their ends and role names (e.g., in add_links()), so changes to
+        # them are structural changes of the classifiers
+        CClassifier.structure_version_ += 1
+
     @property
     def multiplicity(self):
         """str: Getter and setter for the target multiplicity of the association. The multiplicity string
@@ -343,7 +373,7 @@ class CAssociation(CClassifier):
         """
         if self.is_deleted:
             raise CException(f"can't get tagged value '{name!s}' on deleted link")
-        return get_var_value(self, self.stereotype_instances_holder.get_stereotype_instance_path(), self.tagged_values_,
+        return get_var_value(self, self.stereotype_instances_holder.get_attribute_table(), self.tagged_values_,
                              name, VarValueKind.TAGGED_VALUE, stereotype)
 
     def delete_tagged_value(self, name, stereotype=None):
@@ -360,7 +390,7 @@ class CAssociation(CClassifier):
         """
         if self.is_deleted:
             raise CException(f"can't delete tagged value '{name!s}' on deleted link")
-        return delete_var_value(self, self.stereotype_instances_holder.get_stereotype_instance_path(),
+        return delete_var_value(self, self.stereotype_instances_holder.get_attribute_table(),
                                 self.tagged_values_, name, VarValueKind.TAGGED_VALUE, stereotype)
 
     def set_tagged_value(self, name, value, stereotype=None):
@@ -378,7 +408,7 @@ class CAssociation(CClassifier):
         """
         if self.is_deleted:
             raise CException(f"can't set tagged value '{name!s}' on deleted link")
-        return set_var_value(self, self.stereotype_instances_holder.get_stereotype_instance_path(), self.tagged_values_,
+        return set_var_value(self, self.stereotype_instances_holder.get_attribute_table(), self.tagged_values_,
                              name, value, VarValueKind.TAGGED_VALUE, stereotype)
 
     @property
@@ -436,8 +466,8 @@ class CAssociation(CClassifier):
         for derived_association in metaclass_association.derived_associations:
             if derived_association == self:
                 continue
-            if self.source in derived_association.source.class_path and \
-                    self.target in derived_association.target.class_path:
+            if self.source in derived_association.source.get_class_path_() and \
+                    self.target in derived_association.target.get_class_path_():
                 if upper_multiplicity != CAssociation.STAR_MULTIPLICITY:
                     if derived_association.upper_multiplicity == CAssociation.STAR_MULTIPLICITY:
                         upper_multiplicity = CAssociation.STAR_MULTIPLICITY
@@ -458,8 +488,8 @@ class CAssociation(CClassifier):
             # but, by adding another association that is composed out of superclasses of self's source and target,
             # a violation is created:
             #        c3.association(c4, "a1: [c3] 1 -> [c4] *", derived_from=a)
-            if derived_association.source in self.source.all_superclasses and \
-                    derived_association.target in self.target.all_superclasses:
+            if derived_association.source in self.source.get_all_superclasses_() and \
+                    derived_association.target in self.target.get_all_superclasses_():
                 other_derived_associations_requiring_checking.append(derived_association)
 
         # Check each multiplicity value (lower and upper for source and target multiplicities)
@@ -596,12 +626,13 @@ class CAssociation(CClassifier):
         self.source.associations_.remove(self)
         if self.source != self.target:
             self.target.associations_.remove(self)
+        self.associations_changed_()
         for s in self.stereotypes_holder.stereotypes:
             s.extended_.remove(self)
-        self.stereotypes_holder.stereotypes_ = []
+        self.stereotypes_holder.reset_stereotypes_()
         for si in self.stereotype_instances:
             si.extended_instances_.remove(self)
-        self.stereotype_instances_holder.stereotypes_ = []
+        self.stereotype_instances_holder.reset_stereotypes_()
         if self.derived_from_ is not None:
             self.derived_from_.derived_associations_.remove(self)
             self.derived_from_ = None
@@ -636,7 +667,7 @@ class CAssociation(CClassifier):
         if index != -1:
             name = descriptor[0:index]
             descriptor = descriptor[index + 1:]
-            self.name = name.strip()
+            self.name_ = name.strip()
 
         # handle type of relation
         aggregation = False
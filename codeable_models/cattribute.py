@@ -2,6 +2,10 @@ from codeable_models.internal.commons import *
 
 
 class CAttribute(object):
+    __slots__ = ("name_", "classifier_", "type_", "default_")
+    # CAttribute is not a named element, but has a kind tag for the type checks (see internal/commons.py)
+    kinds_ = KIND_ATTRIBUTE
+
     def __init__(self, **kwargs):
         """``CAttribute`` is internally used for storing attributes, and can be used by the user for
         detailed setting or introspection of attribute data.
@@ -74,7 +78,7 @@ class CAttribute(object):
                 if self.default_ not in new_type.values:
                     self._wrong_default_exception(self.default_, new_type)
             elif is_cclassifier(new_type):
-                if (not self.default_ == new_type) and (new_type not in new_type.all_superclasses):
+                if (not self.default_ == new_type) and (new_type not in new_type.get_all_superclasses_()):
                     self._wrong_default_exception(self.default_, new_type)
             else:
                 if not isinstance(self.default_, new_type):
@@ -124,7 +128,7 @@ class CAttribute(object):
         if attr_type is None:
             raise CException(f"value for attribute '{name!s}' is not a known attribute type")
         if is_cclassifier(attr_type):
-            if attr_type != self.type_ and (self.type_ not in attr_type.all_superclasses):
+            if attr_type != self.type_ and (self.type_ not in attr_type.get_all_superclasses_()):
                 raise CException(f"type of '{value!s}' is not matching type of attribute '{name!s}'")
             return
         if attr_type != self.type_:
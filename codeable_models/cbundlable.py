@@ -1,10 +1,15 @@
+from codeable_models import cevents, ctransaction
 from codeable_models.cexception import CException
 from codeable_models.cnamedelement import CNamedElement
 from codeable_models.internal.commons import set_keyword_args, check_named_element_is_not_deleted, is_cbundle, \
-    is_cmetaclass, is_cstereotype, is_cbundlable, is_cassociation, is_cclass, is_cobject, is_clink
+    is_cbundlable, EMPTY_SEQUENCE, KIND_BUNDLABLE, KIND_BUNDLE, KIND_METACLASS, KIND_STEREOTYPE, KIND_CLASS, \
+    KIND_ASSOCIATION, KIND_OBJECT, KIND_LINK
 
 
 class CBundlable(CNamedElement):
+    __slots__ = ("bundles_",)
+    kind_ = KIND_BUNDLABLE
+
     def __init__(self, name, **kwargs):
         """``CBundlable`` is a superclass for all elements in Codeable Models that can be placed in a
         :py:class:`.CBundle`, which is used for grouping elements. Elements that can be bundled are
@@ -22,7 +27,10 @@ class CBundlable(CNamedElement):
 
         .. image:: ../images/bundles_model.png
         """
-        self.bundles_ = []
+        # most elements are in no bundle, so the list of bundles is only allocated when needed
+        self.bundles_ = EMPTY_SEQUENCE
+        if ctransaction.active_transaction_ is not None:
+            ctransaction.active_transaction_.element_created_(self)
         super().__init__(name, **kwargs)
 
     def _init_keyword_args(self, legal_keyword_args=None, **kwargs):
@@ -44,9 +52,8 @@ class CBundlable(CNamedElement):
     def bundles(self, bundles):
         if bundles is None:
             bundles = []
-        for b in self.bundles_:
+        for b in list(self.bundles_):
             b.remove(self)
-        self.bundles_ = []
         if is_cbundle(bundles):
             bundles = [bundles]
         elif not isinstance(bundles, list):
@@ -57,8 +64,11 @@ class CBundlable(CNamedElement):
             check_named_element_is_not_deleted(b)
             if b in self.bundles_:
                 raise CException(f"'{b.name!s}' is already a bundle of '{self.name!s}'")
-            self.bundles_.append(b)
-            b.elements_.append(self)
+            self.add_bundle_(b)
+            b.elements_[self] = None
+            b.elements_index_.add(self)
+            if cevents.has_subscribers_:
+                cevents.emit_(cevents.CBundleElementAdded(b, self))
 
     def delete(self):
         """
@@ -73,9 +83,24 @@ class CBundlable(CNamedElement):
         bundles_to_delete = list(self.bundles_)
         for b in bundles_to_delete:
             b.remove(self)
-        self.bundles_ = []
         super().delete()
 
+    def add_bundle_(self, bundle):
+        if self.bundles_ is EMPTY_SEQUENCE:
+            self.bundles_ = [bundle]
+        else:
+            self.bundles_.append(bundle)
+
+    def remove_bundle_(self, bundle):
+        self.bundles_.remove(bundle)
+        if len(self.bundles_) == 0:
+            self.bundles_ = EMPTY_SEQUENCE
+
+    def name_changed_(self, old_name):
+        super().name_changed_(old_name)
+        for b in self.bundles_:
+            b.elements_index_.rename(self, old_name)
+
     def get_connected_elements(self, **kwargs):
         """Get all elements this element is connected to.
 
@@ -122,47 +147,59 @@ class CBundlable(CNamedElement):
             (i.e., the link objects) are included
             in the returned list. The option is only applicable on :py:class:`.CObject` and  :py:class:`CLink`.
         """
+        return list(self.iter_connected_elements(**kwargs))
+
+    def iter_connected_elements(self, **kwargs):
+        """Get a generator that yields all elements this element is connected to, in the order in which they are
+        discovered. Yields the same elements in the same order as returned by ``get_connected_elements()``.
+
+        Args:
+            **kwargs: Configuration parameters for the method, as described for ``get_connected_elements()``.
+
+        Returns:
+            Iterator[CBundlable]: Generator of connected elements.
+        """
         context = ConnectedElementsContext()
 
         allowed_keyword_args = ["add_bundles", "process_bundles", "stop_elements_inclusive",
                                 "stop_elements_exclusive"]
-        if is_cmetaclass(self) or is_cbundle(self) or is_cstereotype(self):
+        if self.kinds_ & (KIND_METACLASS | KIND_BUNDLE | KIND_STEREOTYPE):
             allowed_keyword_args = ["add_stereotypes", "process_stereotypes"] + allowed_keyword_args
-        if is_cmetaclass(self) or is_cclass(self) or is_cassociation(self):
+        if self.kinds_ & (KIND_METACLASS | KIND_CLASS | KIND_ASSOCIATION):
             allowed_keyword_args = ["add_associations"] + allowed_keyword_args
-        if is_cobject(self) or is_clink(self):
+        if self.kinds_ & KIND_OBJECT:
             allowed_keyword_args = ["add_links"] + allowed_keyword_args
 
         set_keyword_args(context, allowed_keyword_args, **kwargs)
+        # keyword args are checked above, the traversal starts when the generator is first used
+        return self._traverse_connected(context)
 
-        if self in context.stop_elements_exclusive:
-            return []
-        context.elements.append(self)
-        self.compute_connected_(context)
-        if not context.add_bundles:
-            context.elements = [elt for elt in context.elements if not is_cbundle(elt)]
-        if not context.add_stereotypes:
-            context.elements = [elt for elt in context.elements if not is_cstereotype(elt)]
-        if not context.add_associations:
-            context.elements = [elt for elt in context.elements if not is_cassociation(elt)]
-        if not context.add_links:
-            context.elements = [elt for elt in context.elements if not is_clink(elt)]
-        return context.elements
-
-    @staticmethod
-    def append_connected_(context, connected):
-        for c in connected:
-            if c not in context.elements:
-                context.elements.append(c)
-                if c not in context.all_stop_elements:
-                    c.compute_connected_(context)
+    def _traverse_connected(self, context):
+        # iterative depth-first traversal: the stack holds an iterator over the connected elements of each
+        # element on the current path, so that the elements are found in preorder, just like in a recursive
+        # traversal visiting the connected elements in the order returned by compute_connected_()
+        if self in context.excluded_elements:
+            return
+        visited = {self}
+        if context.is_included(self):
+            yield self
+        stack = [iter(self.compute_connected_(context))]
+        while stack:
+            for element in stack[-1]:
+                if element not in visited:
+                    visited.add(element)
+                    if context.is_included(element):
+                        yield element
+                    if element not in context.all_stop_elements:
+                        stack.append(iter(element.compute_connected_(context)))
+                    break
+            else:
+                stack.pop()
 
     def compute_connected_(self, context):
-        connected = []
-        for bundle in self.bundles_:
-            if bundle not in context.stop_elements_exclusive:
-                connected.append(bundle)
-        self.append_connected_(context, connected)
+        # returns the elements directly connected to this element; subclasses extend the list returned by
+        # the superclass with their own connected elements
+        return [bundle for bundle in self.bundles_ if bundle not in context.excluded_elements]
 
 
 class ConnectedElementsContext(object):
@@ -176,7 +213,21 @@ class ConnectedElementsContext(object):
         self.process_stereotypes = False
         self._stop_elements_inclusive = []
         self._stop_elements_exclusive = []
-        self.all_stop_elements = []
+        # sets for the membership tests during the traversal
+        self.excluded_elements = set()
+        self.all_stop_elements = set()
+
+    def is_included(self, element):
+        kinds = element.kinds_
+        if kinds & KIND_BUNDLE:
+            return self.add_bundles
+        if kinds & KIND_STEREOTYPE:
+            return self.add_stereotypes
+        if kinds & KIND_ASSOCIATION:
+            return self.add_associations
+        if kinds & KIND_LINK:
+            return self.add_links
+        return True
 
     @property
     def stop_elements_inclusive(self):
@@ -193,7 +244,7 @@ class ConnectedElementsContext(object):
                 raise CException(f"expected one element or a list of stop elements, but got: " +
                                  f"'{stop_elements_inclusive!s}' with element of wrong type: '{e!s}'")
         self._stop_elements_inclusive = stop_elements_inclusive
-        self.all_stop_elements = self._stop_elements_inclusive + self._stop_elements_exclusive
+        self.all_stop_elements = set(self._stop_elements_inclusive + self._stop_elements_exclusive)
 
     @property
     def stop_elements_exclusive(self):
@@ -210,4 +261,5 @@ class ConnectedElementsContext(object):
                 raise CException(f"expected a list of stop elements, but got: '{stop_elements_exclusive!s}'" +
                                  f" with element of wrong type: '{e!s}'")
         self._stop_elements_exclusive = stop_elements_exclusive
-        self.all_stop_elements = self._stop_elements_inclusive + self._stop_elements_exclusive
+        self.excluded_elements = set(stop_elements_exclusive)
+        self.all_stop_elements = set(self._stop_elements_inclusive + self._stop_elements_exclusive)
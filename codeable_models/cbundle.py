@@ -1,9 +1,13 @@
-from codeable_models import CBundlable
+from codeable_models import CBundlable, cevents
 from codeable_models.cexception import CException
-from codeable_models.internal.commons import is_cnamedelement, check_named_element_is_not_deleted
+from codeable_models.internal.commons import is_cnamedelement, is_cbundlable, check_named_element_is_not_deleted, \
+    KIND_BUNDLE
+from codeable_models.internal.element_index import ElementIndex
 
 
 class CBundle(CBundlable):
+    kind_ = KIND_BUNDLE
+
     def __init__(self, name=None, **kwargs):
         """
         ``CBundle`` is used to manage bundles, i.e., groups of modelling elements in Codeable Models.
@@ -30,7 +34,9 @@ class CBundle(CBundlable):
                                     cobject, cclassifier, cclass, cmetaclass, cstereotype, cassociation, clink])
 
         """
-        self.elements_ = []
+        # elements are kept in an insertion-ordered dict used as an ordered set
+        self.elements_ = {}
+        self.elements_index_ = ElementIndex(index_types=True)
         super().__init__(name, **kwargs)
 
     def _init_keyword_args(self, legal_keyword_args=None, **kwargs):
@@ -53,9 +59,12 @@ class CBundle(CBundlable):
         if elt is not None:
             if elt in self.elements_:
                 raise CException(f"element '{elt!s}' cannot be added to bundle: element is already in bundle")
-            if isinstance(elt, CBundlable):
-                self.elements_.append(elt)
-                elt.bundles_.append(self)
+            if is_cbundlable(elt):
+                self.elements_[elt] = None
+                self.elements_index_.add(elt)
+                elt.add_bundle_(self)
+                if cevents.has_subscribers_:
+                    cevents.emit_(cevents.CBundleElementAdded(self, elt))
                 return
         raise CException(f"can't add '{elt!s}': not an element")
 
@@ -71,11 +80,14 @@ class CBundle(CBundlable):
 
         """
         if (element is None or
-                (not isinstance(element, CBundlable)) or
-                (self not in element.bundles)):
+                (not is_cbundlable(element)) or
+                (self not in element.bundles_)):
             raise CException(f"'{element!s}' is not an element of the bundle")
-        self.elements_.remove(element)
-        element.bundles_.remove(self)
+        del self.elements_[element]
+        self.elements_index_.remove(element)
+        element.remove_bundle_(self)
+        if cevents.has_subscribers_:
+            cevents.emit_(cevents.CBundleElementRemoved(self, element))
 
     def delete(self):
         """
@@ -89,8 +101,9 @@ class CBundle(CBundlable):
             return
         elements_to_delete = list(self.elements_)
         for e in elements_to_delete:
-            e.bundles_.remove(self)
-        self.elements_ = []
+            e.remove_bundle_(self)
+        self.elements_ = {}
+        self.elements_index_.clear()
         super().delete()
 
     @property
@@ -104,8 +117,11 @@ class CBundle(CBundlable):
         if elements is None:
             elements = []
         for e in self.elements_:
-            e._bundle = None
-        self.elements_ = []
+            e.remove_bundle_(self)
+            if cevents.has_subscribers_:
+                cevents.emit_(cevents.CBundleElementRemoved(self, e))
+        self.elements_ = {}
+        self.elements_index_.clear()
         if is_cnamedelement(elements):
             elements = [elements]
         elif not isinstance(elements, list):
@@ -118,9 +134,12 @@ class CBundle(CBundlable):
             is_cnamedelement(e)
             if e not in self.elements_:
                 # if it is already in the bundle, do not add it twice
-                self.elements_.append(e)
+                self.elements_[e] = None
+                self.elements_index_.add(e)
                 # noinspection PyUnresolvedReferences
-                e.bundles_.append(self)
+                e.add_bundle_(self)
+                if cevents.has_subscribers_:
+                    cevents.emit_(cevents.CBundleElementAdded(self, e))
 
     def get_elements(self, **kwargs):
         """
@@ -149,17 +168,15 @@ class CBundle(CBundlable):
                 name_specified = True
             else:
                 raise CException(f"unknown argument to getElements: '{key!s}'")
-        elements = []
-        for elt in self.elements_:
-            append = True
-            if name_specified and elt.name != name:
-                append = False
-            # noinspection PyTypeHints
-            if type_ is not None and not isinstance(elt, type_):
-                append = False
-            if append:
-                elements.append(elt)
-        return elements
+        if name_specified:
+            elements = self.elements_index_.get_by_name(name)
+            if type_ is not None:
+                # noinspection PyTypeHints
+                elements = [elt for elt in elements if isinstance(elt, type_)]
+            return elements
+        if type_ is not None:
+            return self.elements_index_.get_by_type(type_)
+        return list(self.elements_)
 
     def get_element(self, **kwargs):
         """
@@ -178,14 +195,10 @@ class CBundle(CBundlable):
         return None if len(elements) == 0 else elements[0]
 
     def compute_connected_(self, context):
-        super().compute_connected_(context)
-        if not context.process_bundles:
-            return
-        connected = []
-        for element in self.elements_:
-            if element not in context.stop_elements_exclusive:
-                connected.append(element)
-        self.append_connected_(context, connected)
+        connected = super().compute_connected_(context)
+        if context.process_bundles:
+            connected.extend(e for e in self.elements_ if e not in context.excluded_elements)
+        return connected
 
 
 class CPackage(CBundle):
@@ -1,14 +1,19 @@
 from codeable_models.cclassifier import CClassifier
 from codeable_models.cexception import CException
 from codeable_models.cobject import CObject
+from codeable_models.internal.column_store import ColumnStore
 from codeable_models.internal.commons import check_is_cmetaclass, check_is_cobject, \
-    check_named_element_is_not_deleted
+    check_named_element_is_not_deleted, KIND_CLASS
+from codeable_models.internal.element_index import ElementIndex
+from codeable_models.internal.queries import parse_query_conditions, select_objects, aggregate_values
 from codeable_models.internal.stereotype_holders import CStereotypeInstancesHolder
 from codeable_models.internal.var_values import delete_var_value, set_var_value, get_var_value, get_var_values, \
-    set_var_values, VarValueKind
+    set_var_values, VarValueKind, get_default_var_values, set_var_values_in_bulk, get_var_attribute
 
 
 class CClass(CClassifier):
+    kind_ = KIND_CLASS
+
     def __init__(self, metaclass, name=None, **kwargs):
         """``CClass`` is used to define classes. Classes in Codeable Models are instances of metaclasses (defined
         using :py:class:`.CMetaclass`).
@@ -20,7 +25,7 @@ class CClass(CClassifier):
                 defined using :py:class:`.CMetaclass`.
            name (str): An optional name.
            **kwargs: Pass in any kwargs acceptable to superclasses. In addition, ``CClass`` accepts:
-                ``stereotype_instances``, ``values``, ``tagged_values``.
+                ``stereotype_instances``, ``values``, ``tagged_values``, ``columnar``.
 
                 - ``stereotype_instances``:
                     Any :py:class:`.CStereotype` extending the meta-class of this class can be defined on the class
@@ -39,6 +44,9 @@ class CClass(CClassifier):
                     The keyword arg ``tagged_values`` can be used to set them just like ordinary attribute values.
                     ``tagged_values`` accepts a dict of key/value pairs.
                     The value types must conform to the types defined for the attributes.
+                - ``columnar``:
+                    If ``True``, the attribute values of the instances of the class are stored in columns,
+                    one per attribute, instead of a dict per object. See the ``columnar`` property.
 
         **Examples:**
 
@@ -71,7 +79,11 @@ class CClass(CClassifier):
         """
         self.metaclass_ = None
         self.metaclass = metaclass
-        self.objects_ = []
+        # objects are kept in an insertion-ordered dict used as an ordered set
+        self.objects_ = {}
+        self.objects_index_ = ElementIndex()
+        # stores the attribute values of the objects, if the class is columnar
+        self.column_store_ = None
         self.class_object_ = CObject(self.metaclass, name, class_object_class_=self)
         self.stereotype_instances_holder = CStereotypeInstancesHolder(self)
         self.tagged_values_ = {}
@@ -84,6 +96,7 @@ class CClass(CClassifier):
         legal_keyword_args.append("stereotype_instances")
         legal_keyword_args.append("values")
         legal_keyword_args.append("tagged_values")
+        legal_keyword_args.append("columnar")
         super()._init_keyword_args(legal_keyword_args, **kwargs)
 
     @property
@@ -116,7 +129,7 @@ class CClass(CClassifier):
         """list[CObject]: Getter to get all instances of this class, defined directly on the class and on any
         sub-class."""
         all_objects = list(self.objects_)
-        for scl in self.all_subclasses:
+        for scl in self.get_all_subclasses_():
             for cl in scl.objects_:
                 all_objects.append(cl)
         return all_objects
@@ -125,12 +138,79 @@ class CClass(CClassifier):
         if obj in self.objects_:
             raise CException(f"object '{obj!s}' is already an instance of the class '{self!s}'")
         check_is_cobject(obj)
-        self.objects_.append(obj)
+        self.objects_[obj] = None
+        self.objects_index_.add(obj)
+        if self.column_store_ is not None:
+            self.column_store_.add_row_(obj)
 
     def remove_object_(self, obj):
         if obj not in self.objects_:
             raise CException(f"can't remove object '{obj!s}'' from class '{self!s}': not an instance")
-        self.objects_.remove(obj)
+        del self.objects_[obj]
+        self.objects_index_.remove(obj)
+        if self.column_store_ is not None:
+            self.column_store_.remove_row_(obj)
+
+    @property
+    def columnar(self):
+        """bool: Getter and setter for the storage mode of the attribute values of the instances of this class.
+
+        If ``True``, the values are stored in one column per attribute, using typed arrays for attributes of
+        type ``int``, ``float``, and ``bool``, and lists for other attributes. This saves memory for large numbers
+        of objects, and makes reading all values of an attribute with ``get_column()`` cheap. Otherwise,
+        each object stores its values in a dict. The default is ``False``. Changing the storage mode moves
+        the values of all instances of the class to the new storage. Instances of subclasses are stored according
+        to the storage mode of their class.
+
+        Values are accessed in the same way in both modes, e.g. using ``get_value()`` and ``set_value()`` on
+        :py:class:`.CObject`.
+        """
+        return self.column_store_ is not None
+
+    @columnar.setter
+    def columnar(self, columnar):
+        check_named_element_is_not_deleted(self)
+        if not isinstance(columnar, bool):
+            raise CException(f"columnar must be a bool, but is '{columnar!s}'")
+        if columnar == self.columnar:
+            return
+        if columnar:
+            self.column_store_ = ColumnStore()
+            for obj in self.objects_:
+                self.column_store_.add_row_(obj)
+        else:
+            for obj in self.objects_:
+                self.column_store_.remove_row_(obj)
+            self.column_store_ = None
+
+    def get_column(self, attribute_name, classifier=None):
+        """Get the values of an attribute of all instances of this class (not including the instances of
+        subclasses), in the order of ``objects``. Optionally the classifier
+        to consider can be specified. This is needed, if one or more attributes of the same name are defined
+        on the inheritance hierarchy. Then a shadowed attribute can be accessed by specifying its classifier.
+
+        For columnar classes (see ``columnar``), the values are read from the attribute's column at once,
+        otherwise they are read from each object.
+
+        Args:
+            attribute_name: The name of the attribute.
+            classifier: The optional classifier on which the attribute is defined.
+
+        Returns:
+            list: The values of the attribute, ``None`` for objects on which the attribute has no value.
+        """
+        check_named_element_is_not_deleted(self)
+        attribute = get_var_attribute(self, self.get_attribute_table_(), attribute_name,
+                                      VarValueKind.ATTRIBUTE_VALUE, classifier)
+        if self.column_store_ is not None:
+            return self.column_store_.get_column_values(attribute.classifier_, attribute.name_)
+        values = []
+        for obj in self.objects_:
+            try:
+                values.append(obj.attribute_values[attribute.classifier_][attribute_name])
+            except KeyError:
+                values.append(None)
+        return values
 
     def delete(self):
         """
@@ -148,11 +228,12 @@ class CClass(CClassifier):
         objects_to_delete = list(self.objects_)
         for obj in objects_to_delete:
             obj.delete()
-        self.objects_ = []
+        self.objects_ = {}
+        self.objects_index_.clear()
 
         for si in self.stereotype_instances:
             si.extended_instances_.remove(self)
-        self.stereotype_instances_holder.stereotypes_ = []
+        self.stereotype_instances_holder.reset_stereotypes_()
 
         self.metaclass.remove_class(self)
         self.metaclass_ = None
@@ -161,6 +242,11 @@ class CClass(CClassifier):
 
         self.class_object_.delete()
 
+    def name_changed_(self, old_name):
+        super().name_changed_(old_name)
+        if self.metaclass_ is not None:
+            self.metaclass_.classes_index_.rename(self, old_name)
+
     def instance_of(self, classifier):
         """Returns ``True`` if this class is instance of the ``classifier``, else ``False``.
 
@@ -244,6 +330,138 @@ class CClass(CClassifier):
     def values(self, new_values):
         self.class_object_.values = new_values
 
+    def create_objects(self, names=None, values=None, columns=None):
+        """
+        Creates multiple instances of this class at once, e.g. to import a large number of objects. The
+        objects are created just like objects created with ``CObject(cl, name, values=...)``, but the attributes
+        and default values of the class are determined only once for all objects. If any of the names or values
+        is not valid, an exception is raised and no object is created.
+
+        Args:
+            names: An optional iterable of object names, one per object. A name can be ``None``.
+            values: An optional iterable of dicts of attribute values (in the format of the ``values`` property),
+                one per object. A dict can be ``None``, if no values are set on the object.
+            columns: An optional dict of attribute values, using the attribute names as keys and a sequence
+                with one value per object as values. A value can be ``None``, if it is not set on the object.
+
+        Returns:
+            list[CObject]: The created objects, in the order of the names and values.
+
+        For example, we can create three items with their quantities and prices like this::
+
+            items = item.create_objects(["i1", "i2", "i3"], columns={
+                "quantity": [1, 12, 3],
+                "price": [2.5, 0.5, 10.0]
+            })
+
+        """
+        check_named_element_is_not_deleted(self)
+        if values is not None:
+            values = list(values)
+        if columns is not None:
+            if not isinstance(columns, dict):
+                raise CException(f"malformed attribute columns description: '{columns!s}'")
+            columns = [(attribute_name, list(column)) for attribute_name, column in columns.items()]
+        lengths = set(len(column) for _, column in columns) if columns is not None else set()
+        if values is not None:
+            lengths.add(len(values))
+        if names is not None:
+            names = list(names)
+            lengths.add(len(names))
+        if len(lengths) > 1:
+            raise CException(f"number of names and values to create objects of class '{self!s}' does not match")
+        number_of_objects = lengths.pop() if len(lengths) == 1 else 0
+        if names is None:
+            names = [None] * number_of_objects
+        for name in names:
+            if name is not None and not isinstance(name, str):
+                raise CException(f"is not a name string: '{name!r}'")
+
+        # defaults are computed once, and copied into the values of each object, then the new values are set
+        default_values = get_default_var_values(self.get_class_path_())
+        values_dicts = [{cl: dict(cl_values) for cl, cl_values in default_values.items()}
+                        for _ in range(number_of_objects)]
+        set_var_values_in_bulk(self, self.get_attribute_table_(), values_dicts, values, columns,
+                               VarValueKind.ATTRIBUTE_VALUE)
+
+        objects = [CObject(self, name, bulk_attribute_values_=values_dict)
+                   for name, values_dict in zip(names, values_dicts)]
+        for obj in objects:
+            self.objects_[obj] = None
+            self.objects_index_.add(obj)
+            if self.column_store_ is not None:
+                self.column_store_.add_row_(obj)
+        return objects
+
+    def _get_query_classes(self, include_subclasses):
+        if include_subclasses:
+            return [self] + list(self.get_all_subclasses_())
+        return [self]
+
+    def _get_query_attribute(self, attribute_name):
+        return get_var_attribute(self, self.get_attribute_table_(), attribute_name, VarValueKind.ATTRIBUTE_VALUE)
+
+    def select(self, where=None, include_subclasses=True):
+        """Get the instances of this class, whose attribute values match the conditions in ``where``.
+        The conditions are evaluated for all instances of a class at once on the values of the attribute (see
+        ``get_column()``). If NumPy is installed, conditions on ``int``, ``float``, and ``bool`` attributes of
+        ``columnar`` classes are evaluated with NumPy. Objects without a value for an attribute in a condition
+        do not match the condition.
+
+        Args:
+            where: Conditions the objects must match. Either a condition tuple
+                ``(attribute_name, operator, value)``, a list of condition tuples which must all match, or a
+                dict of attribute names and values, matching if the attribute values are equal to the values.
+                Operators are ``"=="``, ``"!="``, ``"<"``, ``"<="``, ``">"``, ``">="``, and ``"in"``
+                (with a collection of values as ``value``).
+                If ``where`` is ``None``, all instances are selected.
+            include_subclasses: If ``True``, instances of subclasses are included (in the order of
+                ``all_objects``).
+
+        Returns:
+            list[CObject]: The matching objects.
+
+        For example, we can select all available items with a price above 10 like this::
+
+            items = item.select([("price", ">", 10.0), ("available", "==", True)])
+
+        """
+        check_named_element_is_not_deleted(self)
+        conditions = parse_query_conditions(where, self._get_query_attribute)
+        return select_objects(self._get_query_classes(include_subclasses), conditions)
+
+    def aggregate(self, function, attribute_name=None, where=None, group_by=None, include_subclasses=True):
+        """Aggregate the values of an attribute of the instances of this class matching the conditions in
+        ``where``. The values are aggregated for all instances of a class at once (see ``get_column()``).
+        If NumPy is installed, the values of ``int``, ``float``, and ``bool`` attributes of ``columnar``
+        classes are aggregated with NumPy. Objects without a value for the attribute are not considered.
+
+        Args:
+            function: The aggregate function, one of ``"count"``, ``"sum"``, ``"min"``, ``"max"``, and ``"mean"``.
+                ``"sum"`` of no values is ``0``, ``"min"``, ``"max"``, and ``"mean"`` of no values are ``None``.
+            attribute_name: The name of the attribute to aggregate. If ``None``, the ``"count"`` function
+                counts the objects.
+            where: Conditions the objects must match, in the format of ``select()``.
+            group_by: An optional attribute name. If given, the values are aggregated separately for each value
+                of the attribute ``group_by``.
+            include_subclasses: If ``True``, instances of subclasses are included.
+
+        Returns:
+            The aggregated value, or a dict of the aggregated values using the values of the attribute
+            ``group_by`` as keys (``None`` for the objects without a value for it).
+
+        For example, we can get the mean price of the available items per category like this::
+
+            mean_prices = item.aggregate("mean", "price", where={"available": True}, group_by="category")
+
+        """
+        check_named_element_is_not_deleted(self)
+        attribute = None if attribute_name is None else self._get_query_attribute(attribute_name)
+        conditions = parse_query_conditions(where, self._get_query_attribute)
+        group_by_attribute = None if group_by is None else self._get_query_attribute(group_by)
+        return aggregate_values(self._get_query_classes(include_subclasses), function, attribute, conditions,
+                                group_by_attribute)
+
     def get_objects(self, name):
         """
         Returns all objects with a given name with are instances of this classifier.
@@ -255,7 +473,7 @@ class CClass(CClassifier):
             list[CObject]: The objects with the given name.
 
         """
-        return list(o for o in self.objects if o.name == name)
+        return self.objects_index_.get_by_name(name)
 
     def get_object(self, name):
         """
@@ -296,12 +514,12 @@ class CClass(CClassifier):
         # been set. Then the stereotype defaults will not overwrite existing values (you need to
         # delete them explicitly in order for them to be replaced by stereotype defaults)
         existing_attribute_names = []
-        for mcl in self.metaclass.class_path:
+        for mcl in self.metaclass.get_class_path_():
             for attrName in mcl.attribute_names:
                 if attrName not in existing_attribute_names:
                     existing_attribute_names.append(attrName)
         for stereotypeInstance in self.stereotype_instances:
-            for st in stereotypeInstance.class_path:
+            for st in stereotypeInstance.get_class_path_():
                 for name in st.default_values:
                     if name in existing_attribute_names:
                         if self.get_value(name) is None:
@@ -321,7 +539,7 @@ class CClass(CClassifier):
         """
         if self.is_deleted:
             raise CException(f"can't get tagged value '{name!s}' on deleted class")
-        return get_var_value(self, self.stereotype_instances_holder.get_stereotype_instance_path(), self.tagged_values_,
+        return get_var_value(self, self.stereotype_instances_holder.get_attribute_table(), self.tagged_values_,
                              name, VarValueKind.TAGGED_VALUE, stereotype)
 
     def delete_tagged_value(self, name, stereotype=None):
@@ -338,7 +556,7 @@ class CClass(CClassifier):
         """
         if self.is_deleted:
             raise CException(f"can't delete tagged value '{name!s}' on deleted class")
-        return delete_var_value(self, self.stereotype_instances_holder.get_stereotype_instance_path(),
+        return delete_var_value(self, self.stereotype_instances_holder.get_attribute_table(),
                                 self.tagged_values_,
                                 name, VarValueKind.TAGGED_VALUE, stereotype)
 
@@ -357,7 +575,7 @@ class CClass(CClassifier):
         """
         if self.is_deleted:
             raise CException(f"can't set tagged value '{name!s}' on deleted class")
-        return set_var_value(self, self.stereotype_instances_holder.get_stereotype_instance_path(), self.tagged_values_,
+        return set_var_value(self, self.stereotype_instances_holder.get_attribute_table(), self.tagged_values_,
                              name, value, VarValueKind.TAGGED_VALUE, stereotype)
 
     @property
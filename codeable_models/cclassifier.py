@@ -1,10 +1,17 @@
+from codeable_models import cevents
 from codeable_models.cattribute import CAttribute
 from codeable_models.cbundlable import CBundlable
-from codeable_models.cenum import CEnum
 from codeable_models.internal.commons import *
 
 
 class CClassifier(CBundlable):
+    kind_ = KIND_CLASSIFIER
+
+    # incremented whenever the inheritance hierarchy, the attributes, or the associations of any classifier
+    # change, so that data derived from more than one classifier (like stereotype instance paths or the
+    # associations resolved for links) can detect it is outdated
+    structure_version_ = 0
+
     def __init__(self, name=None, **kwargs):
         """``CClassifier`` is superclass of classifiers such as :py:class:`.CClass` and :py:class:`.CMetaclass`
         defining common features for
@@ -54,6 +61,10 @@ class CClassifier(CBundlable):
         self.subclasses_ = []
         self.attributes_ = {}
         self.associations_ = []
+        self.class_path_ = None
+        self.all_superclasses_ = None
+        self.all_subclasses_ = None
+        self.attribute_table_ = None
         super().__init__(name, **kwargs)
 
     def _init_keyword_args(self, legal_keyword_args=None, **kwargs):
@@ -116,7 +127,7 @@ class CClassifier(CBundlable):
             raise CException(f"duplicate attribute name: '{name!s}'")
         if is_cattribute(value):
             attr = value
-        elif is_known_attribute_type(value) or isinstance(value, CEnum) or is_cclassifier(value):
+        elif is_known_attribute_type(value) or is_cenum(value) or is_cclassifier(value):
             # if value is a CClass, we interpret it as the type for a CObject attribute, not the default 
             # value of a CMetaclass type attribute: if you need to set a metaclass type default value, use 
             # CAttribute's default instead
@@ -133,10 +144,13 @@ class CClassifier(CBundlable):
             attribute_descriptions = {}
         self._remove_attribute_values_of_classifier(attribute_descriptions.keys())
         self.attributes_ = {}
-        if not isinstance(attribute_descriptions, dict):
-            raise CException(f"malformed attribute description: '{attribute_descriptions!s}'")
-        for attributeName in attribute_descriptions:
-            self._set_attribute(attributeName, attribute_descriptions[attributeName])
+        try:
+            if not isinstance(attribute_descriptions, dict):
+                raise CException(f"malformed attribute description: '{attribute_descriptions!s}'")
+            for attributeName in attribute_descriptions:
+                self._set_attribute(attributeName, attribute_descriptions[attributeName])
+        finally:
+            self.attributes_changed_()
         self.update_default_values_of_classifier_()
 
     @property
@@ -163,6 +177,19 @@ class CClassifier(CBundlable):
         except KeyError:
             return None
 
+    # get a dict mapping each attribute name to the attribute found first for this name on the class path;
+    # the table is cached until the attributes or the inheritance hierarchy change
+    def get_attribute_table_(self):
+        if self.attribute_table_ is None:
+            self.attribute_table_ = compute_attribute_table(self.get_class_path_())
+        return self.attribute_table_
+
+    # invalidate the attribute tables of this classifier and all of its subclasses, called whenever
+    # attributes are changed
+    def attributes_changed_(self):
+        CClassifier.structure_version_ += 1
+        self._invalidate_hierarchy_caches(lambda cl: cl.subclasses_, ["attribute_table_"])
+
     def _remove_attribute_values_of_classifier(self, attributes_to_keep):
         raise CException("should be overridden by subclasses to update defaults on instances")
 
@@ -187,6 +214,18 @@ class CClassifier(CBundlable):
     def superclasses(self, elements):
         if elements is None:
             elements = []
+        # invalidate before and after the change, so that both the old and the new superclasses
+        # drop their cached subclass closures
+        old_superclasses = self.superclasses_
+        self.hierarchy_changed_()
+        try:
+            self._set_superclasses(elements)
+        finally:
+            self.hierarchy_changed_()
+        if cevents.has_subscribers_:
+            cevents.emit_(cevents.CSuperclassesChanged(self, list(old_superclasses), list(self.superclasses_)))
+
+    def _set_superclasses(self, elements):
         for sc in self.superclasses_:
             sc.subclasses_.remove(self)
         self.superclasses_ = []
@@ -214,15 +253,16 @@ class CClassifier(CBundlable):
 
     @property
     def all_superclasses(self):
-        """list[CClassifier]: Getter that returns all superclasses of this classifier
+        """set[CClassifier]: Getter that returns all superclasses of this classifier
         on the inheritance hierarchy."""
-        return self.get_all_superclasses_()
+        # the closure is cached as a frozenset, which is used directly by internal callers
+        return set(self.get_all_superclasses_())
 
     @property
     def all_subclasses(self):
-        """list[CClassifier]: Getter that returns all subclasses of this classifier
+        """set[CClassifier]: Getter that returns all subclasses of this classifier
         on the inheritance hierarchy."""
-        return self.get_all_subclasses_()
+        return set(self.get_all_subclasses_())
 
     def is_classifier_of_type(self, classifier):
         """Checks if the classifier conforms to the provided classifier's type.
@@ -234,33 +274,30 @@ class CClassifier(CBundlable):
             bool: Boolean result of the check.
 
         """
-        type_classifiers = classifier.all_subclasses
-        type_classifiers.add(classifier)
-        if self in type_classifiers:
-            return True
-        return False
-
-    def get_all_superclasses_(self, iterated_classes=None):
-        if iterated_classes is None:
-            iterated_classes = set()
-        result = set()
-        for sc in self.superclasses:
-            if sc not in iterated_classes:
-                iterated_classes.add(sc)
-                result.add(sc)
-                result.update(sc.get_all_superclasses_(iterated_classes))
-        return result
-
-    def get_all_subclasses_(self, iterated_classes=None):
-        if iterated_classes is None:
-            iterated_classes = set()
+        return self is classifier or classifier in self.get_all_superclasses_()
+
+    @staticmethod
+    def _compute_closure(classifier, get_related):
         result = set()
-        for sc in self.subclasses:
-            if sc not in iterated_classes:
-                iterated_classes.add(sc)
-                result.add(sc)
-                result.update(sc.get_all_subclasses_(iterated_classes))
-        return result
+        classifiers = list(get_related(classifier))
+        while len(classifiers) > 0:
+            cl = classifiers.pop()
+            if cl not in result:
+                result.add(cl)
+                classifiers.extend(get_related(cl))
+        return frozenset(result)
+
+    # the transitive closures of superclasses and subclasses are cached as frozensets until the
+    # inheritance hierarchy changes (see hierarchy_changed_())
+    def get_all_superclasses_(self):
+        if self.all_superclasses_ is None:
+            self.all_superclasses_ = self._compute_closure(self, lambda cl: cl.superclasses_)
+        return self.all_superclasses_
+
+    def get_all_subclasses_(self):
+        if self.all_subclasses_ is None:
+            self.all_subclasses_ = self._compute_closure(self, lambda cl: cl.subclasses_)
+        return self.all_subclasses_
 
     def has_subclass(self, classifier):
         """Returns ``True`` if ``classifier`` is subclass of this classifier, else ``False``.
@@ -295,7 +332,8 @@ class CClassifier(CBundlable):
             return
         super().delete()
 
-        # self.superclasses removes the self subclass from the superclasses
+        # self.superclasses removes the self subclass from the superclasses, and invalidates
+        # the cached hierarchy data of this classifier and all its subclasses
         self.superclasses = []
 
         for subclass in self.subclasses_:
@@ -304,6 +342,7 @@ class CClassifier(CBundlable):
                 raise CException(f"can't remove superclass '{self!s}' from classifier '{subclass!s}': not a superclass")
             subclass.superclasses_.remove(self)
         self.subclasses_ = []
+        self.hierarchy_changed_()
 
         # remove all associations
         associations = self.associations.copy()
@@ -314,6 +353,7 @@ class CClassifier(CBundlable):
             a.name_ = None
             a.classifier_ = None
         self.attributes_ = {}
+        self.attributes_changed_()
 
     @property
     def associations(self):
@@ -351,25 +391,46 @@ class CClassifier(CBundlable):
         return CAssociation(self, target, descriptor, **kwargs)
 
     def compute_connected_(self, context):
-        super().compute_connected_(context)
-        connected_candidates = []
-        connected = []
-        for association in self.associations:
-            connected_candidates.append(association.get_opposite_classifier(self))
-        connected_candidates = self.superclasses + self.subclasses + connected_candidates
-        for c in connected_candidates:
-            if c not in context.stop_elements_exclusive:
-                connected.append(c)
-        self.append_connected_(context, connected)
-
-    # get class path starting from this classifier, including this classifier
+        connected = super().compute_connected_(context)
+        connected_candidates = self.superclasses_ + self.subclasses_ + [
+            association.get_opposite_classifier(self) for association in self.associations_]
+        connected.extend(c for c in connected_candidates if c not in context.excluded_elements)
+        return connected
+
+    # get class path starting from this classifier, including this classifier; the class path is cached
+    # as a tuple until the inheritance hierarchy changes (see hierarchy_changed_())
     def get_class_path_(self):
-        class_path = [self]
-        for sc in self.superclasses:
-            for cl in sc.get_class_path_():
-                if cl not in class_path:
-                    class_path.append(cl)
-        return class_path
+        if self.class_path_ is None:
+            class_path = [self]
+            contained = {self}
+            for sc in self.superclasses_:
+                for cl in sc.get_class_path_():
+                    if cl not in contained:
+                        contained.add(cl)
+                        class_path.append(cl)
+            self.class_path_ = tuple(class_path)
+        return self.class_path_
+
+    # invalidate the data cached for the inheritance hierarchy, called whenever superclasses are changed:
+    # class paths, superclass closures, and attribute tables of this classifier and all of its subclasses,
+    # as well as the subclass closures of this classifier and all of its superclasses, are affected
+    def hierarchy_changed_(self):
+        CClassifier.structure_version_ += 1
+        self._invalidate_hierarchy_caches(lambda cl: cl.subclasses_,
+                                          ["class_path_", "all_superclasses_", "attribute_table_"])
+        self._invalidate_hierarchy_caches(lambda cl: cl.superclasses_, ["all_subclasses_"])
+
+    def _invalidate_hierarchy_caches(self, get_related, cache_names):
+        classifiers = [self]
+        visited = set()
+        while len(classifiers) > 0:
+            cl = classifiers.pop()
+            if cl in visited:
+                continue
+            visited.add(cl)
+            for cache_name in cache_names:
+                setattr(cl, cache_name, None)
+            classifiers.extend(get_related(cl))
 
     @property
     def class_path(self):
@@ -381,4 +442,4 @@ class CClassifier(CBundlable):
 
         This getter returns all superclasses in the order of the class path.
         """
-        return self.get_class_path_()
+        return list(self.get_class_path_())
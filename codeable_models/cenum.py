@@ -1,8 +1,11 @@
 from codeable_models.cbundlable import CBundlable
 from codeable_models.cexception import CException
+from codeable_models.internal.commons import KIND_ENUM
 
 
 class CEnum(CBundlable):
+    kind_ = KIND_ENUM
+
     def __init__(self, name=None, **kwargs):
         """``CEnum`` is used for defining enumerations.
 
@@ -0,0 +1,235 @@
+from contextlib import contextmanager
+
+from codeable_models.cexception import CException
+
+# (callback, event types) of the subscribers; has_subscribers_ is checked by the model elements before
+# creating events, so that changes cost (almost) nothing extra if there are no subscribers
+subscriptions_ = []
+has_subscribers_ = False
+# events are collected while a batch is active (see batched_events()), and delivered when it ends
+batch_depth_ = 0
+batched_events_ = []
+
+
+class CModelEvent(object):
+    __slots__ = ("element",)
+
+    def __init__(self, element):
+        """Base class of the events emitted on model changes to the subscribers registered with
+        :py:func:`.subscribe`.
+
+        Args:
+            element: The changed model element.
+        """
+        self.element = element
+
+    def __repr__(self):
+        return f"{self.__class__.__name__!s}({self.element!s})"
+
+
+class CValueChanged(CModelEvent):
+    __slots__ = ("kind", "name", "classifier", "old_value", "new_value")
+
+    def __init__(self, element, kind, name, classifier, old_value, new_value):
+        """Emitted when an attribute value, a tagged value, or a default value is set or deleted.
+
+        Args:
+            element: The object, class, link, association, or stereotype on which the value has changed.
+            kind (str): ``"value"``, ``"tagged value"``, or ``"default value"``.
+            name (str): The name of the attribute.
+            classifier: The classifier or stereotype defining the attribute.
+            old_value: The value before the change, ``None`` if the value was not set.
+            new_value: The value after the change, ``None`` if the value was deleted.
+        """
+        super().__init__(element)
+        self.kind = kind
+        self.name = name
+        self.classifier = classifier
+        self.old_value = old_value
+        self.new_value = new_value
+
+    def __repr__(self):
+        return (f"{self.__class__.__name__!s}({self.element!s}, {self.kind!s} '{self.name!s}': " +
+                f"{self.old_value!r} -> {self.new_value!r})")
+
+
+class CLinkAdded(CModelEvent):
+    __slots__ = ()
+    """Emitted when a link (the ``element`` of the event) has been added."""
+
+
+class CLinkDeleted(CModelEvent):
+    __slots__ = ()
+    """Emitted when a link (the ``element`` of the event) has been deleted."""
+
+
+class CStereotypesChanged(CModelEvent):
+    __slots__ = ("old_stereotypes", "new_stereotypes")
+
+    def __init__(self, element, old_stereotypes, new_stereotypes):
+        """Emitted when the stereotypes of a metaclass or association, or the stereotype instances of a class,
+        link, or association have been set.
+
+        Args:
+            element: The element on which the stereotypes or stereotype instances have been set.
+            old_stereotypes (list[CStereotype]): The stereotypes before the change.
+            new_stereotypes (list[CStereotype]): The stereotypes after the change.
+        """
+        super().__init__(element)
+        self.old_stereotypes = old_stereotypes
+        self.new_stereotypes = new_stereotypes
+
+
+class CBundleElementAdded(CModelEvent):
+    __slots__ = ("bundle",)
+
+    def __init__(self, bundle, element):
+        """Emitted when an element has been added to a bundle.
+
+        Args:
+            bundle (CBundle): The bundle.
+            element (CBundlable): The added element.
+        """
+        super().__init__(element)
+        self.bundle = bundle
+
+
+class CBundleElementRemoved(CModelEvent):
+    __slots__ = ("bundle",)
+
+    def __init__(self, bundle, element):
+        """Emitted when an element has been removed from a bundle.
+
+        Args:
+            bundle (CBundle): The bundle.
+            element (CBundlable): The removed element.
+        """
+        super().__init__(element)
+        self.bundle = bundle
+
+
+class CSuperclassesChanged(CModelEvent):
+    __slots__ = ("old_superclasses", "new_superclasses")
+
+    def __init__(self, element, old_superclasses, new_superclasses):
+        """Emitted when the superclasses of a classifier have been set.
+
+        Args:
+            element (CClassifier): The classifier.
+            old_superclasses (list[CClassifier]): The superclasses before the change.
+            new_superclasses (list[CClassifier]): The superclasses after the change.
+        """
+        super().__init__(element)
+        self.old_superclasses = old_superclasses
+        self.new_superclasses = new_superclasses
+
+
+def _check_event_types(event_types):
+    if event_types is None:
+        return None
+    if isinstance(event_types, type):
+        event_types = [event_types]
+    if not isinstance(event_types, (list, tuple)):
+        raise CException(f"event types must be an event class or a list of event classes")
+    for event_type in event_types:
+        if not (isinstance(event_type, type) and issubclass(event_type, CModelEvent)):
+            raise CException(f"'{event_type!s}' is not an event class")
+    return tuple(event_types)
+
+
+def subscribe(callback, event_types=None):
+    """Subscribe to model change events. The ``callback`` is called with a list of events after each change,
+    or with all events emitted in a batch at the end of the batch (see :py:func:`.batched_events`).
+    Changes made in a transaction (see :py:func:`.model_transaction`) are delivered as a batch on commit,
+    and not delivered if the transaction is rolled back.
+
+    For example, we can print the values changed on a model like this::
+
+        def print_value_changes(events):
+            for event in events:
+                print(f"{event.element!s}: {event.name!s} = {event.new_value!s}")
+
+        subscribe(print_value_changes, CValueChanged)
+
+    Args:
+        callback: A callable taking a list of :py:class:`.CModelEvent`.
+        event_types: An optional event class or list of event classes. If specified, the callback is only called
+            with the events of these classes (and their subclasses).
+
+    Returns:
+        None
+    """
+    global has_subscribers_
+    if not callable(callback):
+        raise CException(f"event subscriber '{callback!s}' is not callable")
+    subscriptions_.append((callback, _check_event_types(event_types)))
+    has_subscribers_ = True
+
+
+def unsubscribe(callback):
+    """Unsubscribe a callback subscribed with :py:func:`.subscribe`.
+
+    Args:
+        callback: The subscribed callback.
+
+    Returns:
+        None
+    """
+    global has_subscribers_
+    for i, (subscribed_callback, _) in enumerate(subscriptions_):
+        if subscribed_callback == callback:
+            del subscriptions_[i]
+            has_subscribers_ = len(subscriptions_) > 0
+            return
+    raise CException(f"'{callback!s}' is not subscribed")
+
+
+def _deliver(events):
+    for callback, event_types in list(subscriptions_):
+        if event_types is None:
+            selected_events = events
+        else:
+            selected_events = [event for event in events if isinstance(event, event_types)]
+        if len(selected_events) > 0:
+            callback(list(selected_events))
+
+
+def emit_(event):
+    if batch_depth_ > 0:
+        batched_events_.append(event)
+    else:
+        _deliver([event])
+
+
+def begin_batch_():
+    # returns the position of the batch in the batched events, to be able to discard its events
+    global batch_depth_
+    batch_depth_ += 1
+    return len(batched_events_)
+
+
+def end_batch_(start, discard=False):
+    global batch_depth_, batched_events_
+    if discard:
+        del batched_events_[start:]
+    batch_depth_ -= 1
+    if batch_depth_ == 0 and len(batched_events_) > 0:
+        events = batched_events_
+        batched_events_ = []
+        _deliver(events)
+
+
+@contextmanager
+def batched_events():
+    """Context manager that collects all events emitted in the ``with`` block, and delivers them at the
+    end of the block. Batches can be nested; the events are delivered at the end of the outermost batch::
+
+        with batched_events():
+            for item in items:
+                item.set_value("price", item.get_value("price") * 2)
+    """
+    start = begin_batch_()
+    try:
+        yield
+    finally:
+        end_batch_(start)
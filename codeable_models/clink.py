@@ -1,3 +1,5 @@
+from codeable_models import ctransaction, cevents
+from codeable_models.cclassifier import CClassifier
 from codeable_models.cobject import CObject
 from codeable_models.internal.commons import *
 from codeable_models.internal.stereotype_holders import CStereotypeInstancesHolder
@@ -6,6 +8,9 @@ from codeable_models.internal.var_values import delete_var_value, set_var_value,
 
 
 class CLink(CObject):
+    __slots__ = ("source_", "target_", "label", "association", "stereotype_instances_holder_", "tagged_values_")
+    kind_ = KIND_LINK
+
     def __init__(self, association, source_object, target_object, **kwargs):
         """``CLink`` is used to define object links.
         Objects can be linked if their respective classes have an association.
@@ -72,8 +77,9 @@ class CLink(CObject):
         self.target_ = target_object
         self.label = None
         self.association = association
-        self.stereotype_instances_holder = CStereotypeInstancesHolder(self)
-        self.tagged_values_ = {}
+        # most links have no stereotype instances and tagged values, so they are allocated when first needed
+        self.stereotype_instances_holder_ = None
+        self.tagged_values_ = EMPTY_MAPPING
         super().__init__(association)
         self._init_keyword_args(**kwargs)
 
@@ -85,6 +91,12 @@ class CLink(CObject):
         result = super().__repr__()
         return f"`CLink {result} source = {self.source_!r} -> target = {self.target_!r}`"
 
+    @property
+    def stereotype_instances_holder(self):
+        if self.stereotype_instances_holder_ is None:
+            self.stereotype_instances_holder_ = CStereotypeInstancesHolder(self)
+        return self.stereotype_instances_holder_
+
     def _init_keyword_args(self, legal_keyword_args=None, **kwargs):
         if legal_keyword_args is None:
             legal_keyword_args = []
@@ -161,14 +173,19 @@ class CLink(CObject):
         """
         if self.is_deleted:
             return
-        for si in self.stereotype_instances:
-            si.extended_instances_.remove(self)
-        self.stereotype_instances_holder.stereotypes_ = []
+        if ctransaction.active_transaction_ is not None:
+            ctransaction.active_transaction_.link_deleted_(self)
+        if self.stereotype_instances_holder_ is not None:
+            for si in self.stereotype_instances_holder_.stereotypes_:
+                si.extended_instances_.remove(self)
+            self.stereotype_instances_holder_.reset_stereotypes_()
         if self.source_ != self.target_:
-            self.target_.links_.remove(self)
-        self.source_.links_.remove(self)
+            self.target_.remove_link_(self)
+        self.source_.remove_link_(self)
         super().delete()
         self.is_deleted = True
+        if cevents.has_subscribers_:
+            cevents.emit_(cevents.CLinkDeleted(self))
 
     @property
     def stereotype_instances(self):
@@ -179,7 +196,9 @@ class CLink(CObject):
         The setter takes a list of stereotype instances or a single stereotype instance as argument.
         The getter always returns a list.
         """
-        return self.stereotype_instances_holder.stereotypes
+        if self.stereotype_instances_holder_ is None:
+            return []
+        return self.stereotype_instances_holder_.stereotypes
 
     @stereotype_instances.setter
     def stereotype_instances(self, elements):
@@ -199,7 +218,7 @@ class CLink(CObject):
         """
         if self.is_deleted:
             raise CException(f"can't get tagged value '{name!s}' on deleted link")
-        return get_var_value(self, self.stereotype_instances_holder.get_stereotype_instance_path(), self.tagged_values_,
+        return get_var_value(self, self.stereotype_instances_holder.get_attribute_table(), self.tagged_values_,
                              name, VarValueKind.TAGGED_VALUE, stereotype)
 
     def delete_tagged_value(self, name, stereotype=None):
@@ -216,7 +235,7 @@ class CLink(CObject):
         """
         if self.is_deleted:
             raise CException(f"can't delete tagged value '{name!s}' on deleted link")
-        return delete_var_value(self, self.stereotype_instances_holder.get_stereotype_instance_path(),
+        return delete_var_value(self, self.stereotype_instances_holder.get_attribute_table(),
                                 self.tagged_values_, name, VarValueKind.TAGGED_VALUE, stereotype)
 
     def set_tagged_value(self, name, value, stereotype=None):
@@ -234,7 +253,9 @@ class CLink(CObject):
         """
         if self.is_deleted:
             raise CException(f"can't set tagged value '{name!s}' on deleted link")
-        return set_var_value(self, self.stereotype_instances_holder.get_stereotype_instance_path(), self.tagged_values_,
+        if self.tagged_values_ is EMPTY_MAPPING:
+            self.tagged_values_ = {}
+        return set_var_value(self, self.stereotype_instances_holder.get_attribute_table(), self.tagged_values_,
                              name, value, VarValueKind.TAGGED_VALUE, stereotype)
 
     @property
@@ -245,6 +266,8 @@ class CLink(CObject):
         """
         if self.is_deleted:
             raise CException(f"can't get tagged values on deleted link")
+        if self.stereotype_instances_holder_ is None:
+            return {}
         return get_var_values(self.stereotype_instances_holder.get_stereotype_instance_path(), self.tagged_values_)
 
     @tagged_values.setter
@@ -260,32 +283,34 @@ def _get_target_objects_from_definition(source_obj, targets):
     elif not isinstance(targets, list):
         targets = [targets]
     new_targets = []
+    is_source_a_class = source_obj.class_object_class is not None
+    source_link_target_kinds = get_kinds(source_obj.association.target) if is_clink(source_obj) else None
     for t in targets:
-        is_source_a_class = source_obj.class_object_class is not None
-        if is_cclass(t):
-            if is_clink(source_obj):
-                if not is_cmetaclass(source_obj.association.target):
+        kinds = get_kinds(t)
+        if kinds & KIND_CLASS:
+            if source_link_target_kinds is not None:
+                if not source_link_target_kinds & KIND_METACLASS:
                     raise CException(f"link target '{t!s}' is a class, but source is a not class link")
             elif not is_source_a_class:
                 raise CException(f"link target '{t!s}' is a class, but source is an object")
             new_targets.append(t.class_object_)
-        elif is_clink(t):
+        elif kinds & KIND_LINK:
             if is_cmetaclass(t.association.source):
-                if is_clink(source_obj):
-                    if not is_cmetaclass(source_obj.association.target):
+                if source_link_target_kinds is not None:
+                    if not source_link_target_kinds & KIND_METACLASS:
                         raise CException(f"link target is an class link, but source is an object link")
                 elif not is_source_a_class:
                     raise CException(f"link target is a class link, but source is an object")
             else:
-                if is_clink(source_obj):
-                    if not is_cclass(source_obj.association.target):
+                if source_link_target_kinds is not None:
+                    if not source_link_target_kinds & KIND_CLASS:
                         raise CException(f"link target is an object link, but source is an class link")
                 elif is_source_a_class:
                     raise CException(f"link target is an object link, but source is a class")
             new_targets.append(t)
-        elif is_cobject(t):
-            if is_clink(source_obj):
-                if not is_cclass(source_obj.association.target):
+        elif kinds & KIND_OBJECT:
+            if source_link_target_kinds is not None:
+                if not source_link_target_kinds & KIND_CLASS:
                     raise CException(f"link target '{t!s}' is an object, but source is not an object link")
             else:
                 if is_source_a_class and t.class_object_class is None:
@@ -318,48 +343,76 @@ def _check_link_definition_and_replace_classes(link_definitions):
     return new_definitions
 
 
-def _determine_matching_association_and_set_context_info(context, source, targets):
-    if source.class_object_class is not None:
-        target_classifier_candidates = get_common_metaclasses(
-            [co.class_object_class if not is_clink(co) else co for co in targets])
-        context.sourceClassifier = source.class_object_class.metaclass
-    else:
-        target_classifier_candidates = [get_common_classifier(targets)]
-        context.sourceClassifier = source.classifier
-
-    if context.association is not None and context.target_classifier is None:
-        if context.sourceClassifier.is_classifier_of_type(context.association.source):
-            target_classifier_candidates = [context.association.target]
-            context.sourceClassifier = context.association.source
-        elif context.sourceClassifier.is_classifier_of_type(context.association.target):
-            target_classifier_candidates = [context.association.source]
-            context.sourceClassifier = context.association.target
-
-    associations = context.sourceClassifier.all_associations
-    if context.association is not None:
-        associations = [context.association]
+# associations resolved by _resolve_association(), keyed by its arguments; the cached resolutions are valid as long as
+# CClassifier.structure_version_ is unchanged
+_resolved_associations = {}
+_resolved_associations_version = None
+
+
+def _resolve_association(source_classifier, target_classifier_candidates, role_name, association,
+                         target_classifier):
+    # returns the number of matches, the source classifier, and for a single match the matching association,
+    # whether it matches in association order, and the matching target classifier
+    if association is not None and target_classifier is None:
+        if source_classifier.is_classifier_of_type(association.source):
+            target_classifier_candidates = [association.target]
+            source_classifier = association.source
+        elif source_classifier.is_classifier_of_type(association.target):
+            target_classifier_candidates = [association.source]
+            source_classifier = association.target
+
+    associations = source_classifier.all_associations
+    if association is not None:
+        associations = [association]
     matches_association_order = []
     matches_reverse_association_order = []
     matching_classifier = None
 
     for association in associations:
         for target_classifierCandidate in target_classifier_candidates:
-            if (association.matches_target_(target_classifierCandidate, context.role_name) and
-                    association.matches_source_(context.sourceClassifier, None)):
+            if (association.matches_target_(target_classifierCandidate, role_name) and
+                    association.matches_source_(source_classifier, None)):
                 matches_association_order.append(association)
                 matching_classifier = target_classifierCandidate
-            elif (association.matches_source_(target_classifierCandidate, context.role_name) and
-                  association.matches_target_(context.sourceClassifier, None)):
+            elif (association.matches_source_(target_classifierCandidate, role_name) and
+                  association.matches_target_(source_classifier, None)):
                 matches_reverse_association_order.append(association)
                 matching_classifier = target_classifierCandidate
     matches = len(matches_association_order) + len(matches_reverse_association_order)
+    if matches != 1:
+        return matches, source_classifier, None, None, None
+    if len(matches_association_order) == 1:
+        return matches, source_classifier, matches_association_order[0], True, matching_classifier
+    return matches, source_classifier, matches_reverse_association_order[0], False, matching_classifier
+
+
+def _determine_matching_association_and_set_context_info(context, source, targets):
+    global _resolved_associations, _resolved_associations_version
+
+    if source.class_object_class is not None:
+        target_classifier_candidates = tuple(get_common_metaclasses(
+            [co.class_object_class if not is_clink(co) else co for co in targets]))
+        source_classifier = source.class_object_class.metaclass
+    else:
+        target_classifier_candidates = (get_common_classifier(targets),)
+        source_classifier = source.classifier
+
+    if _resolved_associations_version != CClassifier.structure_version_:
+        _resolved_associations = {}
+        _resolved_associations_version = CClassifier.structure_version_
+    key = (source_classifier, target_classifier_candidates, context.role_name, context.association,
+           context.target_classifier)
+    try:
+        resolution = _resolved_associations[key]
+    except KeyError:
+        resolution = _resolve_association(source_classifier, target_classifier_candidates, context.role_name,
+                                          context.association, context.target_classifier)
+        _resolved_associations[key] = resolution
+    matches, context.sourceClassifier, association, matches_in_order, matching_classifier = resolution
+
     if matches == 1:
-        if len(matches_association_order) == 1:
-            context.association = matches_association_order[0]
-            context.matchesInOrder[source] = True
-        else:
-            context.association = matches_reverse_association_order[0]
-            context.matchesInOrder[source] = False
+        context.association = association
+        context.matchesInOrder[source] = matches_in_order
         context.target_classifier = matching_classifier
     elif matches == 0:
         raise CException(f"matching association not found for source '{source!s}' " +
@@ -385,22 +438,24 @@ def link_objects_(context, source, targets):
         if not context.matchesInOrder[source_obj]:
             source_for_link = target
             target_for_link = source_obj
-        for existingLink in source_obj.links_:
-            if (existingLink.source_ == source_for_link and existingLink.target_ == target_for_link
-                    and existingLink.association == context.association):
-                for link in new_links:
-                    link.delete()
-                raise CException(
-                    f"trying to link the same link twice '{source!s} -> {target!s}'' twice for the same association")
+        if source_obj.get_link_(context.association, source_for_link, target_for_link) is not None:
+            for link in new_links:
+                link.delete()
+            raise CException(
+                f"trying to link the same link twice '{source!s} -> {target!s}'' twice for the same association")
         link = CLink(context.association, source_for_link, target_for_link)
+        if ctransaction.active_transaction_ is not None:
+            ctransaction.active_transaction_.link_created_(link)
         if context.label is not None:
             link.label = context.label
 
         new_links.append(link)
-        source_obj.links_.append(link)
+        source_obj.add_link_(link)
         # for links from this object to itself, store only one link object
         if source_obj != target:
-            target.links_.append(link)
+            target.add_link_(link)
+        if cevents.has_subscribers_:
+            cevents.emit_(cevents.CLinkAdded(link))
         if context.stereotype_instances is not None:
             link.stereotype_instances = context.stereotype_instances
         if context.tagged_values is not None:
@@ -410,12 +465,12 @@ def link_objects_(context, source, targets):
 
 def remove_links_for_associations_(context, source, targets):
     if source not in context.objectLinksHaveBeenRemoved:
-        context.objectLinksHaveBeenRemoved.append(source)
+        context.objectLinksHaveBeenRemoved.add(source)
         for link in source.get_links_for_association(context.association):
             link.delete()
     for target in targets:
         if target not in context.objectLinksHaveBeenRemoved:
-            context.objectLinksHaveBeenRemoved.append(target)
+            context.objectLinksHaveBeenRemoved.add(target)
             for link in target.get_links_for_association(context.association):
                 link.delete()
 
@@ -458,15 +513,18 @@ def set_links(link_definitions, do_add_links=False, **kwargs):
             for link in new_links:
                 link.delete()
             raise e
+    if ctransaction.active_transaction_ is not None:
+        # multiplicities are checked when the transaction is committed
+        return new_links
     try:
         for source in link_definitions:
             targets = link_definitions[source]
-            source_len = len(source.get_links_for_association(context.association))
+            source_len = source.get_number_of_links_for_association_(context.association)
             if len(targets) == 0:
                 context.association.check_multiplicity_(source, source_len, 0, context.matchesInOrder[source])
             else:
                 for target in targets:
-                    target_len = len(target.get_links_for_association(context.association))
+                    target_len = target.get_number_of_links_for_association_(context.association)
                     context.association.check_multiplicity_(source, source_len, target_len,
                                                             context.matchesInOrder[source])
                     context.association.check_multiplicity_(target, target_len, source_len,
@@ -559,26 +617,27 @@ def delete_links(link_definitions, **kwargs):
     for source in link_definitions:
         targets = link_definitions[source]
 
+        if context.association is not None:
+            associations = [context.association] if context.association in source.association_links_ else []
+        else:
+            associations = list(source.association_links_)
+
         for target in targets:
             matches_in_order = None
             matching_link = None
-            for link in source.links_:
-                if context.association is not None and link.association != context.association:
-                    continue
-                matches_in_order = True
-                matches = False
-                if source == link.source_ and target == link.target_:
-                    matches = True
-                    if context.role_name is not None and not link.association.role_name == context.role_name:
-                        matches = False
-                if target == link.source_ and source == link.target_:
-                    matches = True
-                    matches_in_order = False
-                    if context.role_name is not None and not link.association.source_role_name == context.role_name:
-                        matches = False
-                if matches:
+            # look up the links in both directions in the association index of the source
+            for association in associations:
+                for link, in_order in [(source.get_link_(association, target, source), False),
+                                       (source.get_link_(association, source, target), True)]:
+                    if link is None or (in_order and source == target):
+                        # a link from an object to itself is only considered once (as a reverse match)
+                        continue
+                    role_name = association.role_name if in_order else association.source_role_name
+                    if context.role_name is not None and not role_name == context.role_name:
+                        continue
                     if matching_link is None:
                         matching_link = link
+                        matches_in_order = in_order
                     else:
                         raise CException("link definition in delete links ambiguous for link " +
                                          f"'{source!s}->{target!s}': found multiple matches")
@@ -594,12 +653,13 @@ def delete_links(link_definitions, **kwargs):
                 raise CException(f"no link found for '{source!s} -> {target!s}' " +
                                  "in delete links" + role_name_string + association_string)
             else:
-                if matches_in_order is None:
-                    raise CException(f"no link found for '{source!s} -> {target!s}' in delete links")
-                source_len = len(source.get_links_for_association(matching_link.association)) - 1
-                target_len = len(target.get_links_for_association(matching_link.association)) - 1
-                matching_link.association.check_multiplicity_(source, source_len, target_len, matches_in_order)
-                matching_link.association.check_multiplicity_(target, target_len, source_len, not matches_in_order)
+                if ctransaction.active_transaction_ is None:
+                    # in a transaction, multiplicities are checked when the transaction is committed
+                    source_len = source.get_number_of_links_for_association_(matching_link.association) - 1
+                    target_len = target.get_number_of_links_for_association_(matching_link.association) - 1
+                    matching_link.association.check_multiplicity_(source, source_len, target_len, matches_in_order)
+                    matching_link.association.check_multiplicity_(target, target_len, source_len,
+                                                                  not matches_in_order)
                 matching_link.delete()
 
 
@@ -617,4 +677,4 @@ class LinkKeywordsContext(object):
         self.sourceClassifier = None
         self.target_classifier = None
         self.matchesInOrder = {}
-        self.objectLinksHaveBeenRemoved = []
+        self.objectLinksHaveBeenRemoved = set()
@@ -0,0 +1,793 @@
+import json
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+
+from codeable_models.cexception import CException
+from codeable_models.internal.commons import is_cclass, is_cobject, check_is_cclass, \
+    check_named_element_is_not_deleted
+
+# A mapped snapshot file consists of the magic bytes, the sections, the directory (a JSON document describing
+# the classes and associations and the offsets of the sections), and the offset of the directory. The sections
+# hold the objects and links in arrays of integers and blobs of JSON documents, which are accessed in place
+# through a memory map of the file:
+#
+# - object_classes, object_names, object_values: the class index of each object, and the offsets of its
+#   name and values in the names and values blobs (the objects of a class are stored contiguously)
+# - name_index: the indices of the named objects, sorted by their encoded names
+# - link_associations, link_sources, link_targets, link_values: the association index and the source and
+#   target object indices of each link, and the offsets of its label, tagged values, and stereotype instances
+#   in the link values blob
+# - per association, the indices of its links sorted by source (out) and by target (in) objects, together
+#   with the sorted source and target object indices (out_keys and in_keys) for binary search
+#
+# Elements are referenced in values as {"$ref": object index} and {"$class": class index}.
+MAPPED_SNAPSHOT_MAGIC = b"CMMAP\x00\x00\x01"
+_DIRECTORY_OFFSET_FORMAT = "<Q"
+_SECTION_ALIGNMENT = 8
+_INDEX_TYPE = "I"
+_OFFSET_TYPE = "Q"
+
+
+def _encode_name(name):
+    return json.dumps(name).encode("utf-8")
+
+
+class _MappedSnapshotWriter(object):
+    def __init__(self, classes):
+        self.classes_ = []
+        self.class_indices_ = {}
+        for cl in classes:
+            self._add_class(cl)
+        self.associations_ = []
+        self.association_indices_ = {}
+        for cl in self.classes_:
+            for association in cl.associations_:
+                if (association not in self.association_indices_ and association.source in self.class_indices_ and
+                        association.target in self.class_indices_):
+                    self.association_indices_[association] = len(self.associations_)
+                    self.associations_.append(association)
+        self.objects_ = []
+        self.object_indices_ = {}
+        for cl in self.classes_:
+            for obj in cl.objects_:
+                self.object_indices_[obj] = len(self.objects_)
+                self.objects_.append(obj)
+        self.sections_ = {}
+
+    def _add_class(self, cl):
+        # the superclasses of a class are saved before the class
+        if cl in self.class_indices_:
+            return
+        check_is_cclass(cl)
+        check_named_element_is_not_deleted(cl)
+        self.class_indices_[cl] = None
+        for superclass in cl.superclasses_:
+            self._add_class(superclass)
+        self.class_indices_[cl] = len(self.classes_)
+        self.classes_.append(cl)
+
+    def _encode_value(self, value):
+        if isinstance(value, list):
+            return [self._encode_value(item) for item in value]
+        if is_cobject(value):
+            if value not in self.object_indices_:
+                raise CException(f"cannot save reference to '{value!s}': element is not saved in the snapshot")
+            return {"$ref": self.object_indices_[value]}
+        if is_cclass(value):
+            if value not in self.class_indices_:
+                raise CException(f"cannot save reference to '{value!s}': element is not saved in the snapshot")
+            return {"$class": self.class_indices_[value]}
+        return value
+
+    def _encode_values(self, values):
+        return {name: self._encode_value(value) for name, value in values.items()}
+
+    def _write_section(self, file, name, data):
+        padding = -file.tell() % _SECTION_ALIGNMENT
+        file.write(b"\x00" * padding)
+        self.sections_[name] = (file.tell(), len(data))
+        file.write(data)
+
+    def _write_array_section(self, file, name, data):
+        self._write_section(file, name, data.tobytes())
+
+    def _write_blob_sections(self, file, name, documents):
+        # writes the documents to a blob section and their start offsets (plus the end offset) to an array
+        # section; empty documents are written as empty strings
+        offsets = array(_OFFSET_TYPE, [0])
+        blob = bytearray()
+        for document in documents:
+            if document:
+                blob.extend(json.dumps(document, separators=(",", ":")).encode("utf-8"))
+            offsets.append(len(blob))
+        self._write_array_section(file, name, offsets)
+        self._write_section(file, name + "_blob", bytes(blob))
+
+    def _get_class_document(self, cl, objects_start):
+        document = {"name": cl.name, "metaclass": cl.metaclass.name,
+                    "superclasses": [self.class_indices_[superclass] for superclass in cl.superclasses_],
+                    "attributes": list(cl.attributes_), "values": self._encode_values(cl.values),
+                    "stereotype_instances": [s.name for s in cl.stereotype_instances_holder.stereotypes_],
+                    "tagged_values": self._encode_values(cl.tagged_values),
+                    "objects": [objects_start, len(cl.objects_)]}
+        return document
+
+    @staticmethod
+    def _get_association_document(association, class_indices):
+        return {"name": association.name, "source": class_indices[association.source],
+                "target": class_indices[association.target], "role_name": association.role_name,
+                "source_role_name": association.source_role_name, "multiplicity": association.multiplicity,
+                "source_multiplicity": association.source_multiplicity, "aggregation": association.aggregation,
+                "composition": association.composition}
+
+    def write(self, file):
+        file.write(MAPPED_SNAPSHOT_MAGIC)
+        class_documents = []
+        objects_start = 0
+        for cl in self.classes_:
+            class_documents.append(self._get_class_document(cl, objects_start))
+            objects_start += len(cl.objects_)
+
+        object_indices = self.object_indices_
+        self._write_array_section(file, "object_classes",
+                                  array(_INDEX_TYPE, (self.class_indices_[o.classifier_] for o in self.objects_)))
+        encoded_names = [_encode_name(o.name) for o in self.objects_]
+        name_offsets = array(_OFFSET_TYPE, [0])
+        for encoded_name in encoded_names:
+            name_offsets.append(name_offsets[-1] + len(encoded_name))
+        self._write_array_section(file, "object_names", name_offsets)
+        self._write_section(file, "object_names_blob", b"".join(encoded_names))
+        self._write_array_section(file, "name_index", array(_INDEX_TYPE, sorted(
+            (i for i, o in enumerate(self.objects_) if o.name is not None), key=encoded_names.__getitem__)))
+        del encoded_names
+        self._write_blob_sections(file, "object_values", (self._encode_values(o.values) for o in self.objects_))
+
+        links = []
+        for obj in self.objects_:
+            for link in obj.links_:
+                if (link.source_ is obj and link.association in self.association_indices_ and
+                        link.target_ in object_indices):
+                    links.append(link)
+        association_indices = self.association_indices_
+        self._write_array_section(file, "link_associations",
+                                  array(_INDEX_TYPE, (association_indices[link.association] for link in links)))
+        link_sources = array(_INDEX_TYPE, (object_indices[link.source_] for link in links))
+        link_targets = array(_INDEX_TYPE, (object_indices[link.target_] for link in links))
+        self._write_array_section(file, "link_sources", link_sources)
+        self._write_array_section(file, "link_targets", link_targets)
+        link_documents = []
+        for link in links:
+            document = {}
+            if link.label is not None:
+                document["label"] = link.label
+            tagged_values = link.tagged_values
+            if len(tagged_values) > 0:
+                document["tagged_values"] = self._encode_values(tagged_values)
+            if link.stereotype_instances_holder_ is not None and len(
+                    link.stereotype_instances_holder_.stereotypes_) > 0:
+                document["stereotype_instances"] = [s.name for s in link.stereotype_instances_holder_.stereotypes_]
+            link_documents.append(document)
+        self._write_blob_sections(file, "link_values", link_documents)
+        del link_documents
+
+        links_of_associations = [[] for _ in self.associations_]
+        for i, link in enumerate(links):
+            links_of_associations[association_indices[link.association]].append(i)
+        for association_index, link_indices in enumerate(links_of_associations):
+            for direction, ends in (("out", link_sources), ("in", link_targets)):
+                sorted_link_indices = sorted(link_indices, key=ends.__getitem__)
+                self._write_array_section(file, f"{association_index!s}_{direction!s}_keys",
+                                          array(_INDEX_TYPE, (ends[i] for i in sorted_link_indices)))
+                self._write_array_section(file, f"{association_index!s}_{direction!s}",
+                                          array(_INDEX_TYPE, sorted_link_indices))
+
+        directory_offset = file.tell()
+        file.write(json.dumps({
+            "byteorder": sys.byteorder,
+            "classes": class_documents,
+            "associations": [self._get_association_document(a, self.class_indices_) for a in self.associations_],
+            "number_of_objects": len(self.objects_),
+            "number_of_links": len(links),
+            "sections": self.sections_}).encode("utf-8"))
+        file.write(struct.pack(_DIRECTORY_OFFSET_FORMAT, directory_offset))
+
+
+def save_mapped_snapshot(file_name, classes):
+    """Save the classes and their objects to a read-only snapshot file that is opened with
+    :py:func:`.open_mapped_snapshot`. In contrast to :py:func:`.load_snapshot`, opening a mapped snapshot
+    does not load the model, but maps the file into memory and creates views on the classes, objects, and
+    links only when they are accessed. That is, opening even very large models is almost instant, and only
+    the accessed parts of the model use memory::
+
+        save_mapped_snapshot("shop.cmmap", [cart, item])
+        with open_mapped_snapshot("shop.cmmap") as snapshot:
+            for obj in snapshot.get_class("Cart").get_object("cart1").linked:
+                print(obj.name, obj.values)
+
+    The snapshot contains the classes (and their superclasses), their objects, the associations between the
+    classes, and the links between the objects, including their names, values, labels, and tagged values.
+    Meta-classes and stereotypes are saved by name.
+
+    Args:
+        file_name: The name of the file to write.
+        classes (list[CClass]): The classes to save.
+
+    Returns:
+        None
+    """
+    if is_cclass(classes):
+        classes = [classes]
+    elif not isinstance(classes, list):
+        raise CException("classes requires a list or a class as input")
+    writer = _MappedSnapshotWriter(classes)
+    with open(file_name, "wb") as file:
+        writer.write(file)
+
+
+def open_mapped_snapshot(file_name):
+    """Open a snapshot file written with :py:func:`.save_mapped_snapshot`.
+
+    Args:
+        file_name: The name of the file to open.
+
+    Returns:
+        CMappedSnapshot: The opened snapshot.
+    """
+    return CMappedSnapshot(file_name)
+
+
+class CMappedSnapshot(object):
+    def __init__(self, file_name):
+        """``CMappedSnapshot`` gives read-only access to a model saved with :py:func:`.save_mapped_snapshot`.
+        The file is memory-mapped, and views on the classes, objects, associations, and links
+        (:py:class:`.CMappedClass`, :py:class:`.CMappedObject`, :py:class:`.CMappedAssociation`, and
+        :py:class:`.CMappedLink`) are created when they are accessed. Objects are looked up by name with
+        a binary search on the name index of the snapshot, and the links of an object with a binary search
+        on the link indices of its associations.
+
+        The snapshot should be closed with :py:meth:`close` (or used as a context manager). Views must not be
+        used after the snapshot is closed.
+
+        Args:
+            file_name: The name of the file to open.
+        """
+        self.file_name = file_name
+        self.file_ = open(file_name, "rb")
+        self.mmap_ = None
+        self.sections_ = []
+        self.objects_ = {}
+        self.links_ = {}
+        try:
+            self._open()
+        except BaseException:
+            self.close()
+            raise
+
+    def _open(self):
+        if self.file_.read(len(MAPPED_SNAPSHOT_MAGIC)) != MAPPED_SNAPSHOT_MAGIC:
+            raise CException(f"'{self.file_name!s}' is not a mapped model snapshot")
+        try:
+            self.mmap_ = mmap.mmap(self.file_.fileno(), 0, access=mmap.ACCESS_READ)
+            directory_offset, = struct.unpack_from(_DIRECTORY_OFFSET_FORMAT, self.mmap_,
+                                                   len(self.mmap_) - struct.calcsize(_DIRECTORY_OFFSET_FORMAT))
+            directory = json.loads(self.mmap_[directory_offset:-struct.calcsize(_DIRECTORY_OFFSET_FORMAT)])
+            if directory["byteorder"] != sys.byteorder:
+                raise CException(f"'{self.file_name!s}' has been saved on a platform with a different byte order")
+            sections = directory["sections"]
+            self.object_classes_ = self._get_section(sections, "object_classes", _INDEX_TYPE)
+            self.object_names_ = self._get_section(sections, "object_names", _OFFSET_TYPE)
+            self.object_names_blob_ = self._get_section(sections, "object_names_blob")
+            self.name_index_ = self._get_section(sections, "name_index", _INDEX_TYPE)
+            self.object_values_ = self._get_section(sections, "object_values", _OFFSET_TYPE)
+            self.object_values_blob_ = self._get_section(sections, "object_values_blob")
+            self.link_associations_ = self._get_section(sections, "link_associations", _INDEX_TYPE)
+            self.link_sources_ = self._get_section(sections, "link_sources", _INDEX_TYPE)
+            self.link_targets_ = self._get_section(sections, "link_targets", _INDEX_TYPE)
+            self.link_values_ = self._get_section(sections, "link_values", _OFFSET_TYPE)
+            self.link_values_blob_ = self._get_section(sections, "link_values_blob")
+            self.classes_ = [CMappedClass(self, i, document) for i, document in enumerate(directory["classes"])]
+            self.associations_ = []
+            for i, document in enumerate(directory["associations"]):
+                adjacency = tuple(self._get_section(sections, f"{i!s}_{name!s}", _INDEX_TYPE)
+                                  for name in ("out_keys", "out", "in_keys", "in"))
+                self.associations_.append(CMappedAssociation(self, i, document, adjacency))
+            self.number_of_objects_ = directory["number_of_objects"]
+            self.number_of_links_ = directory["number_of_links"]
+        except (ValueError, KeyError, IndexError, TypeError, struct.error) as e:
+            raise CException(f"'{self.file_name!s}' is not a valid mapped model snapshot: {e!s}")
+        for cl in self.classes_:
+            cl.init_(self)
+
+    def _get_section(self, sections, name, item_type=None):
+        offset, length = sections[name]
+        if offset + length > len(self.mmap_):
+            raise ValueError(f"section '{name!s}' exceeds the file")
+        section = memoryview(self.mmap_)[offset:offset + length]
+        self.sections_.append(section)
+        if item_type is not None:
+            section = section.cast(item_type)
+            self.sections_.append(section)
+        return section
+
+    def close(self):
+        """Close the snapshot.
+
+        Returns:
+            None
+        """
+        # the views on the memory map must be released before it can be closed
+        for section in reversed(self.sections_):
+            section.release()
+        self.sections_ = []
+        if self.mmap_ is not None:
+            self.mmap_.close()
+            self.mmap_ = None
+        self.file_.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def classes(self):
+        """list[CMappedClass]: The classes of the snapshot."""
+        return list(self.classes_)
+
+    def get_class(self, name):
+        """Get the class with the given name.
+
+        Args:
+            name (str): The name of the class.
+
+        Returns:
+            CMappedClass: The class or ``None``, if no class with the name exists.
+        """
+        for cl in self.classes_:
+            if cl.name == name:
+                return cl
+        return None
+
+    @property
+    def associations(self):
+        """list[CMappedAssociation]: The associations of the snapshot."""
+        return list(self.associations_)
+
+    @property
+    def number_of_objects(self):
+        """int: The number of objects in the snapshot."""
+        return self.number_of_objects_
+
+    @property
+    def number_of_links(self):
+        """int: The number of links in the snapshot."""
+        return self.number_of_links_
+
+    def get_objects(self, name):
+        """Get the objects with the given name, using the name index of the snapshot.
+
+        Args:
+            name (str): The name of the objects.
+
+        Returns:
+            list[CMappedObject]: The objects.
+        """
+        encoded_name = _encode_name(name)
+        name_index = self.name_index_
+        low, high = 0, len(name_index)
+        while low < high:
+            middle = (low + high) // 2
+            if self.get_encoded_name_(name_index[middle]) < encoded_name:
+                low = middle + 1
+            else:
+                high = middle
+        objects = []
+        while low < len(name_index) and self.get_encoded_name_(name_index[low]) == encoded_name:
+            objects.append(self.get_object_(name_index[low]))
+            low += 1
+        return objects
+
+    def get_encoded_name_(self, object_index):
+        return self.object_names_blob_[self.object_names_[object_index]:self.object_names_[object_index + 1]].tobytes()
+
+    def get_object_(self, object_index):
+        obj = self.objects_.get(object_index)
+        if obj is None:
+            obj = CMappedObject(self, object_index)
+            self.objects_[object_index] = obj
+        return obj
+
+    def get_link_(self, link_index):
+        link = self.links_.get(link_index)
+        if link is None:
+            link = CMappedLink(self, link_index)
+            self.links_[link_index] = link
+        return link
+
+    @staticmethod
+    def get_document_(offsets, blob, index):
+        start, end = offsets[index], offsets[index + 1]
+        if start == end:
+            return {}
+        return json.loads(blob[start:end].tobytes())
+
+    def decode_value_(self, value):
+        if isinstance(value, list):
+            return [self.decode_value_(item) for item in value]
+        if isinstance(value, dict):
+            if "$ref" in value:
+                return self.get_object_(value["$ref"])
+            if "$class" in value:
+                return self.classes_[value["$class"]]
+        return value
+
+    def decode_values_(self, values):
+        return {name: self.decode_value_(value) for name, value in values.items()}
+
+
+class _MappedObjects(Sequence):
+    # the objects of a class, which are stored contiguously in the snapshot
+    def __init__(self, snapshot, start, length):
+        self.snapshot_ = snapshot
+        self.start_ = start
+        self.length_ = length
+
+    def __len__(self):
+        return self.length_
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.length_))]
+        if index < 0:
+            index += self.length_
+        if not 0 <= index < self.length_:
+            raise IndexError("object index out of range")
+        return self.snapshot_.get_object_(self.start_ + index)
+
+    def __repr__(self):
+        return f"<mapped objects of length {self.length_!s}>"
+
+
+class CMappedClass(object):
+    def __init__(self, snapshot, index, document):
+        """``CMappedClass`` is a read-only view on a class in a :py:class:`.CMappedSnapshot`.
+
+        Args:
+            snapshot (CMappedSnapshot): The snapshot.
+            index (int): The index of the class in the snapshot.
+            document (dict): The description of the class in the snapshot directory.
+        """
+        self.snapshot_ = snapshot
+        self.index_ = index
+        self.name = document["name"]
+        self.metaclass_name = document["metaclass"]
+        self.superclass_indices_ = document["superclasses"]
+        self.attribute_names_ = document["attributes"]
+        self.values_ = document["values"]
+        self.stereotype_instance_names_ = document["stereotype_instances"]
+        self.tagged_values_ = document["tagged_values"]
+        self.objects_start_, self.number_of_objects_ = document["objects"]
+        self.superclasses_ = []
+        self.subclasses_ = []
+        # association -> whether this class is at the source of the association, for the associations of
+        # this class and its superclasses
+        self.association_ends_ = None
+
+    def init_(self, snapshot):
+        self.superclasses_ = [snapshot.classes_[i] for i in self.superclass_indices_]
+        for superclass in self.superclasses_:
+            superclass.subclasses_.append(self)
+
+    def __str__(self):
+        return self.name
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__!s}: {self.name!s}>"
+
+    @property
+    def superclasses(self):
+        """list[CMappedClass]: The superclasses of the class."""
+        return list(self.superclasses_)
+
+    @property
+    def subclasses(self):
+        """list[CMappedClass]: The subclasses of the class."""
+        return list(self.subclasses_)
+
+    @property
+    def all_superclasses(self):
+        """list[CMappedClass]: All superclasses of the class (transitively)."""
+        result = []
+        for superclass in self.superclasses_:
+            for cl in [superclass] + superclass.all_superclasses:
+                if cl not in result:
+                    result.append(cl)
+        return result
+
+    @property
+    def all_subclasses(self):
+        """list[CMappedClass]: All subclasses of the class (transitively)."""
+        result = []
+        for subclass in self.subclasses_:
+            for cl in [subclass] + subclass.all_subclasses:
+                if cl not in result:
+                    result.append(cl)
+        return result
+
+    @property
+    def attribute_names(self):
+        """list[str]: The names of the attributes defined on the class."""
+        return list(self.attribute_names_)
+
+    @property
+    def values(self):
+        """dict[str, value]: The attribute values of the class (defined by its meta-class)."""
+        return self.snapshot_.decode_values_(self.values_)
+
+    @property
+    def stereotype_instance_names(self):
+        """list[str]: The names of the stereotype instances of the class."""
+        return list(self.stereotype_instance_names_)
+
+    @property
+    def tagged_values(self):
+        """dict[str, value]: The tagged values of the class."""
+        return self.snapshot_.decode_values_(self.tagged_values_)
+
+    @property
+    def objects(self):
+        """Sequence[CMappedObject]: The objects of the class. The views on the objects are created
+        when they are accessed."""
+        return _MappedObjects(self.snapshot_, self.objects_start_, self.number_of_objects_)
+
+    @property
+    def all_objects(self):
+        """list[CMappedObject]: The objects of the class and of all its subclasses."""
+        all_objects = list(self.objects)
+        for cl in self.all_subclasses:
+            all_objects.extend(cl.objects)
+        return all_objects
+
+    def get_object(self, name):
+        """Get the object of the class with the given name, using the name index of the snapshot.
+
+        Args:
+            name (str): The name of the object.
+
+        Returns:
+            CMappedObject: The object or ``None``, if no object with the name exists.
+        """
+        for obj in self.snapshot_.get_objects(name):
+            if obj.classifier_ is self:
+                return obj
+        return None
+
+    def conforms_to_type(self, cl):
+        """Check whether the class is the class ``cl`` or one of its subclasses.
+
+        Args:
+            cl (CMappedClass): The class to check.
+
+        Returns:
+            bool: The result of the check.
+        """
+        return cl is self or cl in self.all_superclasses
+
+    def get_association_ends_(self):
+        if self.association_ends_ is None:
+            classes = [self] + self.all_superclasses
+            self.association_ends_ = []
+            for association in self.snapshot_.associations_:
+                if association.source_ in classes:
+                    self.association_ends_.append((association, True))
+                if association.target_ in classes:
+                    self.association_ends_.append((association, False))
+        return self.association_ends_
+
+
+class CMappedAssociation(object):
+    def __init__(self, snapshot, index, document, adjacency):
+        """``CMappedAssociation`` is a read-only view on an association in a :py:class:`.CMappedSnapshot`.
+
+        Args:
+            snapshot (CMappedSnapshot): The snapshot.
+            index (int): The index of the association in the snapshot.
+            document (dict): The description of the association in the snapshot directory.
+            adjacency: The link index sections of the association.
+        """
+        self.snapshot_ = snapshot
+        self.index_ = index
+        self.name = document["name"]
+        self.source_ = snapshot.classes_[document["source"]]
+        self.target_ = snapshot.classes_[document["target"]]
+        self.role_name = document["role_name"]
+        self.source_role_name = document["source_role_name"]
+        self.multiplicity = document["multiplicity"]
+        self.source_multiplicity = document["source_multiplicity"]
+        self.aggregation = document["aggregation"]
+        self.composition = document["composition"]
+        self.out_keys_, self.out_, self.in_keys_, self.in_ = adjacency
+
+    def __str__(self):
+        return str(self.name)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__!s}: {self.name!s}>"
+
+    @property
+    def source(self):
+        """CMappedClass: The source class of the association."""
+        return self.source_
+
+    @property
+    def target(self):
+        """CMappedClass: The target class of the association."""
+        return self.target_
+
+    def get_link_indices_(self, object_index, at_source):
+        keys, link_indices = (self.out_keys_, self.out_) if at_source else (self.in_keys_, self.in_)
+        return link_indices[bisect_left(keys, object_index):bisect_right(keys, object_index)]
+
+
+class CMappedObject(object):
+    def __init__(self, snapshot, index):
+        """``CMappedObject`` is a read-only view on an object in a :py:class:`.CMappedSnapshot`. Views are
+        created by the snapshot: use the ``objects`` and ``get_object()`` of :py:class:`.CMappedClass` or
+        ``get_objects()`` of :py:class:`.CMappedSnapshot` to access objects.
+
+        Args:
+            snapshot (CMappedSnapshot): The snapshot.
+            index (int): The index of the object in the snapshot.
+        """
+        self.snapshot_ = snapshot
+        self.index_ = index
+        self.classifier_ = snapshot.classes_[snapshot.object_classes_[index]]
+
+    def __str__(self):
+        return str(self.name)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__!s}: {self.name!s}>"
+
+    @property
+    def name(self):
+        """str: The name of the object."""
+        return json.loads(self.snapshot_.get_encoded_name_(self.index_))
+
+    @property
+    def classifier(self):
+        """CMappedClass: The class of the object."""
+        return self.classifier_
+
+    def instance_of(self, cl):
+        """Check whether the object is an instance of the class ``cl`` or of one of its subclasses.
+
+        Args:
+            cl (CMappedClass): The class to check.
+
+        Returns:
+            bool: The result of the check.
+        """
+        return self.classifier_.conforms_to_type(cl)
+
+    @property
+    def values(self):
+        """dict[str, value]: The attribute values of the object. Values referencing objects or classes
+        are returned as views."""
+        snapshot = self.snapshot_
+        return snapshot.decode_values_(snapshot.get_document_(snapshot.object_values_,
+                                                              snapshot.object_values_blob_, self.index_))
+
+    def get_value(self, attribute_name):
+        """Get the value of an attribute of the object.
+
+        Args:
+            attribute_name (str): The name of the attribute.
+
+        Returns:
+            value: The value of the attribute.
+        """
+        values = self.values
+        if attribute_name not in values:
+            raise CException(f"attribute '{attribute_name!s}' unknown for '{self!s}'")
+        return values[attribute_name]
+
+    def _get_link_indices(self, association=None, role_name=None):
+        link_indices = {}
+        for a, at_source in self.classifier_.get_association_ends_():
+            if association is not None and a is not association:
+                continue
+            if role_name is not None and role_name != (a.role_name if at_source else a.source_role_name):
+                continue
+            for link_index in a.get_link_indices_(self.index_, at_source):
+                link_indices[link_index] = None
+        return link_indices
+
+    @property
+    def links(self):
+        """list[CMappedLink]: The links of the object, ordered by their associations."""
+        return [self.snapshot_.get_link_(i) for i in self._get_link_indices()]
+
+    @property
+    def linked(self):
+        """list[CMappedObject]: The objects linked to the object, ordered by the associations of the links."""
+        return self.get_linked()
+
+    def get_linked(self, association=None, role_name=None):
+        """Get the linked objects of the object.
+
+        Args:
+            association (CMappedAssociation): Include links only if they are based on the association.
+            role_name (str): Include links only if the linked object is at the end of the association
+                with the role name.
+
+        Returns:
+            list[CMappedObject]: The linked objects.
+        """
+        return [self.snapshot_.get_link_(i).get_opposite_object(self)
+                for i in self._get_link_indices(association, role_name)]
+
+
+class CMappedLink(object):
+    def __init__(self, snapshot, index):
+        """``CMappedLink`` is a read-only view on a link in a :py:class:`.CMappedSnapshot`.
+
+        Args:
+            snapshot (CMappedSnapshot): The snapshot.
+            index (int): The index of the link in the snapshot.
+        """
+        self.snapshot_ = snapshot
+        self.index_ = index
+        self.association = snapshot.associations_[snapshot.link_associations_[index]]
+        self.source_index_ = snapshot.link_sources_[index]
+        self.target_index_ = snapshot.link_targets_[index]
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__!s}: {self.source!s} -> {self.target!s}>"
+
+    @property
+    def source(self):
+        """CMappedObject: The source object of the link."""
+        return self.snapshot_.get_object_(self.source_index_)
+
+    @property
+    def target(self):
+        """CMappedObject: The target object of the link."""
+        return self.snapshot_.get_object_(self.target_index_)
+
+    def get_opposite_object(self, obj):
+        """Get the object at the other end of the link.
+
+        Args:
+            obj (CMappedObject): The object at one end of the link.
+
+        Returns:
+            CMappedObject: The object at the other end.
+        """
+        if obj.index_ == self.source_index_:
+            return self.target
+        return self.source
+
+    def _get_document(self):
+        snapshot = self.snapshot_
+        return snapshot.get_document_(snapshot.link_values_, snapshot.link_values_blob_, self.index_)
+
+    @property
+    def label(self):
+        """str: The label of the link."""
+        return self._get_document().get("label")
+
+    @property
+    def tagged_values(self):
+        """dict[str, value]: The tagged values of the link."""
+        return self.snapshot_.decode_values_(self._get_document().get("tagged_values", {}))
+
+    @property
+    def stereotype_instance_names(self):
+        """list[str]: The names of the stereotype instances of the link."""
+        return self._get_document().get("stereotype_instances", [])
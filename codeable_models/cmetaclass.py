@@ -1,10 +1,13 @@
 from codeable_models.cclassifier import CClassifier
 from codeable_models.cexception import CException
-from codeable_models.internal.commons import check_is_cclass
+from codeable_models.internal.commons import check_is_cclass, KIND_METACLASS
+from codeable_models.internal.element_index import ElementIndex
 from codeable_models.internal.stereotype_holders import CStereotypesHolder
 
 
 class CMetaclass(CClassifier):
+    kind_ = KIND_METACLASS
+
     def __init__(self, name=None, **kwargs):
         """``CMetaclass`` is used to define meta-classes. All classes (defined
         using :py:class:`.CClass`) in Codeable Models are instances of metaclasses.
@@ -41,7 +44,9 @@ class CMetaclass(CClassifier):
         :py:class:`.CClass` instances. Stereotypes can extend the meta-class. If this is the case,
         those stereotypes can be used as stereotype instances on the classes of the meta-class.
         """
-        self.classes_ = []
+        # classes are kept in an insertion-ordered dict used as an ordered set
+        self.classes_ = {}
+        self.classes_index_ = ElementIndex()
         self.stereotypes_holder = CStereotypesHolder(self)
         super().__init__(name, **kwargs)
 
@@ -61,7 +66,7 @@ class CMetaclass(CClassifier):
         """list[CClass]: Getter for the list of classes derived from this meta-class, either directly
         or in one of the sub-classes of the meta-class."""
         all_classes = list(self.classes_)
-        for scl in self.all_subclasses:
+        for scl in self.get_all_subclasses_():
             if isinstance(scl, CMetaclass):
                 for cl in scl.classes_:
                     all_classes.append(cl)
@@ -77,7 +82,7 @@ class CMetaclass(CClassifier):
             list[CClass]: The classes with the given name.
 
         """
-        return list(cl for cl in self.classes if cl.name == name)
+        return self.classes_index_.get_by_name(name)
 
     def get_class(self, name):
         """Gets the class directly derived from this meta-class that has the specified name. If more than one
@@ -103,7 +108,7 @@ class CMetaclass(CClassifier):
             list[CClass]: The stereotypes with the given name.
 
         """
-        return list(cl for cl in self.stereotypes if cl.name == name)
+        return self.stereotypes_holder.get_stereotypes_by_name_(name)
 
     def get_stereotype(self, name):
         """Gets the stereotype extending this meta-class that has the specified name. If more than one
@@ -132,7 +137,8 @@ class CMetaclass(CClassifier):
         check_is_cclass(cl)
         if cl in self.classes_:
             raise CException(f"class '{cl!s}' is already a class of the metaclass '{self!s}'")
-        self.classes_.append(cl)
+        self.classes_[cl] = None
+        self.classes_index_.add(cl)
 
     def remove_class(self, cl):
         """Remove the class ``cl`` from the classes of this meta-class. Raises an exception, if ``cl`` is
@@ -147,7 +153,8 @@ class CMetaclass(CClassifier):
         """
         if cl not in self.classes_:
             raise CException(f"can't remove class instance '{cl!s}' from metaclass '{self!s}': not a class instance")
-        self.classes_.remove(cl)
+        del self.classes_[cl]
+        self.classes_index_.remove(cl)
 
     def delete(self):
         """
@@ -163,10 +170,11 @@ class CMetaclass(CClassifier):
         classes_to_delete = list(self.classes_)
         for cl in classes_to_delete:
             cl.delete()
-        self.classes_ = []
+        self.classes_ = {}
+        self.classes_index_.clear()
         for s in self.stereotypes_holder.stereotypes_:
             s.extended_.remove(self)
-        self.stereotypes_holder.stereotypes_ = []
+        self.stereotypes_holder.reset_stereotypes_()
         super().delete()
 
     @property
@@ -213,9 +221,6 @@ class CMetaclass(CClassifier):
         return super(CMetaclass, self).association(target, descriptor, **kwargs)
 
     def compute_connected_(self, context):
-        super().compute_connected_(context)
-        connected = []
-        for s in self.stereotypes:
-            if s not in context.stop_elements_exclusive:
-                connected.append(s)
-        self.append_connected_(context, connected)
+        connected = super().compute_connected_(context)
+        connected.extend(s for s in self.stereotypes_holder.stereotypes_ if s not in context.excluded_elements)
+        return connected
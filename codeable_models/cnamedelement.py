@@ -1,8 +1,22 @@
 from codeable_models.cexception import CException
-from codeable_models.internal.commons import set_keyword_args
+from codeable_models.internal.commons import set_keyword_args, KIND_NAMED_ELEMENT
 
 
 class CNamedElement(object):
+    # slots are used for the base classes of CObject and CLink, which are created in large numbers
+    __slots__ = ("name_", "is_deleted")
+    # the kind tag of the elements defined by the class, and the kind tags of the class and its superclasses
+    # (see internal/commons.py)
+    kind_ = KIND_NAMED_ELEMENT
+    kinds_ = KIND_NAMED_ELEMENT
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        kinds = cls.__dict__.get("kind_", 0)
+        for superclass in cls.__mro__[1:]:
+            kinds |= getattr(superclass, "kinds_", 0)
+        cls.kinds_ = kinds
+
     def __init__(self, name, **kwargs):
         """CNamedElement is the superclass for all named elements in Codeable Models, such as CClass, CObject, and
         so on. The class is usually not used directly.
@@ -30,14 +44,32 @@ class CNamedElement(object):
         self.name = name
         super().__init__()
         self.is_deleted = False
+        self._init_keyword_args(**kwargs)
+
+    @property
+    def name(self):
+        """str: Getter and setter for the name of the entity. Can be ``None``."""
+        return self.name_
+
+    @name.setter
+    def name(self, name):
         if name is not None and not isinstance(name, str):
             raise CException(f"is not a name string: '{name!r}'")
-        self._init_keyword_args(**kwargs)
+        # the name is set before the subclass attributes are initialized, if it is set in __init__()
+        old_name = getattr(self, "name_", None)
+        self.name_ = name
+        if old_name != name:
+            self.name_changed_(old_name)
+
+    def name_changed_(self, old_name):
+        # called after the name has changed, to be overridden by subclasses that are indexed by name in
+        # their containers
+        pass
 
     def __str__(self):
-        if self.name is None:
+        if self.name_ is None:
             return ""
-        return self.name
+        return self.name_
 
     def __repr__(self):
         result = super().__repr__()
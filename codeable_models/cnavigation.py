@@ -0,0 +1,359 @@
+import operator
+import re
+from functools import lru_cache
+
+from codeable_models.cexception import CException
+from codeable_models.internal.commons import get_kinds, check_named_element_is_not_deleted, KIND_CLASS, KIND_OBJECT
+
+_TOKEN_PATTERN = re.compile(r"""\s*(?:
+    (?P<string>'[^']*'|"[^"]*")|
+    (?P<number>-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)|
+    (?P<name>[A-Za-z_][\w\-]*)|
+    (?P<symbol><<|>>|==|!=|<=|>=|[/@*\[\]:=<>])
+)""", re.VERBOSE)
+
+_OPERATORS = {"=": operator.eq, "==": operator.eq, "!=": operator.ne, "<": operator.lt, "<=": operator.le,
+              ">": operator.gt, ">=": operator.ge}
+_LITERAL_NAMES = {"true": True, "false": False, "none": None}
+
+
+def _tokenize(expression):
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKEN_PATTERN.match(expression, position)
+        if match is None or match.end() == position:
+            position += len(expression[position:]) - len(expression[position:].lstrip())
+            raise CException(f"invalid path expression '{expression!s}': unexpected character at position " +
+                             f"{position!s}")
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        position = match.end()
+    return tokens
+
+
+def _has_stereotype_named(stereotypes, name):
+    for stereotype in stereotypes:
+        if stereotype.name == name:
+            return True
+        for superclass in stereotype.get_all_superclasses_():
+            if superclass.name == name:
+                return True
+    return False
+
+
+def _get_element(obj):
+    # class objects are returned as their classes (as in CObject.get_linked())
+    return obj if obj.class_object_class_ is None else obj.class_object_class_
+
+
+class _AttributePredicate(object):
+    def __init__(self, attribute_name, compare, value):
+        self.attribute_name = attribute_name
+        self.compare = compare
+        self.value = value
+
+    def matches(self, element):
+        try:
+            return self.compare(element.get_value(self.attribute_name), self.value)
+        except (CException, TypeError):
+            # elements without the attribute, and values that cannot be compared to the value, do not match
+            return False
+
+
+class _TypePredicate(object):
+    def __init__(self, type_name):
+        self.type_name = type_name
+
+    def matches(self, element):
+        classifier = element.metaclass if get_kinds(element) & KIND_CLASS else element.classifier
+        if classifier.name == self.type_name:
+            return True
+        return any(cl.name == self.type_name for cl in classifier.get_all_superclasses_())
+
+
+class _StereotypePredicate(object):
+    def __init__(self, stereotype_name):
+        self.stereotype_name = stereotype_name
+
+    def matches(self, element):
+        classes = [element] if get_kinds(element) & KIND_CLASS else element.classifier.class_path
+        for cl in classes:
+            if _has_stereotype_named(cl.stereotype_instances_holder.stereotypes_, self.stereotype_name):
+                return True
+        return False
+
+
+class _Step(object):
+    # kinds of steps
+    ROLE = "role"
+    ASSOCIATION = "association"
+    ALL = "all"
+
+    def __init__(self, kind, name, link_stereotype_name, predicates):
+        self.kind = kind
+        self.name = name
+        self.link_stereotype_name = link_stereotype_name
+        self.predicates = predicates
+
+    def _get_matching_ends(self, association):
+        # returns whether the step follows the links of the association from their source objects, and whether
+        # it follows them from their target objects
+        if self.kind == _Step.ROLE:
+            return association.role_name == self.name, association.source_role_name == self.name
+        if self.kind == _Step.ASSOCIATION:
+            return (association.name == self.name,) * 2
+        return True, True
+
+    def _link_matches(self, link):
+        holder = link.stereotype_instances_holder_
+        return holder is not None and _has_stereotype_named(holder.stereotypes_, self.link_stereotype_name)
+
+    def apply_(self, objects):
+        # the matching ends of the associations are computed once per evaluation of the step, as the
+        # associations of an object are usually shared by many objects
+        matching_ends = {}
+        visited = set()
+        for obj in objects:
+            # use the links of the object indexed by association, to skip the links of non-matching associations
+            for association, links in obj.association_links_.items():
+                ends = matching_ends.get(association)
+                if ends is None:
+                    ends = self._get_matching_ends(association)
+                    matching_ends[association] = ends
+                from_source, from_target = ends
+                if not (from_source or from_target):
+                    continue
+                for (source, target), link in links.items():
+                    if from_source and source is obj:
+                        opposite = target
+                    elif from_target and target is obj:
+                        opposite = source
+                    else:
+                        continue
+                    if opposite in visited:
+                        continue
+                    if self.link_stereotype_name is not None and not self._link_matches(link):
+                        continue
+                    visited.add(opposite)
+                    if self.predicates:
+                        element = _get_element(opposite)
+                        if not all(predicate.matches(element) for predicate in self.predicates):
+                            continue
+                    yield opposite
+
+
+class _PathParser(object):
+    def __init__(self, expression):
+        self.expression = expression
+        self.tokens = _tokenize(expression)
+        self.position = 0
+
+    def _error(self, message):
+        return CException(f"invalid path expression '{self.expression!s}': {message!s}")
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def _accept(self, symbol):
+        if self._peek() == ("symbol", symbol):
+            self.position += 1
+            return True
+        return False
+
+    def _expect(self, symbol):
+        if not self._accept(symbol):
+            raise self._error(f"expected '{symbol!s}'")
+
+    def _parse_name(self):
+        token_type, value = self._peek()
+        if token_type == "name":
+            self.position += 1
+            return value
+        if token_type == "string":
+            self.position += 1
+            return value[1:-1]
+        raise self._error("expected a name")
+
+    def _parse_literal(self):
+        token_type, value = self._peek()
+        self.position += 1
+        if token_type == "string":
+            return value[1:-1]
+        if token_type == "number":
+            return float(value) if any(c in value for c in ".eE") else int(value)
+        if token_type == "name" and value.lower() in _LITERAL_NAMES:
+            return _LITERAL_NAMES[value.lower()]
+        raise self._error("expected a string, a number, true, false, or none")
+
+    def _parse_predicate(self):
+        if self._accept("<<"):
+            name = self._parse_name()
+            self._expect(">>")
+            return _StereotypePredicate(name)
+        if self._accept(":"):
+            return _TypePredicate(self._parse_name())
+        attribute_name = self._parse_name()
+        token_type, value = self._peek()
+        if token_type != "symbol" or value not in _OPERATORS:
+            raise self._error("expected a comparison operator")
+        self.position += 1
+        return _AttributePredicate(attribute_name, _OPERATORS[value], self._parse_literal())
+
+    def _parse_step(self):
+        name = None
+        if self._accept("@"):
+            kind = _Step.ASSOCIATION
+            name = self._parse_name()
+        elif self._accept("*"):
+            kind = _Step.ALL
+        else:
+            kind = _Step.ROLE
+            name = self._parse_name()
+        link_stereotype_name = None
+        if self._accept("<<"):
+            link_stereotype_name = self._parse_name()
+            self._expect(">>")
+        predicates = []
+        while self._accept("["):
+            predicates.append(self._parse_predicate())
+            self._expect("]")
+        return _Step(kind, name, link_stereotype_name, predicates)
+
+    def parse(self):
+        steps = [self._parse_step()]
+        while self._accept("/"):
+            steps.append(self._parse_step())
+        if self.position < len(self.tokens):
+            raise self._error(f"unexpected '{self.tokens[self.position][1]!s}'")
+        return steps
+
+
+class CPath(object):
+    def __init__(self, expression):
+        """``CPath`` is a compiled path expression used to navigate the links of objects (or classes). Paths are
+        usually created with :py:func:`.compile_path` or used with :py:func:`.navigate`.
+
+        A path expression consists of steps separated by ``/``. Each step follows the links of the elements
+        reached by the previous step:
+
+        - ``role``: Follows links to the linked elements at the association end with the role name
+          ``role`` (like ``get_linked(role_name="role")``).
+        - ``@association``: Follows links of the associations with the name ``association``, in both
+          directions.
+        - ``*``: Follows all links.
+
+        Names containing other characters than letters, digits, ``_``, and ``-`` are quoted, as in
+        ``@'connected to'``. A step can be restricted to links having a stereotype instance by appending
+        ``<<stereotype>>``, and to linked elements matching predicates in brackets:
+
+        - ``[attribute = value]``: The value of the attribute compares to the value with one of the
+          operators ``=`` (or ``==``), ``!=``, ``<``, ``<=``, ``>``, and ``>=``. The value is a quoted
+          string, a number, ``true``, ``false``, or ``none``.
+        - ``[:Class]``: The element is an instance of the class (or meta-class) or of one of its subclasses.
+        - ``[<<stereotype>>]``: The class of the element (or one of its superclasses), or the element itself
+          if it is a class, has a stereotype instance of the stereotype or of one of its sub-stereotypes.
+
+        Stereotypes and classes are matched by name, including the names of their superclasses. For example::
+
+            path = compile_path("connected_to<<HTTP>>/deployed_on[:Device][cores >= 4]")
+            devices = path.evaluate(components)
+
+        The elements reached by each step are deduplicated, i.e., the result contains each element only once.
+
+        Args:
+            expression (str): The path expression.
+        """
+        if not isinstance(expression, str):
+            raise CException(f"path expression '{expression!s}' is not a string")
+        self.expression = expression
+        self.steps_ = _PathParser(expression).parse()
+
+    def __str__(self):
+        return self.expression
+
+    def __repr__(self):
+        return f"CPath({self.expression!r})"
+
+    @staticmethod
+    def _get_start_objects(elements):
+        if not isinstance(elements, list):
+            elements = [elements]
+        objects = []
+        for element in elements:
+            kinds = get_kinds(element)
+            if kinds & KIND_CLASS:
+                check_named_element_is_not_deleted(element)
+                objects.append(element.class_object_)
+            elif kinds & KIND_OBJECT:
+                check_named_element_is_not_deleted(element)
+                objects.append(element)
+            else:
+                raise CException(f"'{element!s}' is not an object, class, or link")
+        return objects
+
+    def iterate(self, elements):
+        """Navigate the path from the elements, yielding the reached elements while the links are traversed.
+
+        Args:
+            elements: An object, class, or link, or a list of them, to start the navigation from.
+
+        Returns:
+            Iterator[CObject|CClass]: Generator of the reached elements.
+        """
+        objects = self._get_start_objects(elements)
+        # the elements are checked above, the navigation starts when the generator is first used
+        return self._navigate(objects)
+
+    def _navigate(self, objects):
+        for step in self.steps_:
+            objects = step.apply_(objects)
+        for obj in objects:
+            yield _get_element(obj)
+
+    def evaluate(self, elements):
+        """Navigate the path from the elements.
+
+        Args:
+            elements: An object, class, or link, or a list of them, to start the navigation from.
+
+        Returns:
+            list[CObject|CClass]: The reached elements.
+        """
+        return list(self.iterate(elements))
+
+
+@lru_cache(maxsize=256)
+def _compile_cached_path(expression):
+    return CPath(expression)
+
+
+def compile_path(expression):
+    """Compile a path expression (see :py:class:`.CPath`) into a path that can be evaluated for different
+    elements. Compiled paths are cached.
+
+    Args:
+        expression (str): The path expression.
+
+    Returns:
+        CPath: The compiled path.
+    """
+    # checked before the cache is used, as non-strings might not be hashable
+    if not isinstance(expression, str):
+        raise CException(f"path expression '{expression!s}' is not a string")
+    return _compile_cached_path(expression)
+
+
+def navigate(elements, expression):
+    """Navigate a path expression (see :py:class:`.CPath`) from the elements. For example::
+
+        devices = navigate(component, "connected_to/deployed_on[:Device]")
+
+    Args:
+        elements: An object, class, or link, or a list of them, to start the navigation from.
+        expression (str): The path expression.
+
+    Returns:
+        list[CObject|CClass]: The reached elements.
+    """
+    return compile_path(expression).evaluate(elements)
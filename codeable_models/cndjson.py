@@ -0,0 +1,466 @@
+import json
+
+from codeable_models.cattribute import CAttribute
+from codeable_models.cclass import CClass
+from codeable_models.cenum import CEnum
+from codeable_models.cexception import CException
+from codeable_models.clink import CLink, add_links
+from codeable_models.cobject import CObject
+from codeable_models.ctransaction import model_transaction
+from codeable_models.internal.commons import is_cclass, is_cenum, is_cmetaclass, is_cobject, is_clink, \
+    check_is_cclass, check_named_element_is_not_deleted
+
+# the names of the attribute types that are not model elements
+_ATTRIBUTE_TYPES = {"bool": bool, "int": int, "float": float, "str": str, "list": list}
+# the number of link records collected before the links are created with add_links()
+LINK_BATCH_SIZE = 10000
+
+
+def _dump_record(record):
+    return json.dumps(record, separators=(",", ":"))
+
+
+class _NDJSONExporter(object):
+    def __init__(self, classes):
+        self.classes_ = []
+        self.added_classes_ = set()
+        # element -> id of the record of the element; ids are assigned in the order in which the elements are
+        # exported or first referenced
+        self.ids_ = {}
+        self.associations_ = {}
+        for cl in classes:
+            self._add_class(cl)
+
+    def _add_class(self, cl):
+        # the superclasses of a class are exported before the class
+        if cl in self.added_classes_:
+            return
+        check_is_cclass(cl)
+        check_named_element_is_not_deleted(cl)
+        self.added_classes_.add(cl)
+        for superclass in cl.superclasses_:
+            self._add_class(superclass)
+        self.classes_.append(cl)
+
+    def _get_id(self, element):
+        element_id = self.ids_.get(element)
+        if element_id is None:
+            element_id = len(self.ids_) + 1
+            self.ids_[element] = element_id
+        return element_id
+
+    def _is_exported(self, element):
+        if is_clink(element):
+            return element.association in self.associations_
+        if is_cobject(element):
+            return element.classifier_ in self.added_classes_
+        if is_cclass(element):
+            return element in self.added_classes_
+        return False
+
+    def _get_reference(self, element):
+        if not self._is_exported(element):
+            raise CException(f"cannot export reference to '{element!s}': element is not exported")
+        return {"$ref": self._get_id(element)}
+
+    def _export_value(self, value):
+        if isinstance(value, list):
+            return [self._export_value(item) for item in value]
+        if is_cobject(value) or is_cclass(value):
+            return self._get_reference(value)
+        return value
+
+    def _export_values(self, values):
+        return {name: self._export_value(value) for name, value in values.items()}
+
+    def _export_attribute_type(self, attribute_type):
+        if is_cmetaclass(attribute_type):
+            return {"metaclass": attribute_type.name}
+        if is_cenum(attribute_type):
+            return {"$ref": self._get_id(attribute_type)}
+        if is_cclass(attribute_type):
+            return self._get_reference(attribute_type)
+        return attribute_type.__name__
+
+    def _export_enum_records(self, cl):
+        for attribute in cl.attributes_.values():
+            if is_cenum(attribute.type_) and attribute.type_ not in self.ids_:
+                yield {"type": "enum", "id": self._get_id(attribute.type_), "name": attribute.type_.name,
+                       "values": attribute.type_.values}
+
+    def _export_class_record(self, cl):
+        record = {"type": "class", "id": self._get_id(cl), "name": cl.name, "metaclass": cl.metaclass.name}
+        if len(cl.superclasses_) > 0:
+            record["superclasses"] = [self._get_id(superclass) for superclass in cl.superclasses_]
+        if len(cl.attributes_) > 0:
+            record["attributes"] = {
+                name: {"type": self._export_attribute_type(attribute.type_),
+                       "default": self._export_value(attribute.default_)}
+                for name, attribute in cl.attributes_.items()}
+        if len(cl.stereotype_instances_holder.stereotypes_) > 0:
+            record["stereotype_instances"] = [s.name for s in cl.stereotype_instances_holder.stereotypes_]
+        values = cl.values
+        if len(values) > 0:
+            record["values"] = self._export_values(values)
+        tagged_values = cl.tagged_values
+        if len(tagged_values) > 0:
+            record["tagged_values"] = self._export_values(tagged_values)
+        return record
+
+    def _export_association_record(self, association):
+        record = {"type": "association", "id": self._get_id(association), "name": association.name,
+                  "source": self._get_id(association.source), "target": self._get_id(association.target),
+                  "source_role_name": association.source_role_name, "role_name": association.role_name,
+                  "source_multiplicity": association.source_multiplicity,
+                  "multiplicity": association.multiplicity}
+        if association.aggregation:
+            record["aggregation"] = True
+        if association.composition:
+            record["composition"] = True
+        if len(association.stereotypes_holder.stereotypes_) > 0:
+            record["stereotypes"] = [s.name for s in association.stereotypes_holder.stereotypes_]
+        return record
+
+    def _export_object_record(self, obj):
+        record = {"type": "object", "id": self._get_id(obj), "name": obj.name, "class": self._get_id(obj.classifier_)}
+        values = obj.values
+        if len(values) > 0:
+            record["values"] = self._export_values(values)
+        return record
+
+    def _export_link_record(self, link):
+        association = link.association
+        record = {"type": "link", "id": self._get_id(link), "association": self._get_id(association),
+                  "source": self._get_id(link.source_), "target": self._get_id(link.target_),
+                  "source_role_name": association.source_role_name, "role_name": association.role_name}
+        if link.label is not None:
+            record["label"] = link.label
+        if link.stereotype_instances_holder_ is not None and len(link.stereotype_instances_holder_.stereotypes_) > 0:
+            record["stereotype_instances"] = [s.name for s in link.stereotype_instances_holder_.stereotypes_]
+        tagged_values = link.tagged_values
+        if len(tagged_values) > 0:
+            record["tagged_values"] = self._export_values(tagged_values)
+        return record
+
+    def export_records(self):
+        for cl in self.classes_:
+            yield from self._export_enum_records(cl)
+            yield self._export_class_record(cl)
+        for cl in self.classes_:
+            for association in cl.associations_:
+                if (association not in self.associations_ and association.source in self.added_classes_ and
+                        association.target in self.added_classes_):
+                    self.associations_[association] = None
+                    yield self._export_association_record(association)
+        for cl in self.classes_:
+            for obj in cl.objects_:
+                yield self._export_object_record(obj)
+        for cl in self.classes_:
+            for obj in cl.objects_:
+                for link in obj.links_:
+                    if link.source_ is obj and link.association in self.associations_ and \
+                            self._is_exported(link.target_):
+                        yield self._export_link_record(link)
+
+
+def export_ndjson(classes):
+    """Export the classes and their objects as newline-delimited JSON (NDJSON). The export is a generator
+    yielding one line (a JSON record without the newline) per element, so that large models can be written
+    without building the whole export in memory::
+
+        with open("shop.ndjson", "w") as file:
+            for line in export_ndjson(shop_classes):
+                file.write(line + "\\n")
+
+    Records are exported in this order: enums used as attribute types, the classes (superclasses before their
+    subclasses) with their attributes, values, stereotype instances, and tagged values, the associations between
+    the classes, the objects of the classes with their values, and the links between the objects with their
+    association, role names, label, stereotype instances, and tagged values. Each record has a ``type``
+    (``enum``, ``class``, ``association``, ``object``, or ``link``) and an ``id``, which is used to reference
+    the element in other records; references in values are written as ``{"$ref": id}``. Meta-classes and
+    stereotypes are referenced by name.
+
+    The superclasses of the classes are exported, too. Links to objects of classes that are not exported
+    are not exported.
+
+    Args:
+        classes (list[CClass]): The classes to export.
+
+    Returns:
+        Generator[str]: The NDJSON lines.
+    """
+    if is_cclass(classes):
+        classes = [classes]
+    elif not isinstance(classes, list):
+        raise CException("classes requires a list or a class as input")
+    for record in _NDJSONExporter(classes).export_records():
+        yield _dump_record(record)
+
+
+class _NDJSONImporter(object):
+    def __init__(self, metaclasses, stereotypes):
+        self.metaclasses_ = {}
+        for metaclass in metaclasses:
+            for mcl in [metaclass] + list(metaclass.get_all_subclasses_()):
+                self.metaclasses_.setdefault(mcl.name, mcl)
+        self.stereotypes_ = {}
+        for stereotype in stereotypes:
+            for s in [stereotype] + list(stereotype.get_all_subclasses_()):
+                self.stereotypes_.setdefault(s.name, []).append(s)
+        # id -> imported element
+        self.elements_ = {}
+        # id -> functions to call when the element with the id is imported
+        self.waiting_ = {}
+        # the ids of the imported classes in the order of their records
+        self.class_ids_ = []
+        # (association, role name, stereotype names) -> {source: [(target, record)]}
+        self.link_batches_ = {}
+        self.number_of_batched_links_ = 0
+        # the created enums, classes, associations, and objects, deleted if the import fails (links are
+        # deleted with their objects)
+        self.created_elements_ = []
+
+    def _find_missing_reference(self, value):
+        # returns the id of an element referenced in the value that is not imported yet, or None
+        if isinstance(value, list):
+            for item in value:
+                missing = self._find_missing_reference(item)
+                if missing is not None:
+                    return missing
+        elif isinstance(value, dict) and "$ref" in value:
+            if value["$ref"] not in self.elements_:
+                return value["$ref"]
+        return None
+
+    def _find_missing_id(self, ids):
+        for element_id in ids:
+            if element_id not in self.elements_:
+                return element_id
+        return None
+
+    def _wait_for(self, element_id, function):
+        self.waiting_.setdefault(element_id, []).append(function)
+
+    def _get_element(self, element_id):
+        try:
+            return self.elements_[element_id]
+        except (KeyError, TypeError):
+            raise CException(f"unresolved reference to element '{element_id!s}'")
+
+    def _import_value(self, value):
+        if isinstance(value, list):
+            return [self._import_value(item) for item in value]
+        if isinstance(value, dict) and "$ref" in value:
+            return self._get_element(value["$ref"])
+        return value
+
+    def _set_values(self, element, values, set_value):
+        # values referencing elements that are not imported yet are set when the elements are imported
+        for name, value in values.items():
+            missing = self._find_missing_reference(value)
+            if missing is None:
+                set_value(element, name, self._import_value(value))
+            else:
+                self._wait_for(missing, lambda n=name, v=value: self._set_values(element, {n: v}, set_value))
+
+    def _get_stereotypes(self, names, element):
+        stereotypes = []
+        for name in names:
+            for stereotype in self.stereotypes_.get(name, []):
+                if element is None or stereotype.is_element_extended_by_stereotype_(element):
+                    stereotypes.append(stereotype)
+                    break
+            else:
+                raise CException(f"unknown stereotype '{name!s}' for '{element!s}'" if element is not None else
+                                 f"unknown stereotype '{name!s}'")
+        return stereotypes
+
+    def _register(self, element_id, element):
+        if element_id in self.elements_:
+            raise CException(f"duplicate element id '{element_id!s}'")
+        self.elements_[element_id] = element
+        for function in self.waiting_.pop(element_id, []):
+            function()
+
+    def _import_attribute_type(self, attribute_type):
+        if isinstance(attribute_type, dict):
+            if "metaclass" in attribute_type:
+                try:
+                    return self.metaclasses_[attribute_type["metaclass"]]
+                except KeyError:
+                    raise CException(f"unknown metaclass '{attribute_type['metaclass']!s}'")
+            return self._import_value(attribute_type)
+        try:
+            return _ATTRIBUTE_TYPES[attribute_type]
+        except (KeyError, TypeError):
+            raise CException(f"unknown attribute type '{attribute_type!s}'")
+
+    def _import_enum(self, record):
+        enum = CEnum(record.get("name"), values=record.get("values", []))
+        self.created_elements_.append(enum)
+        self._register(record["id"], enum)
+
+    def _import_class(self, record):
+        attributes = record.get("attributes", {})
+        references = list(record.get("superclasses", []))
+        for attribute in attributes.values():
+            references.append(attribute.get("type"))
+            references.append(attribute.get("default"))
+        missing = self._find_missing_reference(references)
+        if missing is None:
+            missing = self._find_missing_id(record.get("superclasses", []))
+        if missing is not None:
+            self._wait_for(missing, lambda: self._import_class(record))
+            return
+        try:
+            metaclass = self.metaclasses_[record.get("metaclass")]
+        except KeyError:
+            raise CException(f"unknown metaclass '{record.get('metaclass')!s}'")
+        cl = CClass(metaclass, record.get("name"),
+                    superclasses=[self._get_element(superclass) for superclass in record.get("superclasses", [])],
+                    attributes={name: CAttribute(type=self._import_attribute_type(attribute.get("type")),
+                                                 default=self._import_value(attribute.get("default")))
+                                for name, attribute in attributes.items()})
+        self.created_elements_.append(cl)
+        if "stereotype_instances" in record:
+            cl.stereotype_instances = self._get_stereotypes(record["stereotype_instances"], cl)
+        self._set_values(cl, record.get("values", {}), CClass.set_value)
+        self._set_values(cl, record.get("tagged_values", {}), CClass.set_tagged_value)
+        self._register(record["id"], cl)
+
+    def _import_association(self, record):
+        missing = self._find_missing_id([record.get("source"), record.get("target")])
+        if missing is not None:
+            self._wait_for(missing, lambda: self._import_association(record))
+            return
+        association = self._get_element(record["source"]).association(
+            self._get_element(record["target"]), name=record.get("name"), role_name=record.get("role_name"),
+            source_role_name=record.get("source_role_name"), multiplicity=record.get("multiplicity", "*"),
+            source_multiplicity=record.get("source_multiplicity", "1"),
+            aggregation=record.get("aggregation", False), composition=record.get("composition", False))
+        self.created_elements_.append(association)
+        if "stereotypes" in record:
+            # the same as extending the association with the stereotypes (see CStereotype.extended)
+            association.stereotypes_holder.stereotypes = self._get_stereotypes(record["stereotypes"], None)
+        self._register(record["id"], association)
+
+    def _import_object(self, record):
+        missing = self._find_missing_id([record.get("class")])
+        if missing is not None:
+            self._wait_for(missing, lambda: self._import_object(record))
+            return
+        obj = CObject(self._get_element(record["class"]), record.get("name"))
+        self.created_elements_.append(obj)
+        self._set_values(obj, record.get("values", {}), CObject.set_value)
+        self._register(record["id"], obj)
+
+    def _import_link(self, record):
+        ids = [record.get("source"), record.get("target")]
+        if "association" in record:
+            ids.append(record["association"])
+        missing = self._find_missing_id(ids)
+        if missing is not None:
+            self._wait_for(missing, lambda: self._import_link(record))
+            return
+        association = self.elements_.get(record.get("association"))
+        key = (association, record.get("role_name"), tuple(record.get("stereotype_instances", ())))
+        source = self.elements_[record["source"]]
+        self.link_batches_.setdefault(key, {}).setdefault(source, []).append(
+            (self.elements_[record["target"]], record))
+        self.number_of_batched_links_ += 1
+        if self.number_of_batched_links_ >= LINK_BATCH_SIZE:
+            self.flush_links_()
+
+    def flush_links_(self):
+        link_batches = self.link_batches_
+        self.link_batches_ = {}
+        self.number_of_batched_links_ = 0
+        for (association, role_name, stereotype_names), links_of_sources in link_batches.items():
+            kwargs = {"role_name": role_name}
+            if association is not None:
+                kwargs["association"] = association
+            if len(stereotype_names) > 0:
+                kwargs["stereotype_instances"] = self._get_stereotypes(stereotype_names, None)
+            links = add_links({source: [target for target, _ in targets]
+                               for source, targets in links_of_sources.items()}, **kwargs)
+            records = [record for targets in links_of_sources.values() for _, record in targets]
+            for link, record in zip(links, records):
+                if "label" in record:
+                    link.label = record["label"]
+                self._set_values(link, record.get("tagged_values", {}), CLink.set_tagged_value)
+                self._register(record["id"], link)
+
+    def import_record(self, record):
+        if not isinstance(record, dict) or "id" not in record:
+            raise CException(f"malformed record: '{record!s}'")
+        record_type = record.get("type")
+        if record_type == "object":
+            self._import_object(record)
+        elif record_type == "link":
+            self._import_link(record)
+        elif record_type == "class":
+            self.class_ids_.append(record["id"])
+            self._import_class(record)
+        elif record_type == "association":
+            self._import_association(record)
+        elif record_type == "enum":
+            self._import_enum(record)
+        else:
+            raise CException(f"unknown record type '{record_type!s}'")
+
+    def delete_created_elements_(self):
+        # elements created later might depend on elements created earlier (like the objects of a class)
+        for element in reversed(self.created_elements_):
+            element.delete()
+        self.created_elements_ = []
+
+    def finish_(self):
+        self.flush_links_()
+        if len(self.waiting_) > 0:
+            raise CException(f"unresolved reference to element '{next(iter(self.waiting_))!s}'")
+
+
+def import_ndjson(lines, metaclasses, stereotypes=None):
+    """Import classes and objects from newline-delimited JSON (NDJSON) in the format written by
+    :py:func:`.export_ndjson`. The lines are read and imported one by one, so that large models can be read
+    from a file without loading the whole file into memory::
+
+        with open("shop.ndjson") as file:
+            shop_classes = import_ndjson(file, [domain_metaclass])
+
+    Records can reference elements in later records: Elements and values referencing elements that are not
+    imported yet are created as soon as the referenced elements are imported. Links are collected and
+    created in batches with :py:func:`.add_links`. The multiplicities of the links are checked when all
+    records have been imported (in a transaction with ``deferred_checks_only``, see
+    :py:func:`.model_transaction`). If the import fails, e.g., because of a malformed record or a violated
+    multiplicity, all elements created by the import are deleted again.
+
+    Args:
+        lines: An iterable of NDJSON lines (``str`` or ``bytes``), such as a file opened for reading.
+        metaclasses (list[CMetaclass]): The meta-classes of the imported classes (and of the values
+            of attributes typed by meta-classes). The subclasses of the meta-classes can be used, too.
+        stereotypes (list[CStereotype]): The stereotypes used as stereotype instances of the imported classes
+            and links, and extending the imported associations. The subclasses of the stereotypes can be
+            used, too.
+
+    Returns:
+        list[CClass]: The imported classes in the order of their records.
+    """
+    importer = _NDJSONImporter(metaclasses, [] if stereotypes is None else stereotypes)
+    try:
+        # the transaction only defers the multiplicity checks, so that no changes are recorded for the
+        # (possibly large number of) imported elements
+        with model_transaction(deferred_checks_only=True):
+            for line in lines:
+                if len(line.strip()) == 0:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    raise CException(f"malformed record: '{line!s}'")
+                importer.import_record(record)
+            importer.finish_()
+    except Exception as e:
+        importer.delete_created_elements_()
+        raise e
+    return [importer.elements_[class_id] for class_id in importer.class_ids_]
@@ -1,12 +1,15 @@
+from codeable_models import ctransaction
 from codeable_models.cassociation import CAssociation
 from codeable_models.cbundlable import CBundlable
-from codeable_models.cmetaclass import CMetaclass
 from codeable_models.internal.commons import *
 from codeable_models.internal.var_values import delete_var_value, set_var_value, get_var_value, get_var_values, \
     set_var_values, VarValueKind
 
 
 class CObject(CBundlable):
+    __slots__ = ("class_object_class_", "classifier_", "attribute_values", "links_", "association_links_")
+    kind_ = KIND_OBJECT
+
     def __init__(self, cl, name=None, **kwargs):
         """``CObject`` is used to define objects. Objects in Codeable Models are instances of classes (defined
         using :py:class:`.CClass`).
@@ -53,11 +56,14 @@ class CObject(CBundlable):
         inherits from :py:class:`.CObject`).
 
         """
+        # objects created with CClass.create_objects() get their values from the class, which also
+        # registers them as instances
+        bulk_attribute_values = kwargs.pop('bulk_attribute_values_', None)
         self.class_object_class_ = None
         if 'class_object_class_' in kwargs:
             class_object_class = kwargs.pop('class_object_class_', None)
             self.class_object_class_ = class_object_class
-        elif cl.__class__ is CAssociation:
+        elif cl.__class__ is CAssociation or bulk_attribute_values is not None:
             pass
         else:
             # don't check if this is a class object, as classifier is then a metaclass 
@@ -68,23 +74,26 @@ class CObject(CBundlable):
         if cl is not None:
             check_named_element_is_not_deleted(cl)
         self.classifier_ = cl
-        self.attribute_values = {}
+        # the attribute values and links are allocated when the first value is set or link is added,
+        # and the links are reset to the shared empty mapping when the last link is removed
+        self.attribute_values = bulk_attribute_values if bulk_attribute_values else EMPTY_MAPPING
+        self.links_ = EMPTY_MAPPING
+        self.association_links_ = EMPTY_MAPPING
         super().__init__(name, **kwargs)
-        if self.class_object_class_ is None:
+        if self.class_object_class_ is None and bulk_attribute_values is None:
             # don't add instance if this is a class object or association
             if cl.__class__ is not CAssociation:
                 self.classifier_.add_object_(self)
             # do not init default attributes of a class object, the class constructor 
             # does it after stereotype instances are added, who defining defaults first 
             self.init_attribute_values_()
-        self.links_ = []
 
         if values is not None:
             self.values = values
 
     def init_attribute_values_(self):
         # init default values of attributes
-        for cl in self.classifier.class_path:
+        for cl in self.classifier.get_class_path_():
             for attrName, attr in cl.attributes_.items():
                 if attr.default is not None:
                     if self.get_value(attrName, cl) is None:
@@ -116,6 +125,13 @@ class CObject(CBundlable):
         self.classifier_ = cl
         self.classifier_.add_object_(self)
 
+    def name_changed_(self, old_name):
+        super().name_changed_(old_name)
+        # only classes index their objects by name, class objects and links are not indexed
+        objects_index = getattr(self.classifier_, "objects_index_", None)
+        if objects_index is not None:
+            objects_index.rename(self, old_name)
+
     def delete(self):
         """Delete the object and delete it from its classifier. Delete all links of the object.
         Calls ``delete()`` on superclass.
@@ -125,13 +141,13 @@ class CObject(CBundlable):
         """
         if self.is_deleted:
             return
-        if not (isinstance(self.classifier, CMetaclass) or isinstance(self.classifier, CAssociation)):
+        if not (get_kinds(self.classifier_) & (KIND_METACLASS | KIND_ASSOCIATION)):
             # for class objects, the class cleanup removes the instance
             # link instances are removed by the association
             self.classifier_.remove_object_(self)
         self.classifier_ = None
         super().delete()
-        links = self.links_.copy()
+        links = list(self.links_)
         for link in links:
             link.delete()
 
@@ -149,26 +165,27 @@ class CObject(CBundlable):
             return False
         if classifier is None:
             raise CException(f"'None' is not a valid argument")
-        if is_clink(self):
+        classifier_kinds = get_kinds(classifier)
+        if self.kinds_ & KIND_LINK:
             # noinspection PyUnresolvedReferences
             if self.is_class_link():
-                if not (is_cmetaclass(classifier) or is_cassociation(classifier)):
+                if not classifier_kinds & (KIND_METACLASS | KIND_ASSOCIATION):
                     raise CException(f"'{classifier!s}' is not an association or a metaclass")
             else:
-                if not (is_cclass(classifier) or is_cassociation(classifier)):
+                if not classifier_kinds & (KIND_CLASS | KIND_ASSOCIATION):
                     raise CException(f"'{classifier!s}' is not an association or a class")
         else:
-            if isinstance(self.classifier, CMetaclass):
+            if self.classifier_.kinds_ & KIND_METACLASS:
                 # this is a class object
-                if not is_cmetaclass(classifier):
+                if not classifier_kinds & KIND_METACLASS:
                     raise CException(f"'{classifier!s}' is not a metaclass")
             else:
-                if not is_cclass(classifier):
+                if not classifier_kinds & KIND_CLASS:
                     raise CException(f"'{classifier!s}' is not a class")
 
         if self.classifier == classifier:
             return True
-        if classifier in self.classifier.all_superclasses:
+        if classifier in self.classifier.get_all_superclasses_():
             return True
         return False
 
@@ -194,7 +211,7 @@ class CObject(CBundlable):
         """
         if self.is_deleted:
             raise CException(f"can't get value '{attribute_name!s}' on deleted {self._get_kind_str()!s}")
-        return get_var_value(self, self.classifier.class_path, self.attribute_values, attribute_name,
+        return get_var_value(self, self.classifier.get_attribute_table_(), self.attribute_values, attribute_name,
                              VarValueKind.ATTRIBUTE_VALUE, classifier)
 
     def delete_value(self, attribute_name, classifier=None):
@@ -211,7 +228,7 @@ class CObject(CBundlable):
         """
         if self.is_deleted:
             raise CException(f"can't delete value '{attribute_name!s}' on deleted {self._get_kind_str()!s}")
-        return delete_var_value(self, self.classifier.class_path, self.attribute_values, attribute_name,
+        return delete_var_value(self, self.classifier.get_attribute_table_(), self.attribute_values, attribute_name,
                                 VarValueKind.ATTRIBUTE_VALUE, classifier)
 
     def set_value(self, attribute_name, value, classifier=None):
@@ -229,7 +246,9 @@ class CObject(CBundlable):
         """
         if self.is_deleted:
             raise CException(f"can't set value '{attribute_name!s}' on deleted {self._get_kind_str()!s}")
-        set_var_value(self, self.classifier.class_path, self.attribute_values, attribute_name, value,
+        if self.attribute_values is EMPTY_MAPPING:
+            self.attribute_values = {}
+        set_var_value(self, self.classifier.get_attribute_table_(), self.attribute_values, attribute_name, value,
                       VarValueKind.ATTRIBUTE_VALUE, classifier)
 
     @property
@@ -240,7 +259,7 @@ class CObject(CBundlable):
         """
         if self.is_deleted:
             raise CException(f"can't get values on deleted {self._get_kind_str()!s}")
-        return get_var_values(self.classifier.class_path, self.attribute_values)
+        return get_var_values(self.classifier.get_class_path_(), self.attribute_values)
 
     @values.setter
     def values(self, new_values):
@@ -283,11 +302,48 @@ class CObject(CBundlable):
             list[CLink]: The list of link objects.
 
         """
-        association_links = []
-        for link in list(self.links_):
-            if link.association == association:
-                association_links.extend([link])
-        return association_links
+        try:
+            return list(self.association_links_[association].values())
+        except KeyError:
+            return []
+
+    def get_number_of_links_for_association_(self, association):
+        try:
+            return len(self.association_links_[association])
+        except KeyError:
+            return 0
+
+    def get_link_(self, association, source, target):
+        try:
+            return self.association_links_[association].get((source, target))
+        except KeyError:
+            return None
+
+    def add_link_(self, link):
+        if ctransaction.active_transaction_ is not None:
+            ctransaction.active_transaction_.links_changed_(self, link)
+        # links are stored in insertion order, and additionally indexed by their association and
+        # (source, target) objects
+        if self.links_ is EMPTY_MAPPING:
+            self.links_ = {}
+            self.association_links_ = {}
+        self.links_[link] = None
+        try:
+            self.association_links_[link.association][(link.source_, link.target_)] = link
+        except KeyError:
+            self.association_links_[link.association] = {(link.source_, link.target_): link}
+
+    def remove_link_(self, link):
+        if ctransaction.active_transaction_ is not None:
+            ctransaction.active_transaction_.links_changed_(self, link)
+        del self.links_[link]
+        association_links = self.association_links_[link.association]
+        del association_links[(link.source_, link.target_)]
+        if len(association_links) == 0:
+            del self.association_links_[link.association]
+        if len(self.links_) == 0:
+            self.links_ = EMPTY_MAPPING
+            self.association_links_ = EMPTY_MAPPING
 
     def get_linked(self, **kwargs):
         """Method to get the linked objects defined for this object filtered using criteria specified in kwargs.
@@ -309,12 +365,29 @@ class CObject(CBundlable):
         from codeable_models.clink import LinkKeywordsContext
         context = LinkKeywordsContext(**kwargs)
 
+        # use the association index to find the links that can match the criteria
+        if context.association is None and context.role_name is None:
+            links = self.links_
+        else:
+            if context.association is not None:
+                associations = [context.association] if context.association in self.association_links_ else []
+            else:
+                associations = list(self.association_links_)
+            if context.role_name is not None:
+                associations = [a for a in associations if
+                                a.role_name == context.role_name or a.source_role_name == context.role_name]
+            if len(associations) == 0:
+                links = []
+            elif len(associations) == 1:
+                links = self.association_links_[associations[0]].values()
+            else:
+                # more than one association matches: keep the order in which the links were added
+                associations = set(associations)
+                links = [link for link in self.links_ if link.association in associations]
+
         result = []
-        for link in self.links_:
+        for link in links:
             append = True
-            if context.association is not None:
-                if link.association != context.association:
-                    append = False
             if context.role_name is not None:
                 append = False
                 if link.association.role_name == context.role_name:
@@ -370,10 +443,9 @@ class CObject(CBundlable):
         return delete_links({self: links}, **kwargs)
 
     def compute_connected_(self, context):
-        super().compute_connected_(context)
-        connected = []
+        connected = super().compute_connected_(context)
         for link in self.links_:
             opposite = link.get_opposite_object(self)
-            if opposite not in context.stop_elements_exclusive:
+            if opposite not in context.excluded_elements:
                 connected.append(opposite)
-        self.append_connected_(context, connected)
+        return connected
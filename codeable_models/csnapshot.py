@@ -0,0 +1,252 @@
+import copyreg
+import gc
+import pickle
+import struct
+from contextlib import contextmanager
+
+from codeable_models.cclassifier import CClassifier
+from codeable_models.cexception import CException
+from codeable_models.cnamedelement import CNamedElement
+from codeable_models.internal.commons import EMPTY_MAPPING, is_cnamedelement, check_named_element_is_not_deleted
+from codeable_models.internal.stereotype_holders import CStereotypeInstancesHolder
+
+# A snapshot file consists of the magic bytes, the states of the elements written in batches as pickles, the
+# header (a pickle of the element classes, their attribute names, the class of each element, and the ids of the
+# saved elements), and the offset of the header. Elements are referenced by dense integer ids (starting at 1,
+# in the order in which they are reached), which are pickled as persistent ids.
+SNAPSHOT_MAGIC = b"CMSNAP\x00\x01"
+_PICKLE_PROTOCOL = 4
+_HEADER_OFFSET_FORMAT = "<Q"
+# the persistent id of the shared empty mapping used for the links and values of elements (see commons.py)
+_EMPTY_MAPPING_ID = 0
+# attributes of classifiers caching data derived from the inheritance hierarchy, recomputed after loading
+_CACHED_CLASSIFIER_ATTRIBUTES = ("class_path_", "all_superclasses_", "all_subclasses_", "attribute_table_")
+_LOADABLE_GLOBALS = {("builtins", name) for name in ("bool", "int", "float", "complex", "str", "bytes", "bytearray",
+                                                      "list", "tuple", "dict", "set", "frozenset")}
+# the typed columns of columnar classes are arrays (see column_store.py)
+_LOADABLE_GLOBALS.update([("array", "array"), ("array", "_array_reconstructor")])
+
+# element class -> (names of the slots, whether instances have a __dict__)
+_element_layouts = {}
+
+
+def _get_element_layout(element_class):
+    try:
+        return _element_layouts[element_class]
+    except KeyError:
+        slot_names = []
+        has_dict = False
+        for cl in reversed(element_class.__mro__[:-1]):
+            if "__slots__" not in cl.__dict__:
+                has_dict = True
+                continue
+            for name in cl.__dict__["__slots__"]:
+                if name == "__dict__":
+                    has_dict = True
+                elif name != "__weakref__" and name not in slot_names:
+                    slot_names.append(name)
+        layout = (tuple(slot_names), has_dict)
+        _element_layouts[element_class] = layout
+        return layout
+
+
+def _get_element_state(element, slot_names, has_dict):
+    state = [getattr(element, name) for name in slot_names]
+    if has_dict:
+        attribute_values = element.__dict__
+        if isinstance(element, CClassifier):
+            attribute_values = dict(attribute_values)
+            for name in _CACHED_CLASSIFIER_ATTRIBUTES:
+                attribute_values[name] = None
+        state.append(attribute_values)
+    return state
+
+
+def _new_stereotype_instances_holder(stereotypes, stereotypes_index, element):
+    # the cached stereotype instance path and attribute table are not saved, as they are only valid for
+    # the CClassifier.structure_version_ of the saving process
+    holder = CStereotypeInstancesHolder.__new__(CStereotypeInstancesHolder)
+    holder.stereotypes_ = stereotypes
+    holder.stereotypes_index_ = stereotypes_index
+    holder.element = element
+    holder.stereotype_instance_path_ = None
+    holder.attribute_table_ = None
+    holder.structure_version_ = None
+    return holder
+
+
+def _reduce_stereotype_instances_holder(holder):
+    return _new_stereotype_instances_holder, (holder.stereotypes_, holder.stereotypes_index_, holder.element)
+
+
+@contextmanager
+def _garbage_collection_paused():
+    # saving and loading create many objects, but no garbage: collecting while they are created would take
+    # most of the time
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+class _SnapshotPickler(pickle.Pickler):
+    def __init__(self, file):
+        super().__init__(file, _PICKLE_PROTOCOL)
+        self.dispatch_table = copyreg.dispatch_table.copy()
+        self.dispatch_table[CStereotypeInstancesHolder] = _reduce_stereotype_instances_holder
+        self.elements_ = []
+        self.ids_ = {}
+        # class -> whether it is a model element class, as persistent_id() is called for every pickled object
+        self.is_element_class_ = {}
+
+    def get_id_(self, element):
+        element_id = self.ids_.get(element)
+        if element_id is None:
+            self.elements_.append(element)
+            element_id = len(self.elements_)
+            self.ids_[element] = element_id
+        return element_id
+
+    def persistent_id(self, obj):
+        obj_class = obj.__class__
+        is_element_class = self.is_element_class_.get(obj_class)
+        if is_element_class is None:
+            is_element_class = issubclass(obj_class, CNamedElement)
+            self.is_element_class_[obj_class] = is_element_class
+        if is_element_class:
+            element_id = self.ids_.get(obj)
+            return self.get_id_(obj) if element_id is None else element_id
+        if obj is EMPTY_MAPPING:
+            return _EMPTY_MAPPING_ID
+        return None
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    def __init__(self, file, elements):
+        super().__init__(file)
+        if elements is not None:
+            # the persistent ids are the indices of the elements
+            self.persistent_load = elements.__getitem__
+
+    def find_class(self, module, name):
+        # only model classes and basic types can be loaded, so that loading a snapshot cannot call
+        # arbitrary functions
+        if (module, name) in _LOADABLE_GLOBALS:
+            return super().find_class(module, name)
+        if module == "codeable_models" or module.startswith("codeable_models."):
+            obj = super().find_class(module, name)
+            if ((isinstance(obj, type) and obj.__module__.startswith("codeable_models.")) or
+                    obj is _new_stereotype_instances_holder):
+                return obj
+        raise CException(f"cannot load '{module!s}.{name!s}' from a model snapshot")
+
+
+def save_snapshot(file_name, elements):
+    """Save the model containing the ``elements`` to a binary snapshot file, which can be loaded with
+    :py:func:`.load_snapshot`. Loading a snapshot is usually much faster than executing the code that
+    creates the model.
+
+    The snapshot contains the elements and all elements reachable from them, i.e., usually the complete
+    model graph: meta-classes, stereotypes, classes, objects, associations, links, enums, and bundles,
+    including their attribute values, tagged values, and default values. Attribute values must be of the
+    supported attribute types (see the ``attributes`` property of :py:class:`.CClassifier`)::
+
+        save_snapshot("shopping.cmsnap", [cart, item, cart1])
+        cart, item, cart1 = load_snapshot("shopping.cmsnap")
+
+    Args:
+        file_name: The name of the file to write.
+        elements: A list of model elements or a single model element.
+
+    Returns:
+        None
+    """
+    if is_cnamedelement(elements):
+        elements = [elements]
+    elif not isinstance(elements, list):
+        raise CException(f"elements requires a list or a named element as input")
+    for element in elements:
+        if not is_cnamedelement(element):
+            raise CException(f"'{element!s}' is not a model element")
+        check_named_element_is_not_deleted(element)
+
+    with open(file_name, "wb") as file, _garbage_collection_paused():
+        file.write(SNAPSHOT_MAGIC)
+        pickler = _SnapshotPickler(file)
+        saved_element_ids = [pickler.get_id_(element) for element in elements]
+        layouts = {}
+        element_classes = []
+        kinds = bytearray()
+        number_of_written_elements = 0
+        # pickling the states of a batch of elements assigns ids to all newly reached elements, which
+        # are written in the next batch
+        while number_of_written_elements < len(pickler.elements_):
+            batch = pickler.elements_[number_of_written_elements:]
+            number_of_written_elements = len(pickler.elements_)
+            states = []
+            for element in batch:
+                element_class = element.__class__
+                try:
+                    kind, slot_names, has_dict = layouts[element_class]
+                except KeyError:
+                    slot_names, has_dict = _get_element_layout(element_class)
+                    kind = len(element_classes)
+                    element_classes.append((element_class, slot_names, has_dict))
+                    layouts[element_class] = (kind, slot_names, has_dict)
+                kinds.append(kind)
+                states.append(_get_element_state(element, slot_names, has_dict))
+            try:
+                pickler.dump(states)
+            except (pickle.PicklingError, TypeError, AttributeError) as e:
+                raise CException(f"cannot save model snapshot: {e!s}")
+        header_offset = file.tell()
+        pickle.dump((element_classes, bytes(kinds), saved_element_ids), file, _PICKLE_PROTOCOL)
+        file.write(struct.pack(_HEADER_OFFSET_FORMAT, header_offset))
+
+
+def load_snapshot(file_name):
+    """Load a model from a snapshot file written with :py:func:`.save_snapshot`. The elements are restored
+    as they were saved, without repeating the checks performed when the model was created. Only load
+    snapshots from trusted sources.
+
+    Args:
+        file_name: The name of the file to read.
+
+    Returns:
+        list[CNamedElement]: The loaded elements corresponding to the elements passed to
+        :py:func:`.save_snapshot`.
+    """
+    with open(file_name, "rb") as file, _garbage_collection_paused():
+        if file.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+            raise CException(f"'{file_name!s}' is not a model snapshot")
+        try:
+            file.seek(-struct.calcsize(_HEADER_OFFSET_FORMAT), 2)
+            header_offset, = struct.unpack(_HEADER_OFFSET_FORMAT, file.read())
+            file.seek(header_offset)
+            element_classes, kinds, saved_element_ids = _SnapshotUnpickler(file, None).load()
+            for element_class, _, _ in element_classes:
+                if not issubclass(element_class, CNamedElement):
+                    raise CException(f"'{element_class!s}' is not a model element class")
+            # all elements are created first, so that the states can refer to elements not loaded yet
+            elements = [EMPTY_MAPPING]
+            elements.extend(element_classes[kind][0].__new__(element_classes[kind][0]) for kind in kinds)
+            file.seek(len(SNAPSHOT_MAGIC))
+            unpickler = _SnapshotUnpickler(file, elements)
+            element_id = 1
+            while element_id < len(elements):
+                for state in unpickler.load():
+                    element = elements[element_id]
+                    _, slot_names, has_dict = element_classes[kinds[element_id - 1]]
+                    for name, value in zip(slot_names, state):
+                        setattr(element, name, value)
+                    if has_dict:
+                        element.__dict__ = state[-1]
+                    element_id += 1
+        except (pickle.UnpicklingError, EOFError, ValueError, IndexError, struct.error) as e:
+            raise CException(f"'{file_name!s}' is not a valid model snapshot: {e!s}")
+    # the loaded classifiers and associations are not known to caches depending on the model structure
+    CClassifier.structure_version_ += 1
+    return [elements[element_id] for element_id in saved_element_ids]
@@ -18,6 +18,8 @@ def _determine_extended_type_of_list(elements):
 
 
 class CStereotype(CClassifier):
+    kind_ = KIND_STEREOTYPE
+
     def __init__(self, name=None, **kwargs):
         """``CStereotype`` is used to define stereotypes and stereotype instances. Meta-classes and meta-class
         associations can be extended with stereotypes.
@@ -110,7 +112,7 @@ class CStereotype(CClassifier):
         if elements is None:
             elements = []
         for e in self.extended_:
-            e.stereotypes_holder.stereotypes_.remove(self)
+            e.stereotypes_holder.remove_stereotype_(self)
         self.extended_ = []
         if is_cmetaclass(elements):
             extended_type = CMetaclass
@@ -134,7 +136,7 @@ class CStereotype(CClassifier):
             if e in self.extended_:
                 raise CException(f"'{e.name!s}' is already extended by stereotype '{self.name!s}'")
             self.extended_.append(e)
-            e.stereotypes_holder.stereotypes_.append(self)
+            e.stereotypes_holder.add_stereotype_(self)
 
     @property
     def extended_instances(self):
@@ -147,7 +149,7 @@ class CStereotype(CClassifier):
         """list[CClass] | list[CLink]: Getter for all the extended instances, i.e. the classes or class links
         extended by this stereotype, including those on subclasses."""
         all_instances = list(self.extended_instances_)
-        for scl in self.all_subclasses:
+        for scl in self.get_all_subclasses_():
             for cl in scl.extended_instances_:
                 all_instances.append(cl)
         return all_instances
@@ -163,12 +165,19 @@ class CStereotype(CClassifier):
         if self.is_deleted:
             return
         for e in self.extended_:
-            e.stereotypes_holder.stereotypes_.remove(self)
+            e.stereotypes_holder.remove_stereotype_(self)
         self.extended_ = []
         super().delete()
 
+    def name_changed_(self, old_name):
+        super().name_changed_(old_name)
+        for e in self.extended_:
+            e.stereotypes_holder.stereotype_renamed_(self, old_name)
+        for i in self.extended_instances_:
+            i.stereotype_instances_holder.stereotype_renamed_(self, old_name)
+
     def update_default_values_of_classifier_(self, attribute=None):
-        all_classes = [self] + list(self.all_subclasses)
+        all_classes = [self] + list(self.get_all_subclasses_())
         for sc in all_classes:
             for i in sc.extended_instances_:
                 attr_items = self.attributes_.items()
@@ -237,18 +246,14 @@ class CStereotype(CClassifier):
         return super(CStereotype, self).association(target, descriptor, **kwargs)
 
     def compute_connected_(self, context):
-        super().compute_connected_(context)
-        if not context.process_stereotypes:
-            return
-        connected = []
-        for e in self.extended:
-            if e not in context.stop_elements_exclusive:
-                connected.append(e)
-        self.append_connected_(context, connected)
+        connected = super().compute_connected_(context)
+        if context.process_stereotypes:
+            connected.extend(e for e in self.extended_ if e not in context.excluded_elements)
+        return connected
 
     def _get_all_extended_elements(self):
         result = []
-        for cl in self.class_path:
+        for cl in self.get_class_path_():
             for extendedElement in cl.extended:
                 if extendedElement not in result:
                     result.append(extendedElement)
@@ -259,7 +264,7 @@ class CStereotype(CClassifier):
         for extendedElement in self._get_all_extended_elements():
             if not is_cmetaclass(extendedElement):
                 raise CException(f"default values can only be used on a stereotype that extends metaclasses")
-            for mcl in extendedElement.class_path:
+            for mcl in extendedElement.get_class_path_():
                 if mcl not in result:
                     result.append(mcl)
         return result
@@ -315,8 +320,8 @@ class CStereotype(CClassifier):
         class_path = self._get_default_value_class_path()
         if len(class_path) == 0:
             raise CException(f"default values can only be used on a stereotype that extends metaclasses")
-        return get_var_value(self, class_path, self.default_values_, attribute_name, VarValueKind.DEFAULT_VALUE,
-                             classifier)
+        return get_var_value(self, compute_attribute_table(class_path), self.default_values_, attribute_name,
+                             VarValueKind.DEFAULT_VALUE, classifier)
 
     def delete_default_value(self, attribute_name, classifier=None):
         """Deletes a default value defined on the stereotype or its superclasses
@@ -336,8 +341,8 @@ class CStereotype(CClassifier):
         class_path = self._get_default_value_class_path()
         if len(class_path) == 0:
             raise CException(f"default values can only be used on a stereotype that extends metaclasses")
-        return delete_var_value(self, class_path, self.default_values_, attribute_name, VarValueKind.DEFAULT_VALUE,
-                                classifier)
+        return delete_var_value(self, compute_attribute_table(class_path), self.default_values_, attribute_name,
+                                VarValueKind.DEFAULT_VALUE, classifier)
 
     def set_default_value(self, attribute_name, value, classifier=None):
         """Set a default value defined on the stereotype or its superclasses
@@ -363,5 +368,5 @@ class CStereotype(CClassifier):
         class_path = self._get_default_value_class_path()
         if len(class_path) == 0:
             raise CException(f"default values can only be used on a stereotype that extends metaclasses")
-        set_var_value(self, class_path, self.default_values_, attribute_name, value, VarValueKind.DEFAULT_VALUE,
-                      classifier)
+        set_var_value(self, compute_attribute_table(class_path), self.default_values_, attribute_name, value,
+                      VarValueKind.DEFAULT_VALUE, classifier)
@@ -0,0 +1,286 @@
+from codeable_models import cevents
+from codeable_models.cexception import CException
+from codeable_models.internal.commons import EMPTY_MAPPING, get_kinds, KIND_LINK, KIND_OBJECT
+
+# the transaction in which changes are currently made, or None (see model_transaction())
+active_transaction_ = None
+
+
+class CTransaction(object):
+    def __init__(self, deferred_checks_only=False):
+        """``CTransaction`` is used to group changes of links and values, so that they are checked at once
+        and can be rolled back as a whole. Transactions are usually created with :py:func:`.model_transaction`
+        and used as a context manager.
+
+        While the transaction is active:
+
+        - The multiplicities of the associations are not checked when links are set, added, or deleted.
+          Instead, on commit, the multiplicities are checked once for each object and association with changed
+          links.
+        - The types of the values set with ``set_value()``, ``set_tagged_value()``, ``set_default_value()`` (and
+          the respective ``values`` setters) are not checked when the values are set, but on commit.
+        - All changes of links and values are recorded in an undo log. If the checks fail on commit, or an
+          exception is raised in the ``with`` block, the changes are rolled back using the undo log, restoring
+          the links (in their original order) and values as before the transaction.
+
+        Model elements (such as objects and classes) created in the transaction are deleted when the
+        transaction is rolled back. Other changes of model elements, such as deleting them, are not rolled
+        back. Links of deleted objects are not restored.
+
+        The change events emitted in the transaction (see :py:func:`.subscribe`) are delivered as one batch
+        on commit. If the transaction is rolled back, they are discarded.
+
+        A transaction with ``deferred_checks_only`` set only defers the multiplicity checks, e.g., to create
+        a large number of links in any order. Such a transaction keeps no undo log, checks the value types
+        when the values are set, and delivers the events when they are emitted. If the multiplicity checks
+        fail on commit, the exception is raised, but no changes are rolled back.
+
+        Args:
+           deferred_checks_only (bool): If set, changes are not recorded to be rolled back.
+        """
+        self.is_nested_ = False
+        self.records_changes_ = not deferred_checks_only
+        # the position of the transaction's events in the batched events (see cevents.begin_batch_())
+        self.events_start_ = None
+        self.undo_log_ = []
+        # object -> (links, association links) before the first change of its links in the transaction
+        self.link_snapshots_ = {}
+        # (object, association, is_source) of changed links, checked on commit
+        self.changed_multiplicities_ = {}
+        # (element, attribute, name) -> values dict of set values, checked on commit
+        self.changed_value_types_ = {}
+        # elements created in the transaction, in the order of creation, deleted on rollback; their changes
+        # are not recorded in the undo log and the link snapshots
+        self.created_elements_ = {}
+
+    def __enter__(self):
+        global active_transaction_
+        if active_transaction_ is not None:
+            # a nested transaction is part of the outer transaction
+            self.is_nested_ = True
+        else:
+            active_transaction_ = self
+            if self.records_changes_:
+                self.events_start_ = cevents.begin_batch_()
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        if self.is_nested_ or not self.is_active:
+            # nested transactions are ended by the outer transaction; the transaction might also
+            # have been committed or rolled back in the with block
+            return False
+        if exception_type is not None:
+            self.rollback()
+            return False
+        self.commit()
+        return False
+
+    @property
+    def is_active(self):
+        """bool: ``True`` if this transaction is the active transaction."""
+        return active_transaction_ is self
+
+    def commit(self):
+        """Check all changes made in the transaction, and end the transaction. If a check fails, the changes
+        are rolled back, and the exception of the failed check is raised.
+
+        Returns:
+            None
+        """
+        self._end()
+        try:
+            self._check_value_types()
+            self._check_multiplicities()
+        except CException as e:
+            self._undo()
+            self._end_events(discard=True)
+            raise e
+        self._end_events(discard=False)
+
+    def rollback(self):
+        """Roll back all changes of links and values made in the transaction, and end the transaction.
+
+        Returns:
+            None
+        """
+        self._end()
+        self._undo()
+        self._end_events(discard=True)
+
+    def _end(self):
+        global active_transaction_
+        if active_transaction_ is not self:
+            raise CException("transaction is not active")
+        active_transaction_ = None
+
+    def _end_events(self, discard):
+        if not self.records_changes_:
+            return
+        events_start = self.events_start_
+        self.events_start_ = None
+        cevents.end_batch_(events_start, discard)
+
+    def _check_value_types(self):
+        for (element, attribute, name), values_dict in self.changed_value_types_.items():
+            if element.is_deleted:
+                continue
+            try:
+                value = values_dict[attribute.classifier_][name]
+            except KeyError:
+                continue
+            attribute.check_attribute_value_type_(name, value)
+
+    def _check_multiplicities(self):
+        for obj, association, is_source in self.changed_multiplicities_:
+            if obj.is_deleted or association.is_deleted:
+                continue
+            number_of_links = 0
+            for source, target in obj.association_links_.get(association, EMPTY_MAPPING):
+                if (source if is_source else target) is obj:
+                    number_of_links += 1
+            # without links, the multiplicity is only violated if the opposite side requires links, too
+            association.check_multiplicity_(obj, number_of_links, number_of_links, is_source)
+
+    def _undo(self):
+        restored_links = []
+        for undo in reversed(self.undo_log_):
+            undo(restored_links)
+        # restored links of deleted objects (or of links that are not restored) are discarded again
+        links_to_discard = [link for link in restored_links if link.source_.is_deleted or link.target_.is_deleted]
+        while len(links_to_discard) > 0:
+            for link in links_to_discard:
+                _discard_link(link)
+            links_to_discard = [link for link in restored_links if not link.is_deleted and
+                                (link.source_.is_deleted or link.target_.is_deleted)]
+        for obj, (links, association_links) in self.link_snapshots_.items():
+            if obj.is_deleted:
+                continue
+            if len(links) == 0:
+                obj.links_ = EMPTY_MAPPING
+                obj.association_links_ = EMPTY_MAPPING
+                continue
+            obj.links_ = {link: None for link in links if not link.is_deleted}
+            obj.association_links_ = {}
+            for association, links_of_association in association_links.items():
+                links_of_association = {key: link for key, link in links_of_association.items()
+                                        if not link.is_deleted}
+                if len(links_of_association) > 0:
+                    obj.association_links_[association] = links_of_association
+        # elements created later might depend on elements created earlier (like the objects of a class)
+        for element in reversed(list(self.created_elements_)):
+            # class objects are deleted with their classes
+            if not element.is_deleted and not (get_kinds(element) & KIND_OBJECT and
+                                               element.class_object_class_ is not None):
+                element.delete()
+        self.undo_log_ = []
+        self.link_snapshots_ = {}
+        self.changed_multiplicities_ = {}
+        self.changed_value_types_ = {}
+        self.created_elements_ = {}
+
+    # the following methods are called by the model elements to record changes in the active transaction
+
+    def element_created_(self, element):
+        # created links are discarded using the undo log
+        if self.records_changes_ and not get_kinds(element) & KIND_LINK:
+            self.created_elements_[element] = None
+
+    def links_changed_(self, obj, link):
+        if self.records_changes_ and obj not in self.link_snapshots_ and obj not in self.created_elements_:
+            self.link_snapshots_[obj] = (dict(obj.links_), {association: dict(links) for association, links in
+                                                            obj.association_links_.items()})
+        if link.source_ is obj:
+            self.changed_multiplicities_[(obj, link.association, True)] = None
+        if link.target_ is obj:
+            self.changed_multiplicities_[(obj, link.association, False)] = None
+
+    def link_created_(self, link):
+        if not self.records_changes_:
+            return
+        self.undo_log_.append(lambda restored_links: _discard_link(link))
+
+    def link_deleted_(self, link):
+        if not self.records_changes_:
+            return
+        stereotypes = [] if link.stereotype_instances_holder_ is None else list(
+            link.stereotype_instances_holder_.stereotypes_)
+        state = (link.name_, link.classifier_, stereotypes, list(link.bundles_))
+        self.undo_log_.append(lambda restored_links: restored_links.append(_restore_link(link, *state)))
+
+    def value_changed_(self, element, values_dict, attribute, name, check_type):
+        if not self.records_changes_:
+            # the value type is checked when the value is set
+            return
+        if check_type:
+            self.changed_value_types_[(element, attribute, name)] = values_dict
+        if element in self.created_elements_:
+            return
+        classifier = attribute.classifier_
+        try:
+            old_value = values_dict[classifier][name]
+            self.undo_log_.append(lambda restored_links: _set_raw_value(values_dict, classifier, name, old_value))
+        except KeyError:
+            self.undo_log_.append(lambda restored_links: _delete_raw_value(values_dict, classifier, name))
+
+
+def _discard_link(link):
+    # the links of the source and target objects are restored from the snapshots
+    if link.is_deleted:
+        return
+    if link.stereotype_instances_holder_ is not None:
+        for stereotype in link.stereotype_instances_holder_.stereotypes_:
+            stereotype.extended_instances_.remove(link)
+        link.stereotype_instances_holder_.reset_stereotypes_()
+    for bundle in list(link.bundles_):
+        bundle.remove(link)
+    link.classifier_ = None
+    link.is_deleted = True
+
+
+def _restore_link(link, name, classifier, stereotypes, bundles):
+    # the links of the source and target objects are restored from the snapshots
+    link.is_deleted = False
+    link.name_ = name
+    link.classifier_ = classifier
+    for stereotype in stereotypes:
+        link.stereotype_instances_holder.add_stereotype_(stereotype)
+        stereotype.extended_instances_.append(link)
+    for bundle in bundles:
+        bundle.add(link)
+    return link
+
+
+def _set_raw_value(values_dict, classifier, name, value):
+    try:
+        values_dict[classifier][name] = value
+    except KeyError:
+        values_dict[classifier] = {name: value}
+
+
+def _delete_raw_value(values_dict, classifier, name):
+    try:
+        del values_dict[classifier][name]
+    except KeyError:
+        pass
+
+
+def model_transaction(deferred_checks_only=False):
+    """Create a transaction for changing links and values of a model, used as a context manager::
+
+        with model_transaction():
+            delete_links({cart1: item1})
+            add_links({cart2: item1}, role_name="item in cart")
+
+    Multiplicities and value types are checked when the ``with`` block is left. If a check fails, or an exception
+    is raised in the block, all changes of links and values made in the block are rolled back.
+    See :py:class:`.CTransaction` for details. Transactions can be nested; a nested transaction is part of
+    the outermost transaction.
+
+    Args:
+        deferred_checks_only (bool): If set, the transaction only defers the multiplicity checks, and does not
+            roll back any changes (see :py:class:`.CTransaction`).
+
+    Returns:
+        CTransaction: The transaction.
+    """
+    return CTransaction(deferred_checks_only)
@@ -0,0 +1,228 @@
+from array import array
+
+from codeable_models.internal.commons import EMPTY_MAPPING
+
+# attribute types stored in typed arrays; values of all other types are stored in lists
+_TYPE_CODES = {int: "q", float: "d", bool: "b"}
+
+
+class Column(object):
+    __slots__ = ("values", "is_set", "type_")
+
+    def __init__(self, type_, size):
+        """Values of one attribute for all rows of a :py:class:`.ColumnStore`.
+
+        ``values`` is a typed ``array.array``, if ``type_`` is ``int``, ``float``, or ``bool``, and a list
+        otherwise. ``is_set`` marks the rows that have a value.
+        A typed column is converted to a list once a value of another type (e.g., an ``int`` for a ``float``
+        attribute) or a value out of the array's range is set.
+        """
+        typecode = _TYPE_CODES.get(type_)
+        if typecode is None:
+            self.type_ = None
+            self.values = [None] * size
+        else:
+            self.type_ = type_
+            self.values = array(typecode, bytes(array(typecode).itemsize * size))
+        self.is_set = bytearray(size)
+
+    def _convert_to_list(self):
+        if self.type_ is bool:
+            self.values = [bool(value) if is_set else None for value, is_set in zip(self.values, self.is_set)]
+        else:
+            self.values = [value if is_set else None for value, is_set in zip(self.values, self.is_set)]
+        self.type_ = None
+
+    def get(self, row):
+        if not self.is_set[row]:
+            raise KeyError(row)
+        if self.type_ is bool:
+            return bool(self.values[row])
+        return self.values[row]
+
+    def set(self, row, value):
+        if self.type_ is not None:
+            if value.__class__ is self.type_:
+                try:
+                    self.values[row] = value
+                    self.is_set[row] = 1
+                    return
+                except OverflowError:
+                    pass
+            self._convert_to_list()
+        self.values[row] = value
+        self.is_set[row] = 1
+
+    def unset(self, row):
+        self.values[row] = None if self.type_ is None else 0
+        self.is_set[row] = 0
+
+    def append_row(self):
+        self.values.append(None if self.type_ is None else 0)
+        self.is_set.append(0)
+
+    def keep_rows(self, rows):
+        if self.type_ is None:
+            self.values = [self.values[row] for row in rows]
+        else:
+            self.values = array(self.values.typecode, [self.values[row] for row in rows])
+        self.is_set = bytearray(self.is_set[row] for row in rows)
+
+    def to_list(self):
+        values = self.values.tolist() if self.type_ is not None else list(self.values)
+        if self.type_ is bool:
+            values = [bool(value) for value in values]
+        if self.is_set.count(0) != 0:
+            values = [value if is_set else None for value, is_set in zip(values, self.is_set)]
+        return values
+
+
+class ColumnStore(object):
+    def __init__(self):
+        """Columnar store of the attribute values of the instances of a class, used if the class is
+        ``columnar`` (see :py:class:`.CClass`).
+
+        Each instance is a row of the store, and each attribute with values is a :py:class:`.Column`, stored
+        in ``columns_`` per classifier on which the attribute is defined. The ``attribute_values`` of the
+        instances are replaced by :py:class:`.ColumnarValues` views on their rows, which offer the interface of
+        the nested dicts (classifier -> attribute name -> value) used for non-columnar objects.
+
+        Rows are kept in the order of the instances of the class. Rows of removed instances are marked
+        as free, and the store is compacted when more than half of the rows are free, or a column is read.
+        """
+        self.columns_ = {}
+        # row -> ColumnarValues of the instance, None for free rows
+        self.rows_ = []
+        self.free_rows_ = 0
+
+    def add_row_(self, obj):
+        row = len(self.rows_)
+        for columns in self.columns_.values():
+            for column in columns.values():
+                column.append_row()
+        values = ColumnarValues(self, row)
+        self.rows_.append(values)
+        for classifier, classifier_values in obj.attribute_values.items():
+            for name, value in classifier_values.items():
+                self.set_value_(classifier, name, row, value)
+        obj.attribute_values = values
+
+    def remove_row_(self, obj):
+        values = obj.attribute_values
+        obj.attribute_values = values.to_dict() or EMPTY_MAPPING
+        for columns in self.columns_.values():
+            for column in columns.values():
+                column.unset(values.row_)
+        self.rows_[values.row_] = None
+        self.free_rows_ += 1
+        if self.free_rows_ > len(self.rows_) // 2:
+            self.compact_()
+
+    def compact_(self):
+        if self.free_rows_ == 0:
+            return
+        rows = [row for row, values in enumerate(self.rows_) if values is not None]
+        for columns in self.columns_.values():
+            for column in columns.values():
+                column.keep_rows(rows)
+        self.rows_ = [self.rows_[row] for row in rows]
+        for row, values in enumerate(self.rows_):
+            values.row_ = row
+        self.free_rows_ = 0
+
+    def set_value_(self, classifier, name, row, value):
+        try:
+            column = self.columns_[classifier][name]
+        except KeyError:
+            attribute = classifier.attributes_.get(name)
+            column = Column(None if attribute is None else attribute.type_, len(self.rows_))
+            self.columns_.setdefault(classifier, {})[name] = column
+        column.set(row, value)
+
+    def get_column_(self, classifier, name):
+        """Returns the column of the attribute ``name`` defined on ``classifier``, or ``None`` if no value
+        has been set for the attribute. Compacts the store first, so that the rows of the column are the
+        instances of the class in order."""
+        self.compact_()
+        return self.columns_.get(classifier, EMPTY_MAPPING).get(name)
+
+    def get_column_values(self, classifier, name):
+        column = self.get_column_(classifier, name)
+        if column is None:
+            return [None] * len(self.rows_)
+        return column.to_list()
+
+
+class ColumnarValues(object):
+    __slots__ = ("store_", "row_")
+
+    def __init__(self, store, row):
+        """The attribute values of an instance of a columnar class, i.e. a row in a :py:class:`.ColumnStore`,
+        offering the interface of the nested dicts (classifier -> attribute name -> value) used for the
+        attribute values of non-columnar objects."""
+        self.store_ = store
+        self.row_ = row
+
+    def __getitem__(self, classifier):
+        return _ColumnarClassifierValues(self.store_, self.store_.columns_[classifier], classifier, self.row_)
+
+    def __setitem__(self, classifier, values):
+        for name, value in values.items():
+            self.store_.set_value_(classifier, name, self.row_, value)
+
+    def __contains__(self, classifier):
+        return classifier in self.store_.columns_
+
+    def items(self):
+        return [(classifier, self[classifier]) for classifier in self.store_.columns_]
+
+    def to_dict(self):
+        return {classifier: dict(classifier_values.items()) for classifier, classifier_values in self.items()
+                if len(classifier_values) > 0}
+
+
+class _ColumnarClassifierValues(object):
+    __slots__ = ("store_", "columns_", "classifier_", "row_")
+
+    def __init__(self, store, columns, classifier, row):
+        self.store_ = store
+        self.columns_ = columns
+        self.classifier_ = classifier
+        self.row_ = row
+
+    def __getitem__(self, name):
+        return self.columns_[name].get(self.row_)
+
+    def __setitem__(self, name, value):
+        self.store_.set_value_(self.classifier_, name, self.row_, value)
+
+    def __delitem__(self, name):
+        column = self.columns_[name]
+        if not column.is_set[self.row_]:
+            raise KeyError(name)
+        column.unset(self.row_)
+
+    def __contains__(self, name):
+        column = self.columns_.get(name)
+        return column is not None and column.is_set[self.row_] != 0
+
+    def __iter__(self):
+        return iter([name for name, column in self.columns_.items() if column.is_set[self.row_]])
+
+    def __len__(self):
+        return sum(column.is_set[self.row_] for column in self.columns_.values())
+
+    def items(self):
+        return [(name, self[name]) for name in self]
+
+    def update(self, values):
+        for name, value in values.items():
+            self[name] = value
+
+    def pop(self, name, default=None):
+        try:
+            value = self[name]
+        except KeyError:
+            return default
+        del self[name]
+        return value
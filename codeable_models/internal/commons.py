@@ -1,5 +1,12 @@
+from types import MappingProxyType
+
 from codeable_models.cexception import CException
 
+# shared immutable empty containers, used as initial values of containers of model elements that are
+# allocated only when the first entry is added
+EMPTY_MAPPING = MappingProxyType({})
+EMPTY_SEQUENCE = ()
+
 
 def set_keyword_args(obj, allowed_values, **kwargs):
     for key in kwargs:
@@ -9,8 +16,44 @@ def set_keyword_args(obj, allowed_values, **kwargs):
             raise CException(f"unknown keyword argument '{key!s}', should be one of: {allowed_values!s}")
 
 
+# kind tags of the model element classes: each element class has a ``kinds_`` attribute combining the tag of the
+# kind of element it defines (its ``kind_``) with the tags of its superclasses, which is computed when the class is
+# defined (see CNamedElement.__init_subclass__()). Type checks test the tags instead of importing the classes
+# and calling isinstance().
+KIND_NAMED_ELEMENT = 1
+KIND_BUNDLABLE = 1 << 1
+KIND_BUNDLE = 1 << 2
+KIND_ENUM = 1 << 3
+KIND_CLASSIFIER = 1 << 4
+KIND_METACLASS = 1 << 5
+KIND_STEREOTYPE = 1 << 6
+KIND_CLASS = 1 << 7
+KIND_ASSOCIATION = 1 << 8
+KIND_OBJECT = 1 << 9
+KIND_LINK = 1 << 10
+KIND_ATTRIBUTE = 1 << 11
+
+# the attribute types of values of the built-in types
+_BUILTIN_ATTRIBUTE_TYPES = {str: str, bool: bool, int: int, float: float, list: list}
+
+
+def get_kinds(elt):
+    return getattr(type(elt), "kinds_", 0)
+
+
 def get_attribute_type(attr):
-    if isinstance(attr, str):
+    attribute_type = _BUILTIN_ATTRIBUTE_TYPES.get(type(attr))
+    if attribute_type is not None:
+        return attribute_type
+    kinds = getattr(type(attr), "kinds_", 0)
+    if kinds & KIND_OBJECT:
+        check_named_element_is_not_deleted(attr)
+        return attr.classifier
+    elif kinds & KIND_CLASS:
+        check_named_element_is_not_deleted(attr)
+        return attr.metaclass
+    # instances of subclasses of the built-in types
+    elif isinstance(attr, str):
         return str
     elif isinstance(attr, bool):
         return bool
@@ -20,12 +63,6 @@ def get_attribute_type(attr):
         return float
     elif isinstance(attr, list):
         return list
-    elif is_cobject(attr):
-        check_named_element_is_not_deleted(attr)
-        return attr.classifier
-    elif is_cclass(attr):
-        check_named_element_is_not_deleted(attr)
-        return attr.metaclass
     return None
 
 
@@ -36,87 +73,51 @@ def is_known_attribute_type(test_type):
 
 
 def is_cenum(elt):
-    from codeable_models.cenum import CEnum
-    if isinstance(elt, CEnum):
-        return True
-    return False
+    return (getattr(type(elt), "kinds_", 0) & KIND_ENUM) != 0
 
 
 def is_cclassifier(elt):
-    from codeable_models.cclassifier import CClassifier
-    if isinstance(elt, CClassifier):
-        return True
-    return False
+    return (getattr(type(elt), "kinds_", 0) & KIND_CLASSIFIER) != 0
 
 
 def is_cnamedelement(elt):
-    from codeable_models.cnamedelement import CNamedElement
-    if isinstance(elt, CNamedElement):
-        return True
-    return False
+    return (getattr(type(elt), "kinds_", 0) & KIND_NAMED_ELEMENT) != 0
 
 
 def is_cattribute(elt):
-    from codeable_models.cattribute import CAttribute
-    if isinstance(elt, CAttribute):
-        return True
-    return False
+    return (getattr(type(elt), "kinds_", 0) & KIND_ATTRIBUTE) != 0
 
 
 def is_cobject(elt):
-    from codeable_models.cobject import CObject
-    if isinstance(elt, CObject):
-        return True
-    return False
+    return (getattr(type(elt), "kinds_", 0) & KIND_OBJECT) != 0
 
 
 def is_cclass(elt):
-    from codeable_models.cclass import CClass
-    if isinstance(elt, CClass):
-        return True
-    return False
+    return (getattr(type(elt), "kinds_", 0) & KIND_CLASS) != 0
 
 
 def is_cmetaclass(elt):
-    from codeable_models.cmetaclass import CMetaclass
-    if isinstance(elt, CMetaclass):
-        return True
-    return False
+    return (getattr(type(elt), "kinds_", 0) & KIND_METACLASS) != 0
 
 
 def is_cstereotype(elt):
-    from codeable_models.cstereotype import CStereotype
-    if isinstance(elt, CStereotype):
-        return True
-    return False
+    return (getattr(type(elt), "kinds_", 0) & KIND_STEREOTYPE) != 0
 
 
 def is_cbundle(elt):
-    from codeable_models.cbundle import CBundle
-    if isinstance(elt, CBundle):
-        return True
-    return False
+    return (getattr(type(elt), "kinds_", 0) & KIND_BUNDLE) != 0
 
 
 def is_cbundlable(elt):
-    from codeable_models.cbundlable import CBundlable
-    if isinstance(elt, CBundlable):
-        return True
-    return False
+    return (getattr(type(elt), "kinds_", 0) & KIND_BUNDLABLE) != 0
 
 
 def is_cassociation(elt):
-    from codeable_models.cassociation import CAssociation
-    if isinstance(elt, CAssociation):
-        return True
-    return False
+    return (getattr(type(elt), "kinds_", 0) & KIND_ASSOCIATION) != 0
 
 
 def is_clink(elt):
-    from codeable_models.clink import CLink
-    if isinstance(elt, CLink):
-        return True
-    return False
+    return (getattr(type(elt), "kinds_", 0) & KIND_LINK) != 0
 
 
 def check_is_cmetaclass(elt):
@@ -168,16 +169,17 @@ def get_common_classifier(objects):
         if common_classifier is None:
             common_classifier = o.classifier
         else:
-            object_classifiers = {o.classifier}.union(o.classifier.all_superclasses)
+            object_classifier = o.classifier
+            object_superclasses = object_classifier.get_all_superclasses_()
             common_classifier_found = False
-            if common_classifier in object_classifiers:
+            if common_classifier == object_classifier or common_classifier in object_superclasses:
                 common_classifier_found = True
-            if not common_classifier_found and common_classifier in o.classifier.all_subclasses:
-                common_classifier = o.classifier
+            if not common_classifier_found and common_classifier in object_classifier.get_all_subclasses_():
+                common_classifier = object_classifier
                 common_classifier_found = True
             if not common_classifier_found:
-                for cl in common_classifier.all_superclasses:
-                    if cl in object_classifiers:
+                for cl in common_classifier.get_all_superclasses_():
+                    if cl == object_classifier or cl in object_superclasses:
                         common_classifier = cl
                         common_classifier_found = True
                         break
@@ -189,6 +191,16 @@ def get_common_classifier(objects):
     return common_classifier
 
 
+# map attribute names to the attributes defined first for that name on a class path
+def compute_attribute_table(class_path):
+    attribute_table = {}
+    for cl in class_path:
+        for name, attribute in cl.attributes_.items():
+            if name not in attribute_table:
+                attribute_table[name] = attribute
+    return attribute_table
+
+
 def check_is_common_classifier(classifier, objects):
     for o in objects:
         if not o.instance_of(classifier):
@@ -201,12 +213,12 @@ def _remove_superclasses_and_duplicates(classes):
         current_class = classes.pop(0)
         append = True
         for cl in classes:
-            if cl == current_class or cl in current_class.all_subclasses:
+            if cl == current_class or cl in current_class.get_all_subclasses_():
                 append = False
                 break
         if append:
             for cl in result:
-                if cl == current_class or cl in current_class.all_subclasses:
+                if cl == current_class or cl in current_class.get_all_subclasses_():
                     append = False
                     break
         if append:
@@ -217,7 +229,7 @@ def _remove_superclasses_and_duplicates(classes):
 def update_common_metaclasses(common_metaclasses, new_metaclasses):
     updated_common_metaclasses = []
     for metaclass in new_metaclasses:
-        metaclasses = metaclass.class_path
+        metaclasses = metaclass.get_class_path_()
         for cmc in common_metaclasses:
             for mc in metaclasses:
                 if cmc == mc:
@@ -231,7 +243,7 @@ def get_common_metaclasses(classes_or_links):
     common_metaclasses = None
     for classifier in classes_or_links:
         if is_clink(classifier):
-            link_classifiers = [link_cl for link_cl in classifier.association.all_superclasses if
+            link_classifiers = [link_cl for link_cl in classifier.association.get_all_superclasses_() if
                                 is_cmetaclass(link_cl)]
             if not link_classifiers:
                 raise CException(f"the metaclass link's association is missing a compatible classifier")
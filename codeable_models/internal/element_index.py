@@ -0,0 +1,103 @@
+class ElementIndex(object):
+    def __init__(self, index_types=False):
+        """Index of the named elements of a container (e.g., the objects of a class or the elements of a bundle)
+        by name and, optionally, by type. Lookups cost O(1) plus the size of the result.
+
+        The container registers each element with ``add()`` and ``remove()``, and reports name changes of its
+        elements with ``rename()``. Results are returned in the order in which the elements were added.
+        """
+        # element -> insertion number, used to keep all results in container order
+        self.sequence_ = {}
+        self.next_sequence_ = 0
+        # name -> insertion-ordered dict of elements used as an ordered set; as most names are unique,
+        # a name of a single element maps to the element itself to save memory (see _bucket_elements())
+        self.by_name_ = {}
+        # exact type -> insertion-ordered dict of elements used as an ordered set (or a single element)
+        self.by_type_ = {} if index_types else None
+
+    @staticmethod
+    def _name_of(element):
+        # elements may be registered before CNamedElement.__init__() has set their name
+        return getattr(element, "name_", None)
+
+    @staticmethod
+    def _bucket_elements(bucket):
+        if bucket.__class__ is dict:
+            return bucket
+        return bucket,
+
+    @staticmethod
+    def _add_to_bucket(buckets, key, element):
+        bucket = buckets.get(key)
+        if bucket is None:
+            buckets[key] = element
+        elif bucket.__class__ is dict:
+            bucket[element] = None
+        else:
+            buckets[key] = {bucket: None, element: None}
+
+    @staticmethod
+    def _remove_from_bucket(buckets, key, element):
+        bucket = buckets.get(key)
+        if bucket is None:
+            return
+        if bucket.__class__ is not dict:
+            if bucket is element:
+                del buckets[key]
+            return
+        if element not in bucket:
+            return
+        del bucket[element]
+        if len(bucket) == 1:
+            buckets[key] = next(iter(bucket))
+
+    def _in_container_order(self, elements):
+        return sorted(elements, key=self.sequence_.__getitem__)
+
+    def add(self, element):
+        self.sequence_[element] = self.next_sequence_
+        self.next_sequence_ += 1
+        self._add_to_bucket(self.by_name_, self._name_of(element), element)
+        if self.by_type_ is not None:
+            self._add_to_bucket(self.by_type_, type(element), element)
+
+    def remove(self, element):
+        if element not in self.sequence_:
+            return
+        self._remove_from_bucket(self.by_name_, self._name_of(element), element)
+        if self.by_type_ is not None:
+            self._remove_from_bucket(self.by_type_, type(element), element)
+        del self.sequence_[element]
+
+    def rename(self, element, old_name):
+        if element not in self.sequence_:
+            return
+        self._remove_from_bucket(self.by_name_, old_name, element)
+        name = self._name_of(element)
+        bucket = self.by_name_.get(name)
+        if bucket is not None:
+            bucket = self._bucket_elements(bucket)
+        if bucket is not None and self.sequence_[next(reversed(bucket))] > self.sequence_[element]:
+            # the element has been added to the container before some of the elements in the bucket
+            self.by_name_[name] = dict.fromkeys(self._in_container_order([*bucket, element]))
+        else:
+            self._add_to_bucket(self.by_name_, name, element)
+
+    def clear(self):
+        self.sequence_ = {}
+        self.by_name_ = {}
+        if self.by_type_ is not None:
+            self.by_type_ = {}
+
+    def get_by_name(self, name):
+        bucket = self.by_name_.get(name)
+        return [] if bucket is None else list(self._bucket_elements(bucket))
+
+    def get_by_type(self, type_):
+        buckets = [self._bucket_elements(bucket) for element_type, bucket in self.by_type_.items()
+                   if issubclass(element_type, type_)]
+        if len(buckets) == 0:
+            return []
+        if len(buckets) == 1:
+            return list(buckets[0])
+        return self._in_container_order(e for bucket in buckets for e in bucket)
@@ -0,0 +1,249 @@
+import operator
+from itertools import compress
+
+from codeable_models.cexception import CException
+
+# NumPy is optional: if it is installed, conditions and aggregations on the int, float, and bool columns of
+# columnar classes (see CClass.columnar) are evaluated on the column arrays, otherwise in plain Python
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+QUERY_OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda value, values: value in values,
+}
+
+AGGREGATE_FUNCTIONS = ("count", "sum", "min", "max", "mean")
+
+# NumPy types of the array types used by typed columns (see column_store.py)
+_NUMPY_TYPES = {int: "int64", float: "float64", bool: "bool"}
+_NUMERIC_VALUE_TYPES = (int, float, bool)
+
+
+class QueryCondition(object):
+    __slots__ = ("attribute", "operator", "value")
+
+    def __init__(self, attribute, operator_, value):
+        self.attribute = attribute
+        self.operator = operator_
+        self.value = value
+
+
+def parse_query_conditions(where, resolve_attribute):
+    """Parses ``where`` (``None``, a dict of attribute names and values to compare with ``==``, a condition
+    tuple ``(attribute_name, operator, value)``, or a list of condition tuples) into a list of
+    :py:class:`.QueryCondition`, using ``resolve_attribute`` to get the attribute for an attribute name."""
+    if where is None:
+        return []
+    if isinstance(where, dict):
+        conditions = [(attribute_name, "==", value) for attribute_name, value in where.items()]
+    elif isinstance(where, tuple):
+        conditions = [where]
+    elif isinstance(where, list):
+        conditions = where
+    else:
+        raise CException(f"malformed query condition: '{where!s}'")
+    result = []
+    for condition in conditions:
+        if not isinstance(condition, tuple) or len(condition) != 3:
+            raise CException(f"malformed query condition: '{condition!s}'")
+        attribute_name, operator_, value = condition
+        if operator_ not in QUERY_OPERATORS:
+            raise CException(f"unknown query operator '{operator_!s}'")
+        result.append(QueryCondition(resolve_attribute(attribute_name), operator_, value))
+    return result
+
+
+def _resolve_attribute(cl, attribute):
+    # the attribute is resolved on the queried class, but a subclass might redefine an attribute with the same
+    # name, then the values of its objects are the values of the redefined attribute (as for get_value())
+    return cl.get_attribute_table_()[attribute.name_]
+
+
+def _resolve_conditions(cl, conditions):
+    return [QueryCondition(_resolve_attribute(cl, condition.attribute), condition.operator, condition.value)
+            for condition in conditions]
+
+
+def _get_values(cl, attribute):
+    return cl.get_column(attribute.name_, attribute.classifier_)
+
+
+def _get_numpy_column(cl, attribute):
+    # returns the values and is-set flags of a typed column as NumPy arrays (sharing memory with the
+    # column), or None if NumPy is not installed, the class is not columnar, or the column is not typed
+    if numpy is None or cl.column_store_ is None:
+        return None
+    column = cl.column_store_.get_column_(attribute.classifier_, attribute.name_)
+    if column is None or column.type_ is None:
+        return None
+    return (numpy.frombuffer(column.values, dtype=_NUMPY_TYPES[column.type_]),
+            numpy.frombuffer(column.is_set, dtype="bool"))
+
+
+def _evaluate_condition(cl, condition):
+    # returns the selection mask of the condition for the objects of the class, either as a NumPy
+    # array or as a list; objects without a value for the attribute never match
+    function = QUERY_OPERATORS[condition.operator]
+    if condition.operator != "in" and isinstance(condition.value, _NUMERIC_VALUE_TYPES):
+        numpy_column = _get_numpy_column(cl, condition.attribute)
+        if numpy_column is not None:
+            values, is_set = numpy_column
+            return function(values, condition.value) & is_set
+    try:
+        return [value is not None and bool(function(value, condition.value)) for value in
+                _get_values(cl, condition.attribute)]
+    except TypeError:
+        raise CException(f"cannot compare values of attribute '{condition.attribute.name_!s}' " +
+                         f"using '{condition.operator!s}' with '{condition.value!s}'")
+
+
+def _evaluate_conditions(cl, conditions):
+    mask = None
+    for condition in conditions:
+        condition_mask = _evaluate_condition(cl, condition)
+        if mask is None:
+            mask = condition_mask
+        elif numpy is not None and isinstance(mask, numpy.ndarray) and isinstance(condition_mask, numpy.ndarray):
+            mask = mask & condition_mask
+        else:
+            mask = [m and c for m, c in zip(mask, condition_mask)]
+    return mask
+
+
+def _count_selected(mask, number_of_objects):
+    if mask is None:
+        return number_of_objects
+    if numpy is not None and isinstance(mask, numpy.ndarray):
+        return int(numpy.count_nonzero(mask))
+    return sum(mask)
+
+
+def select_objects(classes, conditions):
+    """Returns the objects of the ``classes`` (in the order of the classes and their objects) matching
+    all ``conditions``."""
+    result = []
+    for cl in classes:
+        if len(cl.objects_) == 0:
+            continue
+        mask = _evaluate_conditions(cl, _resolve_conditions(cl, conditions))
+        if mask is None:
+            result.extend(cl.objects_)
+        else:
+            result.extend(compress(cl.objects_, mask))
+    return result
+
+
+def _get_selected_values(cl, attribute, mask):
+    # returns the values of the attribute of the selected objects that have a value, as a NumPy array
+    # if possible, or as a list
+    numpy_column = _get_numpy_column(cl, attribute)
+    if numpy_column is not None:
+        values, is_set = numpy_column
+        if mask is not None and not isinstance(mask, numpy.ndarray):
+            mask = numpy.array(mask, dtype="bool")
+        return values[is_set if mask is None else is_set & mask]
+    values = _get_values(cl, attribute)
+    if mask is not None:
+        values = compress(values, mask)
+    return [value for value in values if value is not None]
+
+
+def _aggregate_numpy(function, values):
+    if function == "count":
+        return len(values)
+    if function == "sum":
+        if len(values) == 0:
+            return 0
+        if values.dtype == numpy.int64:
+            # the sum of int64 values is computed in Python, if it might overflow the int64 range
+            largest = max(abs(int(values.min())), abs(int(values.max())))
+            if largest * len(values) >= 2 ** 63:
+                return sum(values.tolist())
+        return values.sum().item()
+    if len(values) == 0:
+        return None
+    if function == "min":
+        return values.min().item()
+    if function == "max":
+        return values.max().item()
+    return float(values.mean())
+
+
+def _aggregate_list(function, values):
+    if function == "count":
+        return len(values)
+    if function == "sum":
+        return sum(values)
+    if len(values) == 0:
+        return None
+    if function == "min":
+        return min(values)
+    if function == "max":
+        return max(values)
+    return sum(values) / len(values)
+
+
+def _aggregate(function, chunks):
+    if numpy is not None and len(chunks) > 0 and all(isinstance(chunk, numpy.ndarray) for chunk in chunks):
+        return _aggregate_numpy(function, numpy.concatenate(chunks))
+    values = []
+    for chunk in chunks:
+        values.extend(chunk.tolist() if numpy is not None and isinstance(chunk, numpy.ndarray) else chunk)
+    try:
+        return _aggregate_list(function, values)
+    except TypeError:
+        raise CException(f"cannot compute '{function!s}' of the attribute values")
+
+
+def aggregate_values(classes, function, attribute, conditions, group_by):
+    """Aggregates the values of the ``attribute`` (or counts the objects, if ``attribute`` is ``None``)
+    of the objects of the ``classes`` matching all ``conditions`` using the aggregate ``function``. If
+    ``group_by`` is an attribute, returns a dict of the aggregated values per value of ``group_by``."""
+    if function not in AGGREGATE_FUNCTIONS:
+        raise CException(f"unknown aggregate function '{function!s}'")
+    if attribute is None and function != "count":
+        raise CException(f"aggregate function '{function!s}' requires an attribute")
+    if group_by is None:
+        chunks = []
+        number_of_objects = 0
+        for cl in classes:
+            if len(cl.objects_) == 0:
+                continue
+            mask = _evaluate_conditions(cl, _resolve_conditions(cl, conditions))
+            if attribute is None:
+                number_of_objects += _count_selected(mask, len(cl.objects_))
+            else:
+                chunks.append(_get_selected_values(cl, _resolve_attribute(cl, attribute), mask))
+        if attribute is None:
+            return number_of_objects
+        return _aggregate(function, chunks)
+
+    groups = {}
+    for cl in classes:
+        if len(cl.objects_) == 0:
+            continue
+        mask = _evaluate_conditions(cl, _resolve_conditions(cl, conditions))
+        group_values = _get_values(cl, _resolve_attribute(cl, group_by))
+        values = [True] * len(group_values) if attribute is None else _get_values(cl, _resolve_attribute(cl, attribute))
+        if mask is not None:
+            group_values = compress(group_values, mask)
+            values = compress(values, mask)
+        for group_value, value in zip(group_values, values):
+            try:
+                group = groups[group_value]
+            except KeyError:
+                groups[group_value] = group = []
+            except TypeError:
+                raise CException(f"cannot group by values of attribute '{group_by.name_!s}': " +
+                                 f"'{group_value!s}' is not hashable")
+            if value is not None:
+                group.append(value)
+    return {group_value: _aggregate(function, [values]) for group_value, values in groups.items()}
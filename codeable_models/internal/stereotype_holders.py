@@ -1,11 +1,18 @@
+from codeable_models import cevents
+from codeable_models.cclassifier import CClassifier
 from codeable_models.cexception import CException
 from codeable_models.internal.commons import is_cclass, is_clink, check_is_cstereotype, is_cstereotype, \
-    check_named_element_is_not_deleted, is_cassociation
+    check_named_element_is_not_deleted, is_cassociation, compute_attribute_table
+from codeable_models.internal.element_index import ElementIndex
 
 
 class CStereotypesHolder:
+    __slots__ = ("stereotypes_", "stereotypes_index_", "element")
+
     def __init__(self, element):
         self.stereotypes_ = []
+        # the name index is only built on the first lookup by name, as most elements have few stereotypes
+        self.stereotypes_index_ = None
         self.element = element
 
     @property
@@ -16,7 +23,35 @@ class CStereotypesHolder:
     def stereotypes(self, elements):
         self._set_stereotypes(elements)
 
+    def add_stereotype_(self, stereotype):
+        self.stereotypes_.append(stereotype)
+        if self.stereotypes_index_ is not None:
+            self.stereotypes_index_.add(stereotype)
+
+    def remove_stereotype_(self, stereotype):
+        self.stereotypes_.remove(stereotype)
+        if self.stereotypes_index_ is not None:
+            self.stereotypes_index_.remove(stereotype)
+
+    def reset_stereotypes_(self):
+        self.stereotypes_ = []
+        self.stereotypes_index_ = None
+
+    def stereotype_renamed_(self, stereotype, old_name):
+        if self.stereotypes_index_ is not None:
+            self.stereotypes_index_.rename(stereotype, old_name)
+
+    def get_stereotypes_by_name_(self, name):
+        if self.stereotypes_index_ is None:
+            self.stereotypes_index_ = ElementIndex()
+            for stereotype in self.stereotypes_:
+                self.stereotypes_index_.add(stereotype)
+        return self.stereotypes_index_.get_by_name(name)
+
     # methods to be overridden in subclass
+    def _stereotypes_changed(self):
+        pass
+
     def _remove_from_stereotype(self):
         for s in self.stereotypes_:
             s.extended_.remove(self.element)
@@ -35,8 +70,10 @@ class CStereotypesHolder:
     def _set_stereotypes(self, elements):
         if elements is None:
             elements = []
+        old_stereotypes = self.stereotypes_ if cevents.has_subscribers_ else None
         self._remove_from_stereotype()
-        self.stereotypes_ = []
+        self.reset_stereotypes_()
+        self._stereotypes_changed()
         if is_cstereotype(elements):
             elements = [elements]
         elif not isinstance(elements, list):
@@ -46,36 +83,50 @@ class CStereotypesHolder:
             if s is not None:
                 check_named_element_is_not_deleted(s)
                 self._check_stereotype_can_be_added(s)
-                self.stereotypes_.append(s)
+                self.add_stereotype_(s)
+                self._stereotypes_changed()
                 # noinspection PyTypeChecker
                 self._append_to_stereotype(s)
                 self._init_extended_element(s)
+        if cevents.has_subscribers_:
+            cevents.emit_(cevents.CStereotypesChanged(self.element, [] if old_stereotypes is None else old_stereotypes,
+                                                      list(self.stereotypes_)))
 
 
 class CStereotypeInstancesHolder(CStereotypesHolder):
+    __slots__ = ("stereotype_instance_path_", "attribute_table_", "structure_version_")
+
     def __init__(self, element):
         super().__init__(element)
+        # the stereotype instance path and its attribute table are cached until the stereotype instances,
+        # or the hierarchy or attributes of any classifier change (see CClassifier.structure_version_)
+        self.stereotype_instance_path_ = None
+        self.attribute_table_ = None
+        self.structure_version_ = None
 
     def _set_all_default_tagged_values_of_stereotype(self, stereotype):
         for a in stereotype.attributes:
             if a.default is not None:
                 self.element.set_tagged_value(a.name, a.default, stereotype)
 
-    def _get_stereotype_instance_path_superclasses(self, stereotype):
-        stereotype_path = [stereotype]
-        for superclass in stereotype.superclasses:
-            for superclassStereotype in self._get_stereotype_instance_path_superclasses(superclass):
-                if superclassStereotype not in stereotype_path:
-                    stereotype_path.append(superclassStereotype)
-        return stereotype_path
+    def _stereotypes_changed(self):
+        self.structure_version_ = None
 
     def get_stereotype_instance_path(self):
-        stereotype_path = []
-        for stereotypeOfThisElement in self.stereotypes:
-            for stereotype in self._get_stereotype_instance_path_superclasses(stereotypeOfThisElement):
-                if stereotype not in stereotype_path:
-                    stereotype_path.append(stereotype)
-        return stereotype_path
+        if self.structure_version_ != CClassifier.structure_version_:
+            stereotype_path = []
+            for stereotypeOfThisElement in self.stereotypes_:
+                for stereotype in stereotypeOfThisElement.get_class_path_():
+                    if stereotype not in stereotype_path:
+                        stereotype_path.append(stereotype)
+            self.stereotype_instance_path_ = stereotype_path
+            self.attribute_table_ = compute_attribute_table(stereotype_path)
+            self.structure_version_ = CClassifier.structure_version_
+        return self.stereotype_instance_path_
+
+    def get_attribute_table(self):
+        self.get_stereotype_instance_path()
+        return self.attribute_table_
 
     def _remove_from_stereotype(self):
         for s in self.stereotypes_:
@@ -103,5 +154,5 @@ class CStereotypeInstancesHolder(CStereotypesHolder):
 
     def _init_extended_element(self, stereotype):
         self._set_all_default_tagged_values_of_stereotype(stereotype)
-        for sc in stereotype.all_superclasses:
+        for sc in stereotype.get_all_superclasses_():
             self._set_all_default_tagged_values_of_stereotype(sc)
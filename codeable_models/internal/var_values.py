@@ -1,3 +1,4 @@
+from codeable_models import ctransaction, cevents
 from codeable_models.internal.commons import *
 
 
@@ -7,6 +8,22 @@ class VarValueKind:
     DEFAULT_VALUE = 3
 
 
+_VALUE_KIND_EVENT_NAMES = {
+    VarValueKind.ATTRIBUTE_VALUE: "value",
+    VarValueKind.TAGGED_VALUE: "tagged value",
+    VarValueKind.DEFAULT_VALUE: "default value",
+}
+
+
+def _emit_value_changed(_self, value_kind, var_name, classifier, old_value, new_value):
+    # the values of a class are stored on its class object, but the event is emitted for the class
+    element = getattr(_self, "class_object_class_", None)
+    if element is None:
+        element = _self
+    cevents.emit_(cevents.CValueChanged(element, _VALUE_KIND_EVENT_NAMES[value_kind], var_name, classifier,
+                                        old_value, new_value))
+
+
 def _get_var_unknown_exception(value_kind, entity, var_name):
     if value_kind == VarValueKind.TAGGED_VALUE:
         value_kind_str = "tagged value"
@@ -23,53 +40,75 @@ def _get_var_unknown_exception(value_kind, entity, var_name):
     return CException(f"{value_kind_str!s} '{var_name!s}' unknown for '{entity!s}'")
 
 
-def _get_and_check_var_classifier(_self, class_path, var_name, value_kind, classifier=None):
+# The attribute table maps attribute names to the attributes found first on the class path
+# (see compute_attribute_table()), so that names can be resolved without searching the class path.
+def _get_and_check_var_classifier(_self, attribute_table, var_name, value_kind, classifier=None):
     if classifier is None:
-        # search on a class path
-        for cl in class_path:
-            if cl.get_attribute(var_name) is not None:
-                return _get_and_check_var_classifier(_self, class_path, var_name, value_kind, cl)
-        raise _get_var_unknown_exception(value_kind, _self, var_name)
+        attribute = attribute_table.get(var_name) if isinstance(var_name, str) else None
+        if attribute is None:
+            raise _get_var_unknown_exception(value_kind, _self, var_name)
     else:
         # check only on specified classifier
         attribute = classifier.get_attribute(var_name)
         if attribute is None:
             raise _get_var_unknown_exception(value_kind, classifier, var_name)
-        attribute.check_attribute_type_is_not_deleted()
-        return attribute
+    attribute.check_attribute_type_is_not_deleted()
+    return attribute
 
 
-def delete_var_value(_self, class_path, values_dict, var_name, value_kind, classifier=None):
+def get_var_attribute(_self, attribute_table, var_name, value_kind, classifier=None):
+    # resolves the attribute of a variable, raising an exception if it is unknown
+    return _get_and_check_var_classifier(_self, attribute_table, var_name, value_kind, classifier)
+
+
+def delete_var_value(_self, attribute_table, values_dict, var_name, value_kind, classifier=None):
     if _self.is_deleted:
         raise CException(f"can't delete '{var_name!s}' on deleted element")
-    attribute = _get_and_check_var_classifier(_self, class_path, var_name, value_kind, classifier)
+    attribute = _get_and_check_var_classifier(_self, attribute_table, var_name, value_kind, classifier)
     try:
         values_of_classifier = values_dict[attribute.classifier]
     except KeyError:
         return None
     try:
         value = values_of_classifier[var_name]
+        if ctransaction.active_transaction_ is not None:
+            ctransaction.active_transaction_.value_changed_(_self, values_dict, attribute, var_name, False)
         del values_of_classifier[var_name]
+        if cevents.has_subscribers_:
+            _emit_value_changed(_self, value_kind, var_name, attribute.classifier_, value, None)
         return value
     except KeyError:
         return None
 
 
-def set_var_value(_self, class_path, values_dict, var_name, value, value_kind, classifier=None):
+def set_var_value(_self, attribute_table, values_dict, var_name, value, value_kind, classifier=None):
     if _self.is_deleted:
         raise CException(f"can't set '{var_name!s}' on deleted element")
-    attribute = _get_and_check_var_classifier(_self, class_path, var_name, value_kind, classifier)
-    attribute.check_attribute_value_type_(var_name, value)
+    attribute = _get_and_check_var_classifier(_self, attribute_table, var_name, value_kind, classifier)
+    transaction = ctransaction.active_transaction_
+    if transaction is None or not transaction.records_changes_:
+        attribute.check_attribute_value_type_(var_name, value)
+    if transaction is not None:
+        # in a transaction that records changes, the value type is checked when the transaction is committed
+        transaction.value_changed_(_self, values_dict, attribute, var_name, True)
+    old_value = None
+    if cevents.has_subscribers_:
+        try:
+            old_value = values_dict[attribute.classifier_][var_name]
+        except KeyError:
+            pass
     try:
         values_dict[attribute.classifier].update({var_name: value})
     except KeyError:
         values_dict[attribute.classifier] = {var_name: value}
+    if cevents.has_subscribers_:
+        _emit_value_changed(_self, value_kind, var_name, attribute.classifier_, old_value, value)
 
 
-def get_var_value(_self, class_path, values_dict, var_name, value_kind, classifier=None):
+def get_var_value(_self, attribute_table, values_dict, var_name, value_kind, classifier=None):
     if _self.is_deleted:
         raise CException(f"can't get '{var_name!s}' on deleted element")
-    attribute = _get_and_check_var_classifier(_self, class_path, var_name, value_kind, classifier)
+    attribute = _get_and_check_var_classifier(_self, attribute_table, var_name, value_kind, classifier)
     try:
         values_of_classifier = values_dict[attribute.classifier]
     except KeyError:
@@ -90,6 +129,58 @@ def get_var_values(class_path, values_dict):
     return result
 
 
+def get_default_var_values(class_path):
+    # the default values of all attributes on the class path, in the form of a values dict
+    default_values = {}
+    for cl in class_path:
+        for attr_name, attr in cl.attributes_.items():
+            if attr.default is not None:
+                try:
+                    default_values[cl][attr_name] = attr.default
+                except KeyError:
+                    default_values[cl] = {attr_name: attr.default}
+    return default_values
+
+
+def set_var_values_in_bulk(_self, attribute_table, values_dicts, rows, columns, value_kind):
+    # sets the values of many elements at once: ``rows`` contains a dict of new values per element,
+    # ``columns`` a sequence of (var_name, values) pairs with one value per element (None for no value).
+    # Each variable name is resolved only once per call, and values of exactly the attribute's type (the
+    # common case) are accepted without performing the full type check.
+    attributes = {}
+
+    def get_attribute(var_name):
+        try:
+            return attributes[var_name]
+        except KeyError:
+            attribute = _get_and_check_var_classifier(_self, attribute_table, var_name, value_kind)
+            attributes[var_name] = attribute
+            return attribute
+
+    def set_value(values_dict, attribute, var_name, value):
+        if value.__class__ is not attribute.type_:
+            attribute.check_attribute_value_type_(var_name, value)
+        try:
+            values_dict[attribute.classifier_][var_name] = value
+        except KeyError:
+            values_dict[attribute.classifier_] = {var_name: value}
+
+    if rows is not None:
+        for values_dict, new_values in zip(values_dicts, rows):
+            if new_values is None:
+                continue
+            if not isinstance(new_values, dict):
+                raise CException(f"malformed attribute values description: '{new_values!s}'")
+            for var_name, value in new_values.items():
+                set_value(values_dict, get_attribute(var_name), var_name, value)
+    if columns is not None:
+        for var_name, values in columns:
+            attribute = get_attribute(var_name)
+            for values_dict, value in zip(values_dicts, values):
+                if value is not None:
+                    set_value(values_dict, attribute, var_name, value)
+
+
 def set_var_values(_self, new_values, values_kind):
     if new_values is None:
         new_values = {}
@@ -5,8 +5,8 @@ from plant_uml_renderer.model_renderer import RenderingContext, ModelRenderer
 
 
 class ClassifierRenderingContext(RenderingContext):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, sink=None):
+        super().__init__(sink)
         self.visited_associations = set()
         self.render_associations = True
         self.render_inheritance = True
@@ -18,6 +18,16 @@ class ClassifierRenderingContext(RenderingContext):
         self.included_extended_classes = None
         self.render_metaclass_as_stereotype = False
 
+    def index_keyword_args(self):
+        # the lists of elements given as keyword args are only used for membership tests, so they are
+        # converted to sets once per rendered model
+        self.excluded_associations = set(self.excluded_associations)
+        if self.included_associations is not None:
+            self.included_associations = set(self.included_associations)
+        self.excluded_extended_classes = set(self.excluded_extended_classes)
+        if self.included_extended_classes is not None:
+            self.included_extended_classes = set(self.included_extended_classes)
+
 
 class ClassModelRenderer(ModelRenderer):
     def render_classifier_specification(self, context, cl):
@@ -172,14 +182,14 @@ class ClassModelRenderer(ModelRenderer):
                                      self.get_node_id(context, extended) + ': "' +
                                      self.render_stereotypes_string("extended") + '"')
 
-    def render_inheritance_relations(self, context, class_list):
+    def render_inheritance_relations(self, context, class_list, class_set):
         if not context.render_inheritance:
             return
         for cl in class_list:
             if is_cenum(cl):
                 continue
             for sub_class in cl.subclasses:
-                if sub_class in class_list:
+                if sub_class in class_set:
                     context.add_line(self.get_node_id(context, cl) + " <|--- " + self.get_node_id(context, sub_class))
 
     def render_classes(self, context, class_list):
@@ -187,25 +197,32 @@ class ClassModelRenderer(ModelRenderer):
             if not is_cclassifier(cl) and not is_cenum(cl):
                 raise CException(f"'{cl!s}' handed to class renderer is not a classifier or enum'")
             self.render_classifier_specification(context, cl)
-        self.render_inheritance_relations(context, class_list)
+        # relations are only rendered if their ends are rendered
+        class_set = set(class_list)
+        self.render_inheritance_relations(context, class_list, class_set)
         for cl in class_list:
-            self.render_associations(context, cl, class_list)
+            self.render_associations(context, cl, class_set)
             if is_cstereotype(cl):
-                self.render_extended_relations(context, cl, class_list)
+                self.render_extended_relations(context, cl, class_set)
 
-    def render_class_model(self, class_list, **kwargs):
-        context = ClassifierRenderingContext()
+    def render_class_model(self, class_list, sink=None, **kwargs):
+        # if a sink (a file-like object) is given, the model is written to the sink instead of being returned
+        context = ClassifierRenderingContext(sink)
         set_keyword_args(context,
                          ["render_associations", "render_inheritance", "render_attributes", "excluded_associations",
                           "included_associations", "render_extended_relations",
                           "excluded_extended_classes", "included_extended_classes",
                           "render_metaclass_as_stereotype", "render_tagged_values"],
                          **kwargs)
+        context.index_keyword_args()
         self.render_start_graph(context)
         self.render_classes(context, class_list)
         self.render_end_graph(context)
+        if sink is not None:
+            context.flush()
+            return None
         return context.result
 
     def render_class_model_to_file(self, file_name_base, class_list, **kwargs):
-        source = self.render_class_model(class_list, **kwargs)
-        self.render_to_files(file_name_base, source)
+        return self.render_model_to_files_(file_name_base,
+                                           lambda sink: self.render_class_model(class_list, sink=sink, **kwargs))
@@ -1,9 +1,11 @@
 import os
+import tempfile
 from enum import Enum
 from subprocess import call
 
 from codeable_models import *
 from codeable_models.internal.commons import set_keyword_args, is_cobject
+from plant_uml_renderer import rendering_cache
 
 
 def get_encoded_name(element):
@@ -19,9 +21,15 @@ def get_encoded_name(element):
 
 
 class RenderingContext(object):
-    def __init__(self):
+    # number of chunks of rendered text collected before they are written to the sink
+    SINK_BUFFER_CHUNKS = 4096
+
+    def __init__(self, sink=None):
         super().__init__()
-        self.result = ""
+        # the rendered text is collected as a list of chunks, which are joined when the result is requested, or
+        # written to the sink (a file-like object), if one is given
+        self.chunks = []
+        self.sink = sink
         self.indent = 0
         self.indent_cache_string = ""
         self.node_ids = {}
@@ -40,14 +48,33 @@ class RenderingContext(object):
             self.node_ids[element] = name
             return name
 
+    @property
+    def result(self):
+        if self.sink is not None:
+            raise CException("the result of a rendering context with a sink is written to the sink")
+        if len(self.chunks) > 1:
+            self.chunks = ["".join(self.chunks)]
+        return self.chunks[0] if self.chunks else ""
+
+    @result.setter
+    def result(self, result):
+        self.chunks = [result]
+
     def add_line(self, string):
-        self.result += self.indent_cache_string + string + "\n"
+        self.add(self.indent_cache_string + string + "\n")
 
     def add_with_indent(self, string):
-        self.result += self.indent_cache_string + string
+        self.add(self.indent_cache_string + string)
 
     def add(self, string):
-        self.result += string
+        self.chunks.append(string)
+        if self.sink is not None and len(self.chunks) >= self.SINK_BUFFER_CHUNKS:
+            self.flush()
+
+    def flush(self):
+        if self.sink is not None and self.chunks:
+            self.sink.write("".join(self.chunks))
+            self.chunks = []
 
     def increase_indent(self):
         self.indent += 2
@@ -72,6 +99,12 @@ class ModelRenderer(object):
         self.plant_uml_jar_path = "../libs/plantuml.jar"
         self.render_png = True
         self.render_svg = True
+        # if set, diagrams are rendered in the background by the PlantUMLWorkerPool
+        self.worker_pool = None
+        # figures whose source and settings are unchanged since they were last rendered (according to the manifest
+        # in the directory) are skipped, unless rendering is forced
+        self.use_rendering_cache = True
+        self.force_rendering = False
 
         self.name_break_length = 25
         self.name_padding = ""
@@ -85,7 +118,8 @@ class ModelRenderer(object):
 
     def _init_keyword_args(self, legal_keyword_args=None, **kwargs):
         if legal_keyword_args is None:
-            legal_keyword_args = ["directory", "plant_uml_jar_path", "genSVG", "genPNG"]
+            legal_keyword_args = ["directory", "plant_uml_jar_path", "genSVG", "genPNG", "worker_pool",
+                                  "use_rendering_cache", "force_rendering"]
         set_keyword_args(self, legal_keyword_args, **kwargs)
 
     def render_start_graph(self, context):
@@ -250,18 +284,79 @@ class ModelRenderer(object):
     def get_node_id(context, element):
         return context.get_node_id(element)
 
+    def get_source_file_name(self, file_name_base):
+        return f"{self.directory!s}/{file_name_base!s}.txt"
+
+    def open_source_file(self, file_name_base):
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+        return open(self.get_source_file_name(file_name_base), "w")
+
+    def get_output_formats(self):
+        return (["png"] if self.render_png else []) + (["svg"] if self.render_svg else [])
+
+    def get_cache_settings(self):
+        # the settings that determine the figures, in addition to the source
+        return [self.style, self.get_output_formats(), rendering_cache.get_jar_digest(self.plant_uml_jar_path)]
+
     def render_to_files(self, file_name_base, source):
-        file_name_base_with_dir = f"{self.directory!s}/{file_name_base!s}"
-        file_name_txt = file_name_base_with_dir + ".txt"
+        return self.render_model_to_files_(file_name_base, lambda sink: sink.write(source))
+
+    def render_model_to_files_(self, file_name_base, render_model):
+        # render_model(sink) renders the source of the figures into the sink
+        if not self.use_rendering_cache:
+            with self.open_source_file(file_name_base) as file:
+                render_model(file)
+            return self.render_source_file(file_name_base)
+        # the source is streamed into a temporary file while its digest is computed, which replaces the
+        # source file only if the figures must be rendered
         if not os.path.exists(self.directory):
             os.makedirs(self.directory)
-        file = open(file_name_txt, "w")
-        file.write(source)
-        file.close()
+        cache_settings = self.get_cache_settings()
+        source_digest = rendering_cache.create_source_digest()
+        file = tempfile.NamedTemporaryFile("w", dir=self.directory, prefix=f"{file_name_base!s}.",
+                                           suffix=".tmp", delete=False)
+        try:
+            with file:
+                render_model(rendering_cache.HashingSink(file, source_digest))
+            cache_key = rendering_cache.get_cache_key(source_digest, cache_settings)
+            file_names = [f"{self.directory!s}/{file_name_base!s}.{output_format!s}"
+                          for output_format in ["txt"] + self.get_output_formats()]
+            if not self.force_rendering and rendering_cache.is_up_to_date(self.directory, file_name_base,
+                                                                          cache_key, file_names):
+                os.remove(file.name)
+                return None
+            # the figures are outdated until they are rendered successfully
+            rendering_cache.forget(self.directory, file_name_base)
+            os.replace(file.name, self.get_source_file_name(file_name_base))
+        except BaseException as e:
+            if os.path.exists(file.name):
+                os.remove(file.name)
+            raise e
+        return self.render_source_file(file_name_base, cache_key, cache_settings)
+
+    def render_source_file(self, file_name_base, cache_key=None, cache_settings=None):
+        file_name_txt = self.get_source_file_name(file_name_base)
+        directory = self.directory
+        if self.worker_pool is not None:
+            future = self.worker_pool.submit(file_name_txt, self.get_output_formats())
+            if cache_key is not None:
+                def record_rendered(rendering):
+                    # the source file might have been overwritten before it was rendered, so the key of the
+                    # source that was actually rendered (returned by the rendering) is recorded
+                    if rendering.exception() is None:
+                        rendered_key = rendering_cache.get_cache_key(
+                            rendering_cache.create_source_digest(rendering.result()), cache_settings)
+                        rendering_cache.record(directory, file_name_base, rendered_key)
+                future.add_done_callback(record_rendered)
+            return future
+        exit_codes = []
         if self.render_png:
-            call(["java", "-jar", f"{self.plant_uml_jar_path!s}", f"{file_name_txt!s}"])
+            exit_codes.append(call(["java", "-jar", f"{self.plant_uml_jar_path!s}", f"{file_name_txt!s}"]))
         if self.render_svg:
-            call(["java", "-jar", f"{self.plant_uml_jar_path!s}", f"{file_name_txt!s}", "-tsvg"])
+            exit_codes.append(call(["java", "-jar", f"{self.plant_uml_jar_path!s}", f"{file_name_txt!s}", "-tsvg"]))
+        if cache_key is not None and not any(exit_codes):
+            rendering_cache.record(directory, file_name_base, cache_key)
 
 
 def _check_for_illegal_value_characters(value):
@@ -6,14 +6,19 @@ from plant_uml_renderer.model_renderer import RenderingContext, ModelRenderer
 
 
 class ObjectRenderingContext(RenderingContext):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, sink=None):
+        super().__init__(sink)
         self.visited_links = set()
         self.render_attribute_values = True
         self.render_empty_attributes = False
         self.render_association_names_when_no_label_is_given = False
         self.excluded_links = []
 
+    def index_keyword_args(self):
+        # the excluded links are only used for membership tests, so they are converted to a set once per
+        # rendered model
+        self.excluded_links = set(self.excluded_links)
+
 
 class ObjectModelRenderer(ModelRenderer):
     def render_object_specification(self, context, object_):
@@ -79,25 +84,43 @@ class ObjectModelRenderer(ModelRenderer):
             self.get_node_id(context, link.source) + arrow + self.get_node_id(context, link.target) + label)
 
     def render_links(self, context, obj, obj_list):
+        # the links of the object are indexed by association: each group of links is rendered once, in the order
+        # of the associations on the class path, and the class path is only searched until all groups are found
+        association_links = obj.association_links_
+        remaining_groups = len(association_links)
+        if remaining_groups == 0:
+            return
+        visited_associations = set()
         for classifier in obj.classifier.class_path:
             for association in classifier.associations:
-                links = [l for l in obj.links if l.association == association]
-                for link in links:
-                    if link in context.excluded_links:
-                        continue
-                    source = link.source
-                    if is_cclass(source):
-                        source = source.class_object
-                    target = link.target
-                    if is_cclass(target):
-                        target = target.class_object
-                    if source != obj:
-                        # only render links outgoing from this object
-                        continue
-                    if link not in context.visited_links:
-                        context.visited_links.add(link)
-                        if target in obj_list:
-                            self.render_link(context, link)
+                if association in visited_associations:
+                    continue
+                visited_associations.add(association)
+                links = association_links.get(association)
+                if links is None:
+                    continue
+                for link in links.values():
+                    self.render_link_of_object(context, obj, link, obj_list)
+                remaining_groups -= 1
+                if remaining_groups == 0:
+                    return
+
+    def render_link_of_object(self, context, obj, link, obj_list):
+        if link in context.excluded_links:
+            return
+        source = link.source
+        if is_cclass(source):
+            source = source.class_object
+        target = link.target
+        if is_cclass(target):
+            target = target.class_object
+        if source != obj:
+            # only render links outgoing from this object
+            return
+        if link not in context.visited_links:
+            context.visited_links.add(link)
+            if target in obj_list:
+                self.render_link(context, link)
 
     def render_objects(self, context, objects):
         obj_list = []
@@ -111,20 +134,27 @@ class ObjectModelRenderer(ModelRenderer):
                 raise CException(f"'{obj!s}' handed to object renderer is no an object or class'")
         for obj in obj_list:
             self.render_object_specification(context, obj)
+        # links are rendered if their targets are rendered
+        obj_set = set(obj_list)
         for obj in obj_list:
-            self.render_links(context, obj, obj_list)
+            self.render_links(context, obj, obj_set)
 
-    def render_object_model(self, object_list, **kwargs):
-        context = ObjectRenderingContext()
+    def render_object_model(self, object_list, sink=None, **kwargs):
+        # if a sink (a file-like object) is given, the model is written to the sink instead of being returned
+        context = ObjectRenderingContext(sink)
         set_keyword_args(context,
                          ["render_attribute_values", "render_empty_attributes",
                           "render_association_names_when_no_label_is_given",
                           "excluded_links", "render_tagged_values"], **kwargs)
+        context.index_keyword_args()
         self.render_start_graph(context)
         self.render_objects(context, object_list)
         self.render_end_graph(context)
+        if sink is not None:
+            context.flush()
+            return None
         return context.result
 
     def render_object_model_to_file(self, file_name_base, class_list, **kwargs):
-        source = self.render_object_model(class_list, **kwargs)
-        self.render_to_files(file_name_base, source)
+        return self.render_model_to_files_(file_name_base,
+                                           lambda sink: self.render_object_model(class_list, sink=sink, **kwargs))
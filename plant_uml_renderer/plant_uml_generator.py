@@ -3,18 +3,40 @@ import shutil
 
 from plant_uml_renderer.class_model_renderer import ClassModelRenderer
 from plant_uml_renderer.object_model_renderer import ObjectModelRenderer
+from plant_uml_renderer.plant_uml_worker_pool import PlantUMLWorkerPool
 
 
 class PlantUMLGenerator(object):
-    def __init__(self, delete_gen_dir_during_init=False):
+    def __init__(self, delete_gen_dir_during_init=False, workers=None, force_rendering=False):
         self._directory = "../_generated"
         self._plant_uml_jar_path = "../../libs/plantuml.jar"
         if delete_gen_dir_during_init:
             self.delete_gen_dir()
+        # with a number of workers, diagrams are rendered concurrently by long-lived PlantUML processes, until
+        # close() is called; otherwise, PlantUML is started for each diagram
+        self.worker_pool = None
+        if workers is not None:
+            self.worker_pool = PlantUMLWorkerPool(self._plant_uml_jar_path, workers)
         self.class_model_renderer = ClassModelRenderer(plant_uml_jar_path=self._plant_uml_jar_path,
-                                                       directory=self._directory)
+                                                       directory=self._directory, worker_pool=self.worker_pool,
+                                                       force_rendering=force_rendering)
         self.object_model_renderer = ObjectModelRenderer(plant_uml_jar_path=self._plant_uml_jar_path,
-                                                         directory=self._directory)
+                                                         directory=self._directory, worker_pool=self.worker_pool,
+                                                         force_rendering=force_rendering)
+
+    def wait(self):
+        if self.worker_pool is not None:
+            self.worker_pool.wait()
+
+    def close(self):
+        if self.worker_pool is not None:
+            self.worker_pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     def delete_gen_dir(self):
         if os.path.exists(self.directory):
@@ -27,11 +49,12 @@ class PlantUMLGenerator(object):
         return name
 
     def generate_class_model(self, bundle, **kwargs):
-        self.class_model_renderer.render_class_model_to_file(self.get_file_name(bundle.name), bundle.elements, **kwargs)
+        return self.class_model_renderer.render_class_model_to_file(self.get_file_name(bundle.name),
+                                                                    bundle.elements, **kwargs)
 
     def generate_object_model(self, bundle, **kwargs):
-        self.object_model_renderer.render_object_model_to_file(self.get_file_name(bundle.name), bundle.elements,
-                                                               **kwargs)
+        return self.object_model_renderer.render_object_model_to_file(self.get_file_name(bundle.name),
+                                                                      bundle.elements, **kwargs)
 
     def generate_class_models(self, dir_name, view_list):
         main_dir = self.directory
@@ -54,6 +77,8 @@ class PlantUMLGenerator(object):
     @plant_uml_jar_path.setter
     def plant_uml_jar_path(self, plant_uml_jar_path):
         self._plant_uml_jar_path = plant_uml_jar_path
+        if self.worker_pool is not None:
+            self.worker_pool.plant_uml_jar_path = plant_uml_jar_path
         self.class_model_renderer.plant_uml_jar_path = plant_uml_jar_path
         self.object_model_renderer.plant_uml_jar_path = plant_uml_jar_path
 
@@ -0,0 +1,239 @@
+import os
+import queue
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from codeable_models import CException
+
+# written by PlantUML to stdout after each diagram rendered in pipe mode
+PIPE_DELIMITER = "___PLANT_UML_DIAGRAM_END___"
+# written by PlantUML to stderr (followed by the line and the description of the error) before the delimiter,
+# if a diagram cannot be rendered; the diagram is then rendered as an error image
+PIPE_ERROR_MARKER = "ERROR"
+READ_SIZE = 65536
+
+
+class PlantUMLProcess(object):
+    # a long-lived PlantUML process in pipe mode, which reads diagram sources from stdin and writes the rendered
+    # diagrams of one output format to stdout, each followed by the delimiter
+    def __init__(self, plant_uml_jar_path, output_format):
+        self.plant_uml_jar_path = plant_uml_jar_path
+        self.output_format = output_format
+        self.process = None
+        self.buffer = bytearray()
+        self.delimiter = PIPE_DELIMITER.encode("ascii")
+        self.errors = bytearray()
+        self.errors_lock = threading.Lock()
+        self.errors_thread = None
+
+    def start(self):
+        self.process = subprocess.Popen(["java", "-Djava.awt.headless=true", "-jar", f"{self.plant_uml_jar_path!s}",
+                                         "-pipe", f"-t{self.output_format!s}", "-charset", "UTF-8",
+                                         "-pipedelimitor", PIPE_DELIMITER],
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        self.buffer = bytearray()
+        self.errors = bytearray()
+        self.errors_thread = None
+        try:
+            # PlantUML writes the errors of a diagram before the delimiter, so that they can be read without
+            # blocking once the delimiter is read
+            os.set_blocking(self.process.stderr.fileno(), False)
+        except (OSError, AttributeError):
+            # where pipes cannot be non-blocking, the errors are read by a thread
+            self.errors_thread = threading.Thread(target=self._read_errors_in_thread, args=(self.process.stderr,),
+                                                  daemon=True)
+            self.errors_thread.start()
+
+    def _read_errors_in_thread(self, stderr):
+        for data in iter(lambda: stderr.read1(READ_SIZE), b""):
+            with self.errors_lock:
+                self.errors += data
+
+    def _read_errors(self):
+        # returns the errors written since the last call
+        if self.errors_thread is None and self.process is not None:
+            file_descriptor = self.process.stderr.fileno()
+            while True:
+                try:
+                    data = os.read(file_descriptor, READ_SIZE)
+                except BlockingIOError:
+                    break
+                if not data:
+                    break
+                self.errors += data
+        with self.errors_lock:
+            errors = self.errors.decode("utf-8", errors="replace")
+            self.errors = bytearray()
+        return errors
+
+    def is_running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def render(self, source):
+        # returns the rendered diagram, and the description of the error if PlantUML reported one (the
+        # diagram is an error image then)
+        if not self.is_running():
+            self.start()
+        try:
+            self.process.stdin.write(source.encode("utf-8"))
+            self.process.stdin.flush()
+            diagram = self._read_diagram()
+        except (OSError, CException):
+            # the process cannot be used for further diagrams, a new one is started for the next diagram
+            self.stop()
+            raise
+        lines = [line.strip() for line in self._read_errors().splitlines()]
+        if PIPE_ERROR_MARKER not in lines:
+            return diagram, None
+        return diagram, " ".join(line for line in lines[lines.index(PIPE_ERROR_MARKER) + 1:] if line)
+
+    def _read_diagram(self):
+        search_start = 0
+        while True:
+            index = self.buffer.find(self.delimiter, search_start)
+            if index >= 0:
+                break
+            search_start = max(0, len(self.buffer) - len(self.delimiter) + 1)
+            data = self.process.stdout.read1(READ_SIZE)
+            if not data:
+                errors = " ".join(line.strip() for line in self._read_errors().splitlines() if line.strip())
+                raise CException(f"PlantUML process for '{self.output_format!s}' terminated while rendering" +
+                                 (f": {errors!s}" if errors else ""))
+            self.buffer += data
+        diagram = bytes(self.buffer[:index])
+        del self.buffer[:index + len(self.delimiter)]
+        # the line separator after the delimiter might only arrive with the next diagram, and a
+        # diagram never starts with a line separator
+        if diagram.startswith(b"\r\n"):
+            diagram = diagram[2:]
+        elif diagram.startswith(b"\n"):
+            diagram = diagram[1:]
+        return diagram
+
+    def stop(self):
+        if self.process is None:
+            return
+        process = self.process
+        self.process = None
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        process.stderr.close()
+
+
+class PlantUMLWorker(object):
+    # renders a diagram source to all requested formats in one pass, using one PlantUML process per format
+    def __init__(self, pool):
+        self.pool = pool
+        self.processes = {}
+
+    def render(self, file_name_txt, output_formats):
+        # the figures are written even if PlantUML reports an error (as error images, like when PlantUML is
+        # started for a figure), but the error is raised afterwards; the source file is read with the encoding
+        # it is written with by the renderers
+        with open(file_name_txt) as file:
+            source = file.read()
+        file_name_base = os.path.splitext(file_name_txt)[0]
+        error = None
+        for output_format in output_formats:
+            process = self.processes.get(output_format)
+            if process is None or process.plant_uml_jar_path != self.pool.plant_uml_jar_path:
+                if process is not None:
+                    process.stop()
+                process = PlantUMLProcess(self.pool.plant_uml_jar_path, output_format)
+                self.processes[output_format] = process
+            diagram, error_description = process.render(source)
+            with open(f"{file_name_base!s}.{output_format!s}", "wb") as file:
+                file.write(diagram)
+            if error_description is not None and error is None:
+                error = error_description
+        if error is not None:
+            raise CException(f"PlantUML error in '{file_name_txt!s}': {error!s}")
+        return source
+
+    def stop(self):
+        for process in self.processes.values():
+            process.stop()
+        self.processes = {}
+
+
+class PlantUMLWorkerPool(object):
+    def __init__(self, plant_uml_jar_path, workers=None):
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if not isinstance(workers, int) or workers < 1:
+            raise CException(f"number of PlantUML workers must be a positive integer, but got: '{workers!s}'")
+        self.plant_uml_jar_path = plant_uml_jar_path
+        self.workers = workers
+        self._executor = None
+        self._idle_workers = queue.LifoQueue()
+        self._all_workers = []
+        self._lock = threading.Lock()
+        self._pending = []
+
+    def submit(self, file_name_txt, output_formats):
+        # renders the diagram source file to image files with the same base name in the background, and returns
+        # a future for the rendering, whose result is the rendered source
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                    thread_name_prefix="PlantUMLWorker")
+            future = self._executor.submit(self._render, file_name_txt, list(output_formats))
+            # keep the failed renderings, so that wait() raises their errors
+            self._pending = [f for f in self._pending if not f.done() or f.exception() is not None]
+            self._pending.append(future)
+        return future
+
+    def _render(self, file_name_txt, output_formats):
+        try:
+            worker = self._idle_workers.get_nowait()
+        except queue.Empty:
+            worker = PlantUMLWorker(self)
+            with self._lock:
+                self._all_workers.append(worker)
+        try:
+            return worker.render(file_name_txt, output_formats)
+        finally:
+            self._idle_workers.put(worker)
+
+    def wait(self):
+        # waits for all submitted renderings, raising the first error that occurred
+        with self._lock:
+            pending = self._pending
+            self._pending = []
+        error = None
+        for future in pending:
+            exception = future.exception()
+            if exception is not None and error is None:
+                error = exception
+        if error is not None:
+            raise error
+
+    def close(self):
+        try:
+            self.wait()
+        finally:
+            with self._lock:
+                executor = self._executor
+                self._executor = None
+                workers = self._all_workers
+                self._all_workers = []
+            if executor is not None:
+                executor.shutdown(wait=True)
+            for worker in workers:
+                worker.stop()
+            self._idle_workers = queue.LifoQueue()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
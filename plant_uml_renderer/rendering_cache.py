@@ -0,0 +1,111 @@
+import hashlib
+import json
+import os
+import threading
+
+# the manifest in each output directory maps the base names of the rendered figures to the cache keys of the
+# sources and settings they were rendered from
+MANIFEST_FILE_NAME = ".plant_uml_manifest.json"
+
+_lock = threading.Lock()
+# manifests by absolute directory, shared by all renderers writing to the directory
+_manifests = {}
+# digests of the PlantUML jar files by absolute path, size, and modification time
+_jar_digests = {}
+
+
+def get_jar_digest(plant_uml_jar_path):
+    # identifies the PlantUML version by the contents of the jar file
+    path = os.path.abspath(plant_uml_jar_path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return "missing"
+    jar_key = (path, stat.st_size, stat.st_mtime_ns)
+    with _lock:
+        digest = _jar_digests.get(jar_key)
+    if digest is None:
+        file_digest = hashlib.sha256()
+        with open(path, "rb") as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                file_digest.update(block)
+        digest = file_digest.hexdigest()
+        with _lock:
+            _jar_digests[jar_key] = digest
+    return digest
+
+
+def create_source_digest(source=""):
+    # the digest of a source can be updated chunk by chunk while the source is rendered
+    return hashlib.sha256(source.encode("utf-8"))
+
+
+def get_cache_key(source_digest, settings):
+    digest = source_digest.copy()
+    for setting in settings:
+        digest.update(b"\0")
+        digest.update(str(setting).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class HashingSink(object):
+    # a sink for rendering contexts, which writes to a file and updates the digest of the written source
+    def __init__(self, file, source_digest):
+        self.file = file
+        self.source_digest = source_digest
+
+    def write(self, text):
+        self.file.write(text)
+        self.source_digest.update(text.encode("utf-8"))
+
+
+def _get_manifest(directory):
+    # must be called with the lock held
+    manifest = _manifests.get(directory)
+    if manifest is None:
+        manifest = {}
+        try:
+            with open(os.path.join(directory, MANIFEST_FILE_NAME)) as file:
+                loaded = json.load(file)
+            if isinstance(loaded, dict):
+                manifest = loaded
+        except (OSError, ValueError):
+            # a missing or broken manifest just means that all figures are rendered
+            pass
+        _manifests[directory] = manifest
+    return manifest
+
+
+def _save_manifest(directory, manifest):
+    # must be called with the lock held
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    file_name = os.path.join(directory, MANIFEST_FILE_NAME)
+    with open(file_name + ".tmp", "w") as file:
+        json.dump(manifest, file, indent=1, sort_keys=True)
+    os.replace(file_name + ".tmp", file_name)
+
+
+def is_up_to_date(directory, file_name_base, cache_key, file_names):
+    with _lock:
+        manifest = _get_manifest(os.path.abspath(directory))
+        if manifest.get(file_name_base) != cache_key:
+            return False
+    return all(os.path.exists(file_name) for file_name in file_names)
+
+
+def record(directory, file_name_base, cache_key):
+    directory = os.path.abspath(directory)
+    with _lock:
+        manifest = _get_manifest(directory)
+        manifest[file_name_base] = cache_key
+        _save_manifest(directory, manifest)
+
+
+def forget(directory, file_name_base):
+    directory = os.path.abspath(directory)
+    with _lock:
+        manifest = _get_manifest(directory)
+        if file_name_base in manifest:
+            del manifest[file_name_base]
+            _save_manifest(directory, manifest)
@@ -33,6 +33,41 @@ class TestBundles:
         except CException as e:
             eq_(e.value, "unknown argument to getElements: 'x'")
 
+    def test_get_elements_by_name_and_type_after_changes(self):
+        c1 = CClass(self.mcl, "C1")
+        b1 = CPackage("C1")
+        c2 = CClass(self.mcl, "C2")
+        b2 = CLayer("B2")
+        self.b1.elements = [c1, b1, c2, b2]
+        eq_(self.b1.get_elements(name="C1"), [c1, b1])
+        eq_(self.b1.get_elements(type=CBundle), [b1, b2])
+        eq_(self.b1.get_elements(type=CClass), [c1, c2])
+        eq_(self.b1.get_elements(name="C1", type=CBundle), [b1])
+        c2.name = "C1"
+        eq_(self.b1.get_elements(name="C1"), [c1, b1, c2])
+        c1.name = "C3"
+        eq_(self.b1.get_elements(name="C1"), [b1, c2])
+        self.b1.remove(b1)
+        eq_(self.b1.get_elements(name="C1"), [c2])
+        eq_(self.b1.get_elements(type=CBundle), [b2])
+        b2.delete()
+        eq_(self.b1.get_elements(type=CBundle), [])
+        eq_(self.b1.get_element(name="C3"), c1)
+        self.b1.elements = [c2]
+        eq_(self.b1.get_elements(name="C3"), [])
+
+    def test_elements_order_after_removal(self):
+        c1 = CClass(self.mcl, "C1")
+        c2 = CClass(self.mcl, "C2")
+        c3 = CClass(self.mcl, "C3")
+        self.b1.elements = [c1, c2, c3]
+        self.b1.remove(c2)
+        eq_(self.b1.elements, [c1, c3])
+        self.b1.add(c2)
+        eq_(self.b1.elements, [c1, c3, c2])
+        c1.delete()
+        eq_(self.b1.elements, [c3, c2])
+
     def test_package_and_layer_subclasses(self):
         layer1 = CLayer("L1")
         layer2 = CLayer("L2", sub_layer=layer1)
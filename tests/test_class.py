@@ -59,6 +59,46 @@ class TestClass:
         eq_(set(c1.get_objects("o1")), {o1, o2, o3})
         eq_(c1.get_object("o1"), o1)
 
+    def test_get_objects_by_name_after_rename(self):
+        c1 = CClass(self.mcl)
+        o1 = CObject(c1, "o1")
+        o2 = CObject(c1, "o2")
+        o3 = CObject(c1, "o1")
+        o2.name = "o1"
+        eq_(c1.get_objects("o1"), [o1, o2, o3])
+        eq_(c1.get_objects("o2"), [])
+        o1.name = None
+        eq_(c1.get_objects("o1"), [o2, o3])
+        eq_(c1.get_objects(None), [o1])
+        o3.delete()
+        eq_(c1.get_objects("o1"), [o2])
+        o2.classifier = CClass(self.mcl)
+        eq_(c1.get_objects("o1"), [])
+        eq_(o2.classifier.get_objects("o1"), [o2])
+        eq_(self.mcl.get_classes(None), [c1, o2.classifier])
+        c1.name = "C1"
+        eq_(self.mcl.get_classes(None), [o2.classifier])
+        eq_(self.mcl.get_class("C1"), c1)
+
+    def test_objects_and_classes_order_after_removal(self):
+        c1 = CClass(self.mcl, "C1")
+        c2 = CClass(self.mcl, "C2")
+        c3 = CClass(self.mcl, "C3")
+        o1 = CObject(c1, "o1")
+        o2 = CObject(c1, "o2")
+        o3 = CObject(c1, "o3")
+        o2.delete()
+        eq_(c1.objects, [o1, o3])
+        o4 = CObject(c1, "o4")
+        eq_(c1.objects, [o1, o3, o4])
+        o1.classifier = c2
+        eq_(c1.objects, [o3, o4])
+        eq_(c2.objects, [o1])
+        c2.delete()
+        eq_(self.mcl.classes, [c1, c3])
+        c4 = CClass(self.mcl, "C4")
+        eq_(self.mcl.classes, [c1, c3, c4])
+
     def test_delete_class(self):
         cl1 = CClass(self.mcl, "CL1")
         cl1.delete()
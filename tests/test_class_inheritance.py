@@ -265,6 +265,38 @@ class TestClassInheritance:
         except CException as e:
             ok_(re.match("^cannot add superclass 'C' to 'S': not of type([_ <a-zA-Z.']+)CStereotype'>$", e.value))
 
+    def test_all_superclasses_and_subclasses_after_hierarchy_changes(self):
+        t = CClass(self.mcl, "T")
+        m1 = CClass(self.mcl, "M1", superclasses=[t])
+        m2 = CClass(self.mcl, "M2")
+        b1 = CClass(self.mcl, "B1", superclasses=[m1])
+        eq_(set(b1.all_superclasses), {m1, t})
+        eq_(set(t.all_subclasses), {m1, b1})
+        eq_(b1.is_classifier_of_type(t), True)
+
+        m1.superclasses = [m2]
+        eq_(set(b1.all_superclasses), {m1, m2})
+        eq_(set(t.all_subclasses), set())
+        eq_(set(m2.all_subclasses), {m1, b1})
+        eq_(b1.is_classifier_of_type(t), False)
+        eq_(b1.is_classifier_of_type(m2), True)
+
+        m1.delete()
+        eq_(set(b1.all_superclasses), set())
+        eq_(set(m2.all_subclasses), set())
+        eq_(m2.has_subclass(b1), False)
+
+    def test_all_superclasses_and_subclasses_return_new_sets(self):
+        t = CClass(self.mcl, "T")
+        b = CClass(self.mcl, "B", superclasses=[t])
+        superclasses = b.all_superclasses
+        superclasses.add(b)
+        subclasses = t.all_subclasses
+        subclasses.update([t])
+        eq_(b.all_superclasses, {t})
+        eq_(t.all_subclasses, {b})
+        ok_(b.all_superclasses is not b.all_superclasses)
+
     def test_class_path_no_inheritance(self):
         t = CClass(self.mcl)
         eq_(set(t.class_path), {t})
@@ -297,6 +329,28 @@ class TestClassInheritance:
         eq_(m2.class_path, [m2, t])
         eq_(t.class_path, [t])
 
+    def test_class_path_after_superclasses_change(self):
+        t = CClass(self.mcl, "T")
+        m1 = CClass(self.mcl, "M1", superclasses=[t])
+        m2 = CClass(self.mcl, "M2")
+        b1 = CClass(self.mcl, "B1", superclasses=[m1])
+        eq_(b1.class_path, [b1, m1, t])
+        m1.superclasses = [m2]
+        eq_(m1.class_path, [m1, m2])
+        eq_(b1.class_path, [b1, m1, m2])
+        m2.superclasses = [t]
+        eq_(b1.class_path, [b1, m1, m2, t])
+        m2.delete()
+        eq_(m1.class_path, [m1])
+        eq_(b1.class_path, [b1, m1])
+
+    def test_class_path_returns_a_copy(self):
+        t = CClass(self.mcl, "T")
+        b1 = CClass(self.mcl, "B1", superclasses=[t])
+        class_path = b1.class_path
+        class_path.append(b1)
+        eq_(b1.class_path, [b1, t])
+
     def test_class_instance_of(self):
         a = CClass(self.mcl)
         b = CClass(self.mcl, superclasses=[a])
@@ -367,7 +421,8 @@ class TestClassInheritance:
             exception_expected_()
         except CException as e:
             eq_("unknown keyword argument 'superclass', should be one of: " +
-                "['stereotype_instances', 'values', 'tagged_values', 'attributes', 'superclasses', 'bundles']",
+                "['stereotype_instances', 'values', 'tagged_values', 'columnar', 'attributes', 'superclasses', " +
+                "'bundles']",
                 e.value)
 
     def test_superclasses_that_are_deleted(self):
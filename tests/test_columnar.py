@@ -0,0 +1,121 @@
+import nose
+from nose.tools import ok_, eq_
+
+from codeable_models import CMetaclass, CClass, CObject, CException
+from tests.testing_commons import exception_expected_
+
+
+class TestColumnar:
+    def setup(self):
+        self.mcl = CMetaclass("MCL")
+        self.super_cl = CClass(self.mcl, "Super", attributes={"label": "item", "tags": list})
+        self.cl = CClass(self.mcl, "Item", superclasses=self.super_cl, columnar=True, attributes={
+            "quantity": int,
+            "price": 1.0,
+            "available": True
+        })
+
+    def test_columnar_values(self):
+        ok_(self.cl.columnar)
+        ok_(not self.super_cl.columnar)
+        o1 = CObject(self.cl, "o1", values={"quantity": 3, "tags": ["a"]})
+        o2 = CObject(self.cl, "o2")
+        eq_(o1.values, {"quantity": 3, "price": 1.0, "available": True, "label": "item", "tags": ["a"]})
+        eq_(o2.values, {"price": 1.0, "available": True, "label": "item"})
+        o2.set_value("available", False)
+        o2.set_value("label", "special", self.super_cl)
+        eq_(o2.get_value("available"), False)
+        eq_(o2.get_value("label"), "special")
+        eq_(o1.get_value("quantity"), 3)
+        eq_(o2.get_value("quantity"), None)
+        eq_(o1.delete_value("quantity"), 3)
+        eq_(o1.get_value("quantity"), None)
+        eq_(o1.values, {"price": 1.0, "available": True, "label": "item", "tags": ["a"]})
+
+    def test_get_column(self):
+        objects = self.cl.create_objects(["o1", "o2", "o3"], columns={"quantity": [1, None, 3]})
+        eq_(self.cl.get_column("quantity"), [1, None, 3])
+        eq_(self.cl.get_column("price"), [1.0, 1.0, 1.0])
+        eq_(self.cl.get_column("available"), [True, True, True])
+        eq_(self.cl.get_column("tags"), [None, None, None])
+        objects[1].set_value("price", 2)
+        objects[2].set_value("tags", ["x"])
+        eq_(self.cl.get_column("price"), [1.0, 2, 1.0])
+        eq_(self.cl.get_column("tags", self.super_cl), [None, None, ["x"]])
+        try:
+            self.cl.get_column("x")
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "attribute 'x' unknown for 'Item'")
+
+    def test_get_column_of_non_columnar_class(self):
+        cl = CClass(self.mcl, "C", superclasses=self.super_cl)
+        CObject(cl, "o1", values={"label": "x"})
+        CObject(cl, "o2")
+        CObject(cl, "o3").delete_value("label")
+        eq_(cl.get_column("label"), ["x", "item", None])
+
+    def test_large_int_values(self):
+        o1 = CObject(self.cl, "o1", values={"quantity": 1})
+        o2 = CObject(self.cl, "o2", values={"quantity": 2 ** 70})
+        eq_(o1.get_value("quantity"), 1)
+        eq_(o2.get_value("quantity"), 2 ** 70)
+        eq_(self.cl.get_column("quantity"), [1, 2 ** 70])
+
+    def test_column_order_after_removal(self):
+        objects = self.cl.create_objects([f"o{i!s}" for i in range(10)], columns={"quantity": range(10)})
+        for i in [0, 3, 4, 5, 6, 9]:
+            objects[i].delete()
+        eq_(self.cl.objects, [objects[1], objects[2], objects[7], objects[8]])
+        eq_(self.cl.get_column("quantity"), [1, 2, 7, 8])
+        new_object = CObject(self.cl, "new", values={"quantity": 10})
+        objects[1].delete()
+        eq_(self.cl.get_column("quantity"), [2, 7, 8, 10])
+        eq_(new_object.get_value("quantity"), 10)
+        eq_(objects[8].get_value("quantity"), 8)
+
+    def test_change_classifier_of_columnar_object(self):
+        cl = CClass(self.mcl, "C", superclasses=self.super_cl)
+        o1 = CObject(self.cl, "o1", values={"quantity": 3, "label": "x"})
+        o2 = CObject(self.cl, "o2", values={"quantity": 4})
+        o1.classifier = cl
+        eq_(o1.values, {"label": "x"})
+        eq_(self.cl.get_column("quantity"), [4])
+        o1.classifier = self.cl
+        eq_(o1.values, {"quantity": 3, "label": "x", "price": 1.0, "available": True})
+        eq_(self.cl.get_column("quantity"), [4, 3])
+        eq_(o2.get_value("quantity"), 4)
+
+    def test_change_storage_mode(self):
+        o1 = CObject(self.cl, "o1", values={"quantity": 3})
+        o2 = CObject(self.cl, "o2", values={"label": "x"})
+        self.cl.columnar = False
+        ok_(not self.cl.columnar)
+        eq_(o1.values, {"quantity": 3, "price": 1.0, "available": True, "label": "item"})
+        eq_(o2.values, {"price": 1.0, "available": True, "label": "x"})
+        o1.set_value("quantity", 4)
+        self.cl.columnar = True
+        eq_(o1.get_value("quantity"), 4)
+        eq_(self.cl.get_column("label"), ["item", "x"])
+        try:
+            self.cl.columnar = 1
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "columnar must be a bool, but is '1'")
+
+    def test_removed_attribute_of_columnar_class(self):
+        o1 = CObject(self.cl, "o1", values={"quantity": 3})
+        self.cl.attributes = {"price": 2.0}
+        eq_(o1.values, {"price": 1.0, "label": "item"})
+        CObject(self.cl, "o2")
+        eq_(self.cl.get_column("price"), [1.0, 2.0])
+
+    def test_delete_columnar_class(self):
+        o1 = CObject(self.cl, "o1", values={"quantity": 3})
+        self.cl.delete()
+        ok_(o1.is_deleted)
+        eq_(self.cl.objects, [])
+
+
+if __name__ == "__main__":
+    nose.main()
@@ -0,0 +1,130 @@
+import nose
+from nose.tools import ok_, eq_
+
+from codeable_models import CMetaclass, CClass, CObject, CException, CEnum
+from tests.testing_commons import exception_expected_
+
+
+class TestCreateObjects:
+    def setup(self):
+        self.mcl = CMetaclass("MCL")
+        self.super_cl = CClass(self.mcl, "Super", attributes={"label": "item", "tags": list})
+        self.cl = CClass(self.mcl, "Item", superclasses=self.super_cl, attributes={
+            "quantity": int,
+            "price": 1.0,
+            "available": True
+        })
+
+    def test_create_objects_with_names(self):
+        objects = self.cl.create_objects(["i1", "i2", None])
+        eq_(len(objects), 3)
+        eq_([o.name for o in objects], ["i1", "i2", None])
+        eq_(self.cl.objects, objects)
+        eq_(self.cl.get_objects("i2"), [objects[1]])
+        for o in objects:
+            eq_(o.classifier, self.cl)
+            eq_(o.values, {"price": 1.0, "available": True, "label": "item"})
+        o = CObject(self.cl, "i4")
+        eq_(self.cl.objects, objects + [o])
+
+    def test_create_objects_with_value_rows(self):
+        objects = self.cl.create_objects(["i1", "i2", "i3"], [
+            {"quantity": 1, "price": 2},
+            None,
+            {"label": "special", "tags": ["a", "b"], "available": False}])
+        eq_(objects[0].values, {"quantity": 1, "price": 2, "available": True, "label": "item"})
+        eq_(objects[1].values, {"price": 1.0, "available": True, "label": "item"})
+        eq_(objects[2].values, {"price": 1.0, "available": False, "label": "special", "tags": ["a", "b"]})
+        eq_(objects[2].get_value("label", self.super_cl), "special")
+
+    def test_create_objects_with_columns(self):
+        objects = self.cl.create_objects(columns={"quantity": [1, 2, None], "label": ("x", None, "z")})
+        eq_([o.name for o in objects], [None, None, None])
+        eq_([o.get_value("quantity") for o in objects], [1, 2, None])
+        eq_([o.get_value("label") for o in objects], ["x", "item", "z"])
+
+    def test_create_objects_with_rows_and_columns(self):
+        objects = self.cl.create_objects(("i%d" % i for i in range(2)), values=[{"quantity": 1}, {}],
+                                         columns={"quantity": [None, 3], "price": [5.0, 6.0]})
+        eq_([o.name for o in objects], ["i0", "i1"])
+        eq_(objects[0].values, {"quantity": 1, "price": 5.0, "available": True, "label": "item"})
+        eq_(objects[1].values, {"quantity": 3, "price": 6.0, "available": True, "label": "item"})
+
+    def test_create_objects_with_object_and_enum_values(self):
+        enum_type = CEnum("Color", values=["red", "green"])
+        part = CObject(self.cl, "part")
+        cl = CClass(self.mcl, "C", attributes={"color": enum_type, "part": self.super_cl})
+        objects = cl.create_objects(["o1", "o2"], columns={"color": ["red", "green"], "part": [part, None]})
+        eq_(objects[0].values, {"color": "red", "part": part})
+        eq_(objects[1].values, {"color": "green"})
+
+    def test_create_no_objects(self):
+        eq_(self.cl.create_objects(), [])
+        eq_(self.cl.create_objects([]), [])
+        eq_(self.cl.objects, [])
+
+    def test_create_objects_length_mismatch(self):
+        try:
+            self.cl.create_objects(["i1", "i2"], [{"quantity": 1}])
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "number of names and values to create objects of class 'Item' does not match")
+        try:
+            self.cl.create_objects(columns={"quantity": [1], "price": [1.0, 2.0]})
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "number of names and values to create objects of class 'Item' does not match")
+        eq_(self.cl.objects, [])
+
+    def test_create_objects_wrong_values(self):
+        try:
+            self.cl.create_objects(["i1", "i2"], [{"quantity": 1}, {"quantity": "1"}])
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "value type for attribute 'quantity' does not match attribute type")
+        try:
+            self.cl.create_objects(["i1"], [{"quantity": True}])
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "value type for attribute 'quantity' does not match attribute type")
+        try:
+            self.cl.create_objects(columns={"x": [1]})
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "attribute 'x' unknown for 'Item'")
+        try:
+            self.cl.create_objects(["i1"], ["quantity"])
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "malformed attribute values description: 'quantity'")
+        try:
+            self.cl.create_objects(["i1", 1])
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "is not a name string: '1'")
+        try:
+            self.cl.create_objects(columns=[1])
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "malformed attribute columns description: '[1]'")
+        eq_(self.cl.objects, [])
+
+    def test_create_objects_on_deleted_class(self):
+        self.cl.delete()
+        try:
+            self.cl.create_objects(["i1"])
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "cannot access named element that has been deleted")
+
+    def test_delete_created_objects(self):
+        objects = self.cl.create_objects(["i1", "i2", "i3"])
+        objects[1].delete()
+        eq_(self.cl.objects, [objects[0], objects[2]])
+        eq_(self.cl.get_objects("i2"), [])
+        self.cl.delete()
+        ok_(objects[0].is_deleted)
+
+
+if __name__ == "__main__":
+    nose.main()
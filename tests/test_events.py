@@ -0,0 +1,133 @@
+import nose
+from nose.tools import ok_, eq_
+
+from codeable_models import CMetaclass, CClass, CObject, CException, CStereotype, CBundle, add_links, \
+    delete_links, model_transaction, subscribe, unsubscribe, batched_events, CValueChanged, CLinkAdded, \
+    CLinkDeleted, CStereotypesChanged, CBundleElementAdded, CBundleElementRemoved, CSuperclassesChanged
+from tests.testing_commons import exception_expected_
+
+
+class TestEvents:
+    def setup(self):
+        self.mcl = CMetaclass("MCL", attributes={"version": int})
+        self.cart = CClass(self.mcl, "Cart", attributes={"size": int})
+        self.item = CClass(self.mcl, "Item")
+        self.a = self.cart.association(self.item, "contains: 1 -> *")
+        self.c1 = CObject(self.cart, "c1")
+        self.i1 = CObject(self.item, "i1")
+        self.i2 = CObject(self.item, "i2")
+        self.deliveries = []
+        subscribe(self.deliveries.append)
+
+    def teardown(self):
+        unsubscribe(self.deliveries.append)
+
+    def events(self):
+        return [event for events in self.deliveries for event in events]
+
+    def test_value_events(self):
+        self.c1.set_value("size", 1)
+        self.c1.set_value("size", 2)
+        self.c1.delete_value("size")
+        self.cart.set_value("version", 3)
+        events = self.events()
+        eq_(len(self.deliveries), 4)
+        eq_([(e.__class__, e.element, e.kind, e.name, e.classifier, e.old_value, e.new_value) for e in events], [
+            (CValueChanged, self.c1, "value", "size", self.cart, None, 1),
+            (CValueChanged, self.c1, "value", "size", self.cart, 1, 2),
+            (CValueChanged, self.c1, "value", "size", self.cart, 2, None),
+            (CValueChanged, self.cart, "value", "version", self.mcl, None, 3)])
+
+    def test_tagged_and_default_value_events(self):
+        s = CStereotype("S", extended=self.mcl, attributes={"tag": str, "version": int})
+        self.cart.stereotype_instances = s
+        self.cart.set_tagged_value("tag", "a")
+        s.set_default_value("version", 1)
+        events = self.events()
+        eq_(events[0].__class__, CStereotypesChanged)
+        eq_((events[0].element, events[0].old_stereotypes, events[0].new_stereotypes), (self.cart, [], [s]))
+        eq_([(e.element, e.kind, e.name, e.classifier, e.new_value) for e in events[1:]],
+            [(self.cart, "tagged value", "tag", s, "a"), (s, "default value", "version", self.mcl, 1)])
+
+    def test_link_events(self):
+        links = add_links({self.c1: [self.i1, self.i2]})
+        links[0].delete()
+        events = self.events()
+        eq_([e.__class__ for e in events], [CLinkAdded, CLinkAdded, CLinkDeleted])
+        eq_([e.element for e in events], [links[0], links[1], links[0]])
+
+    def test_bundle_and_superclass_events(self):
+        b = CBundle("B")
+        b.add(self.c1)
+        self.i1.bundles = b
+        b.remove(self.c1)
+        sub = CClass(self.mcl, "Sub")
+        sub.superclasses = self.cart
+        events = self.events()
+        eq_([(e.__class__, e.element) for e in events[:3]], [
+            (CBundleElementAdded, self.c1), (CBundleElementAdded, self.i1), (CBundleElementRemoved, self.c1)])
+        ok_(all(e.bundle is b for e in events[:3]))
+        eq_((events[3].__class__, events[3].element, events[3].old_superclasses, events[3].new_superclasses),
+            (CSuperclassesChanged, sub, [], [self.cart]))
+
+    def test_event_type_filter(self):
+        link_events = []
+        subscribe(link_events.append, [CLinkAdded, CLinkDeleted])
+        try:
+            self.c1.set_value("size", 1)
+            with batched_events():
+                link = add_links({self.c1: self.i1})[0]
+                self.c1.set_value("size", 2)
+        finally:
+            unsubscribe(link_events.append)
+        eq_(len(link_events), 1)
+        eq_([e.element for e in link_events[0]], [link])
+        eq_(len(self.deliveries), 2)
+        eq_([e.__class__ for e in self.deliveries[1]], [CLinkAdded, CValueChanged])
+
+    def test_nested_batches(self):
+        with batched_events():
+            self.c1.set_value("size", 1)
+            with batched_events():
+                self.c1.set_value("size", 2)
+            eq_(self.deliveries, [])
+        eq_(len(self.deliveries), 1)
+        eq_([e.new_value for e in self.deliveries[0]], [1, 2])
+
+    def test_transaction_events(self):
+        with model_transaction():
+            add_links({self.c1: self.i1})
+            self.c1.set_value("size", 1)
+            eq_(self.deliveries, [])
+        eq_(len(self.deliveries), 1)
+        eq_([e.__class__ for e in self.deliveries[0]], [CLinkAdded, CValueChanged])
+        try:
+            with model_transaction():
+                delete_links({self.c1: self.i1})
+                self.c1.set_value("size", 2)
+                raise CException("abort")
+        except CException:
+            pass
+        eq_(len(self.deliveries), 1)
+        eq_(self.c1.get_value("size"), 1)
+
+    def test_subscription_errors(self):
+        try:
+            subscribe("x")
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "event subscriber 'x' is not callable")
+        try:
+            subscribe(print, CClass)
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, f"'{CClass!s}' is not an event class")
+        try:
+            unsubscribe(print)
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, f"'{print!s}' is not subscribed")
+
+
+if __name__ == "__main__":
+    nose.main()
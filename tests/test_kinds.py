@@ -0,0 +1,45 @@
+import nose
+from nose.tools import eq_
+
+from codeable_models import CMetaclass, CClass, CObject, CStereotype, CBundle, CPackage, CEnum, CAttribute, \
+    CNamedElement, CBundlable, CClassifier, CAssociation, CLink, add_links
+from codeable_models.internal.commons import is_cnamedelement, is_cbundlable, is_cbundle, is_cenum, \
+    is_cclassifier, is_cmetaclass, is_cstereotype, is_cclass, is_cassociation, is_cobject, is_clink, is_cattribute, \
+    get_attribute_type
+
+KIND_CHECKS = [(is_cnamedelement, CNamedElement), (is_cbundlable, CBundlable), (is_cbundle, CBundle),
+               (is_cenum, CEnum), (is_cclassifier, CClassifier), (is_cmetaclass, CMetaclass),
+               (is_cstereotype, CStereotype), (is_cclass, CClass), (is_cassociation, CAssociation),
+               (is_cobject, CObject), (is_clink, CLink), (is_cattribute, CAttribute)]
+
+
+class SpecialClass(CClass):
+    pass
+
+
+class TestKinds:
+    def setup(self):
+        self.mcl = CMetaclass("MCL")
+        self.cl = CClass(self.mcl, "C")
+        self.obj = CObject(self.cl, "o")
+
+    def test_kind_checks_match_isinstance(self):
+        association = self.cl.association(self.cl, "a: * -> *")
+        link = add_links({self.obj: CObject(self.cl)}, association=association)[0]
+        elements = [self.mcl, self.cl, self.obj, link, association, self.cl.class_object_, CStereotype("S"),
+                    CBundle("B"), CPackage("P"), CEnum("E"), CAttribute(type=int), SpecialClass(self.mcl, "SC"),
+                    None, 1, "x", [self.cl], CClass, CObject]
+        for element in elements:
+            for check, element_class in KIND_CHECKS:
+                eq_(check(element), isinstance(element, element_class), f"{check.__name__!s}({element!r})")
+
+    def test_attribute_types(self):
+        class Name(str):
+            pass
+
+        eq_([get_attribute_type(v) for v in ["x", Name("x"), True, 1, 1.5, [], self.obj, self.cl, None, {}]],
+            [str, str, bool, int, float, list, self.cl, self.mcl, None, None])
+
+
+if __name__ == "__main__":
+    nose.main()
@@ -0,0 +1,117 @@
+import os
+import tempfile
+
+import nose
+from nose.tools import ok_, eq_
+
+from codeable_models import CMetaclass, CClass, CObject, CException, CStereotype, add_links, \
+    save_mapped_snapshot, open_mapped_snapshot
+from tests.testing_commons import exception_expected_
+
+
+class TestMappedSnapshots:
+    def setup(self):
+        file_descriptor, self.file_name = tempfile.mkstemp(suffix=".cmmap")
+        os.close(file_descriptor)
+        self.mcl = CMetaclass("MCL", attributes={"version": 1})
+        self.item = CClass(self.mcl, "Item", attributes={"price": 1.5})
+        self.cart = CClass(self.mcl, "Cart", attributes={"tags": list, "first": self.item}, values={"version": 3})
+        self.special_item = CClass(self.mcl, "SpecialItem", superclasses=self.item)
+        self.link_stereotype = CStereotype("LS", attributes={"weight": int})
+        self.contains = self.cart.association(self.item, "contains: [cart] 1 -> [items] *")
+        self.link_stereotype.extended = self.contains
+        self.next = self.item.association(self.item, "next: [previous] * -> [next] *")
+        self.i1 = CObject(self.item, "i1", values={"price": 2.0})
+        self.s1 = CObject(self.special_item, "s1")
+        self.s2 = CObject(self.special_item, "s1")
+        self.c1 = CObject(self.cart, "c1", values={"tags": ["a", 1], "first": self.s1})
+        self.c2 = CObject(self.cart, "c2")
+        links = add_links({self.c1: [self.s1, self.i1]}, stereotype_instances=self.link_stereotype)
+        links[0].label = "l1"
+        links[1].set_tagged_value("weight", 2)
+        add_links({self.c2: self.s2})
+        add_links({self.i1: [self.s1, self.i1]}, role_name="next")
+
+    def teardown(self):
+        os.remove(self.file_name)
+
+    def test_classes(self):
+        save_mapped_snapshot(self.file_name, [self.cart, self.special_item])
+        with open_mapped_snapshot(self.file_name) as snapshot:
+            eq_([cl.name for cl in snapshot.classes], ["Cart", "Item", "SpecialItem"])
+            cart, item, special_item = snapshot.classes
+            eq_(snapshot.get_class("Item"), item)
+            eq_(snapshot.get_class("X"), None)
+            eq_(special_item.superclasses, [item])
+            eq_(item.all_subclasses, [special_item])
+            eq_(cart.metaclass_name, "MCL")
+            eq_(cart.attribute_names, ["tags", "first"])
+            eq_(cart.values, {"version": 3})
+            eq_([(a.name, a.source, a.target) for a in snapshot.associations],
+                [("contains", cart, item), ("next", item, item)])
+            eq_((snapshot.number_of_objects, snapshot.number_of_links), (5, 5))
+
+    def test_objects(self):
+        save_mapped_snapshot(self.file_name, [self.cart, self.special_item])
+        with open_mapped_snapshot(self.file_name) as snapshot:
+            cart, item, special_item = snapshot.classes
+            eq_(len(cart.objects), 2)
+            eq_([o.name for o in special_item.objects], ["s1", "s1"])
+            eq_([o.name for o in item.all_objects], ["i1", "s1", "s1"])
+            c1 = cart.get_object("c1")
+            ok_(c1 is cart.objects[0])
+            eq_(c1.classifier, cart)
+            s1, s2 = snapshot.get_objects("s1")
+            eq_(s1.values, {"price": 1.5})
+            ok_(s1.instance_of(item))
+            ok_(not c1.instance_of(item))
+            eq_(c1.values, {"tags": ["a", 1], "first": s1})
+            eq_(c1.get_value("first"), s1)
+            eq_(cart.get_object("s1"), None)
+            eq_(snapshot.get_objects("x"), [])
+            try:
+                c1.get_value("price")
+                exception_expected_()
+            except CException as e:
+                eq_(e.value, "attribute 'price' unknown for 'c1'")
+
+    def test_links(self):
+        save_mapped_snapshot(self.file_name, [self.cart, self.special_item])
+        with open_mapped_snapshot(self.file_name) as snapshot:
+            contains, next_association = snapshot.associations
+            c1 = snapshot.get_objects("c1")[0]
+            i1 = snapshot.get_objects("i1")[0]
+            s1, s2 = snapshot.get_objects("s1")
+            eq_(c1.linked, [s1, i1])
+            eq_([link.label for link in c1.links], ["l1", None])
+            eq_(c1.links[1].tagged_values, {"weight": 2})
+            eq_(c1.links[1].stereotype_instance_names, ["LS"])
+            eq_(snapshot.get_objects("c2")[0].linked, [s2])
+            eq_(i1.linked, [c1, s1, i1])
+            eq_(i1.get_linked(role_name="next"), [s1, i1])
+            eq_(i1.get_linked(role_name="previous"), [i1])
+            eq_(i1.get_linked(association=contains), [c1])
+            eq_(s1.get_linked(role_name="cart"), [c1])
+
+    def test_save_and_open_errors(self):
+        try:
+            save_mapped_snapshot(self.file_name, self.cart)
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "cannot save reference to 's1': element is not saved in the snapshot")
+        try:
+            save_mapped_snapshot(self.file_name, "x")
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "classes requires a list or a class as input")
+        with open(self.file_name, "wb") as file:
+            file.write(b"not a snapshot")
+        try:
+            open_mapped_snapshot(self.file_name)
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, f"'{self.file_name!s}' is not a mapped model snapshot")
+
+
+if __name__ == "__main__":
+    nose.main()
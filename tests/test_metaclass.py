@@ -82,6 +82,20 @@ class TestMetaclass:
         eq_(set(m1.get_stereotypes("S1")), {s1, s2, s3})
         eq_(m1.get_stereotype("S1"), s1)
 
+    def test_get_stereotypes_by_name_after_rename(self):
+        m1 = CMetaclass()
+        s1 = CStereotype("S1", extended=m1)
+        s2 = CStereotype("S2", extended=m1)
+        s2.name = "S1"
+        eq_(m1.get_stereotypes("S1"), [s1, s2])
+        s1.name = "S3"
+        eq_(m1.get_stereotypes("S1"), [s2])
+        eq_(m1.get_stereotype("S3"), s1)
+        s1.extended = []
+        eq_(m1.get_stereotypes("S3"), [])
+        m1.stereotypes = [s1, s2]
+        eq_(m1.get_stereotypes("S3"), [s1])
+
     def test_stereotypes_that_are_deleted(self):
         s1 = CStereotype("S1")
         s1.delete()
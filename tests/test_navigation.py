@@ -0,0 +1,97 @@
+import nose
+from nose.tools import ok_, eq_
+
+from codeable_models import CMetaclass, CClass, CObject, CException, CStereotype, add_links, CPath, compile_path, \
+    navigate
+from tests.testing_commons import exception_expected_
+
+
+class TestNavigation:
+    def setup(self):
+        self.mcl = CMetaclass("MCL")
+        self.stereotype = CStereotype("Infrastructure", extended=self.mcl)
+        self.server_stereotype = CStereotype("Server", superclasses=self.stereotype)
+        self.component = CClass(self.mcl, "Component", attributes={"version": 1})
+        self.node = CClass(self.mcl, "Node", attributes={"cores": 1})
+        self.device = CClass(self.mcl, "Device", superclasses=self.node, stereotype_instances=self.server_stereotype)
+        self.connected = self.component.association(self.component, "connected to: [client] * -> [server] *")
+        self.protocol = CStereotype("Protocol", extended=self.connected)
+        self.http = CStereotype("HTTP", superclasses=self.protocol)
+        self.deployed = self.component.association(self.node, "deployed: [component] * -> [deployed_on] *")
+        self.c1, self.c2, self.c3 = [CObject(self.component, name) for name in ["c1", "c2", "c3"]]
+        self.n1 = CObject(self.node, "n1", values={"cores": 2})
+        self.d1 = CObject(self.device, "d1", values={"cores": 8})
+        self.d2 = CObject(self.device, "d2", values={"cores": 4})
+        add_links({self.c1: self.c2}, association=self.connected, stereotype_instances=self.http)
+        add_links({self.c1: self.c3}, association=self.connected)
+        add_links({self.c2: [self.n1, self.d1], self.c3: [self.d1, self.d2]}, association=self.deployed)
+
+    def test_role_and_association_steps(self):
+        eq_(navigate(self.c1, "server"), [self.c2, self.c3])
+        eq_(navigate(self.c2, "client"), [self.c1])
+        eq_(navigate(self.c2, "server"), [])
+        eq_(navigate(self.c2, "@'connected to'"), [self.c1])
+        eq_(navigate(self.c2, "*"), [self.c1, self.n1, self.d1])
+        # d1 is reached twice, but contained once
+        eq_(navigate(self.c1, "server/deployed_on"), [self.n1, self.d1, self.d2])
+        eq_(navigate([self.n1, self.d2], "component/client"), [self.c1])
+        eq_(navigate(self.c1, "server/deployed_on/component"), [self.c2, self.c3])
+
+    def test_predicates(self):
+        eq_(navigate(self.c1, "server<<Protocol>>/deployed_on"), [self.n1, self.d1])
+        eq_(navigate(self.c1, "server<<HTTP>>"), [self.c2])
+        eq_(navigate(self.c1, "server/deployed_on[:Device]"), [self.d1, self.d2])
+        eq_(navigate(self.c1, "server/deployed_on[<<Infrastructure>>]"), [self.d1, self.d2])
+        eq_(navigate(self.c1, "server/deployed_on[cores >= 4][cores != 8]"), [self.d2])
+        eq_(navigate(self.c1, "server/deployed_on[cores = 2]"), [self.n1])
+        eq_(navigate(self.c1, "server/deployed_on[cores = '2']"), [])
+        eq_(navigate(self.c1, "server[version = 1]/deployed_on[:Device][cores > 7.5]"), [self.d1])
+        eq_(navigate(self.c1, "server[missing = none]"), [])
+
+    def test_compiled_paths(self):
+        path = compile_path("server/deployed_on[:Device]")
+        ok_(isinstance(path, CPath))
+        ok_(compile_path("server/deployed_on[:Device]") is path)
+        eq_(str(path), "server/deployed_on[:Device]")
+        eq_(path.evaluate(self.c1), [self.d1, self.d2])
+        eq_(path.evaluate([self.c2]), [])
+        results = path.iterate(self.c1)
+        eq_(next(results), self.d1)
+        eq_(list(results), [self.d2])
+
+    def test_class_links(self):
+        a = self.mcl.association(self.mcl, "uses: [user] * -> [used] *")
+        add_links({self.component: [self.node, self.device]}, association=a)
+        eq_(navigate(self.component, "used"), [self.node, self.device])
+        eq_(navigate(self.device, "user/used[:MCL]"), [self.node, self.device])
+
+    def test_errors(self):
+        for expression, message in [("server/", "expected a name"),
+                                    ("server[cores ~ 2]", "unexpected character at position 13"),
+                                    ("server[cores 2]", "expected a comparison operator"),
+                                    ("server[cores = x]", "expected a string, a number, true, false, or none"),
+                                    ("server<<HTTP", "expected '>>'"), ("server server", "unexpected 'server'")]:
+            try:
+                CPath(expression)
+                exception_expected_()
+            except CException as e:
+                eq_(e.value, f"invalid path expression '{expression!s}': {message!s}")
+        try:
+            navigate(self.mcl, "server")
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "'MCL' is not an object, class, or link")
+        try:
+            navigate(self.c1, 1)
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "path expression '1' is not a string")
+        try:
+            compile_path(["server"])
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "path expression '['server']' is not a string")
+
+
+if __name__ == "__main__":
+    nose.main()
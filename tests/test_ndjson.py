@@ -0,0 +1,140 @@
+import json
+
+import nose
+from nose.tools import eq_
+
+from codeable_models import CMetaclass, CClass, CObject, CException, CStereotype, CEnum, add_links, \
+    export_ndjson, import_ndjson
+from tests.testing_commons import exception_expected_
+
+
+class TestNDJSON:
+    def setup(self):
+        self.mcl = CMetaclass("MCL", attributes={"version": 1})
+        self.stereotype = CStereotype("S", extended=self.mcl, attributes={"tag": str})
+        self.colors = CEnum("Colors", values=["red", "blue"])
+        self.item = CClass(self.mcl, "Item", attributes={"price": 1.5})
+        self.cart = CClass(self.mcl, "Cart", attributes={"color": self.colors, "tags": list, "first": self.item},
+                           stereotype_instances=self.stereotype, values={"version": 3}, tagged_values={"tag": "t"})
+        self.special_item = CClass(self.mcl, "SpecialItem", superclasses=self.item)
+        self.link_stereotype = CStereotype("LS", attributes={"weight": int})
+        self.association = self.cart.association(self.item, "contains: [cart] 1 -> [items] *")
+        self.link_stereotype.extended = self.association
+        self.i1 = CObject(self.item, "i1", values={"price": 2.0})
+        self.s1 = CObject(self.special_item, "s1")
+        self.c1 = CObject(self.cart, "c1", values={"color": "red", "tags": ["a", 1], "first": self.s1})
+        self.links = add_links({self.c1: [self.s1, self.i1]}, stereotype_instances=self.link_stereotype)
+        self.links[0].label = "l1"
+        self.links[1].set_tagged_value("weight", 2)
+
+    def import_classes(self, lines):
+        return import_ndjson(lines, [self.mcl], [self.stereotype, self.link_stereotype])
+
+    def test_export_records(self):
+        records = [json.loads(line) for line in export_ndjson([self.cart, self.special_item])]
+        eq_([(r["type"], r.get("name")) for r in records], [
+            ("enum", "Colors"), ("class", "Cart"), ("class", "Item"), ("class", "SpecialItem"),
+            ("association", "contains"), ("object", "c1"), ("object", "i1"), ("object", "s1"),
+            ("link", None), ("link", None)])
+        eq_(len({r["id"] for r in records}), len(records))
+        ids = {r.get("name"): r["id"] for r in records}
+        eq_(records[1]["attributes"]["first"], {"type": {"$ref": ids["Item"]}, "default": None})
+        eq_(records[5]["values"], {"color": "red", "tags": ["a", 1], "first": {"$ref": ids["s1"]}})
+        eq_(records[8], {"type": "link", "id": records[8]["id"], "association": ids["contains"],
+                         "source": ids["c1"], "target": ids["s1"], "source_role_name": "cart",
+                         "role_name": "items", "label": "l1", "stereotype_instances": ["LS"]})
+        eq_(records[9]["tagged_values"], {"weight": 2})
+
+    def test_round_trip(self):
+        cart, item, special_item = self.import_classes(export_ndjson([self.cart, self.special_item]))
+        eq_([cl.name for cl in [cart, item, special_item]], ["Cart", "Item", "SpecialItem"])
+        eq_(special_item.superclasses, [item])
+        eq_(cart.stereotype_instances, [self.stereotype])
+        eq_(cart.values, {"version": 3})
+        eq_(cart.tagged_values, {"tag": "t"})
+        eq_(cart.get_attribute("color").type.values, ["red", "blue"])
+        eq_(cart.get_attribute("first").type, item)
+        c1, = cart.objects
+        s1, = special_item.objects
+        eq_(c1.values, {"color": "red", "tags": ["a", 1], "first": s1})
+        eq_(item.objects[0].get_value("price"), 2.0)
+        eq_([o.name for o in c1.linked], ["s1", "i1"])
+        association = c1.links[0].association
+        eq_((association.name, association.role_name, association.source_role_name), ("contains", "items", "cart"))
+        eq_(association.stereotypes, [self.link_stereotype])
+        eq_([link.label for link in c1.links], ["l1", None])
+        eq_(c1.links[1].stereotype_instances, [self.link_stereotype])
+        eq_(c1.links[1].get_tagged_value("weight"), 2)
+
+    def test_forward_references(self):
+        lines = list(export_ndjson([self.cart, self.special_item]))
+        # links before objects before classes
+        special_item, item, cart = self.import_classes(reversed(lines))
+        eq_(cart.superclasses, [])
+        c1, = cart.objects
+        eq_([o.name for o in c1.linked], ["i1", "s1"])
+        eq_(c1.get_value("first").name, "s1")
+        eq_(c1.get_value("first").classifier, special_item)
+        eq_(special_item.superclasses, [item])
+
+    def test_export_errors(self):
+        try:
+            list(export_ndjson(self.cart))
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "cannot export reference to 'Item': element is not exported")
+        try:
+            list(export_ndjson("x"))
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "classes requires a list or a class as input")
+
+    def test_import_errors(self):
+        try:
+            self.import_classes(['{"type": "object", "id": 1, "class": 2}'])
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "unresolved reference to element '2'")
+        try:
+            self.import_classes(['{"type": "package", "id": 1}'])
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "unknown record type 'package'")
+        try:
+            self.import_classes(['{"type": "class", "id": 1, "name": "A", "metaclass": "X"}'])
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "unknown metaclass 'X'")
+        lines = list(export_ndjson([self.cart, self.special_item]))
+        object_line = next(line for line in lines if json.loads(line)["type"] == "object")
+        try:
+            self.import_classes(lines + [object_line])
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, f"duplicate element id '{json.loads(object_line)['id']!s}'")
+
+    def test_failed_import_deletes_created_elements(self):
+        lines = list(export_ndjson([self.cart, self.special_item]))
+        classes = self.mcl.classes
+        # a second link from another cart to s1 violates the multiplicity '1' of the carts, which is only
+        # checked when all records are imported
+        records = [json.loads(line) for line in lines]
+        link = next(record for record in records if record["type"] == "link")
+        cart = next(record for record in records if record["type"] == "object" and record["name"] == "c1")
+        records.append(dict(cart, id=1000, name="c2"))
+        records.append(dict(link, id=1001, source=1000))
+        try:
+            self.import_classes([json.dumps(record) for record in records])
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "links of object 's1' have wrong multiplicity '2': should be '1'")
+        eq_(self.mcl.classes, classes)
+        eq_(self.stereotype.extended_instances, [self.cart])
+        eq_(self.link_stereotype.extended, [self.association])
+        eq_(self.link_stereotype.extended_instances, self.links)
+        eq_(self.i1.links, [self.links[1]])
+        eq_(self.c1.get_value("first"), self.s1)
+
+
+if __name__ == "__main__":
+    nose.main()
@@ -219,6 +219,43 @@ class TestObject:
         for elt in test_elements:
             eq_(set(elt.get_connected_elements(**kwargs_dict)), connected_elements_result)
 
+    def test_get_connected_elements_order(self):
+        cl2 = CClass(self.mcl, "C2")
+        self.cl.association(cl2, "* -> *")
+        o1 = CObject(self.cl, "o1")
+        o2 = CObject(cl2, "o2")
+        o3 = CObject(cl2, "o3")
+        o4 = CObject(self.cl, "o4")
+        add_links({o1: [o2, o3], o4: o2})
+        eq_(o1.get_connected_elements(), [o1, o2, o4, o3])
+        eq_(o1.get_connected_elements(stop_elements_inclusive=o2), [o1, o2, o3])
+        eq_(o1.get_connected_elements(stop_elements_exclusive=o2), [o1, o3])
+        eq_(o2.get_connected_elements(stop_elements_exclusive=o2), [])
+
+    def test_iter_connected_elements(self):
+        cl2 = CClass(self.mcl, "C2")
+        self.cl.association(cl2, "* -> *")
+        o1 = CObject(self.cl, "o1")
+        o2 = CObject(cl2, "o2")
+        o3 = CObject(cl2, "o3")
+        add_links({o1: [o2, o3]})
+        elements = o1.iter_connected_elements()
+        eq_(next(elements), o1)
+        eq_(list(elements), [o2, o3])
+        try:
+            o1.iter_connected_elements(a="o1")
+            exception_expected_()
+        except CException as e:
+            ok_(e.value.startswith("unknown keyword argument 'a'"))
+
+    def test_get_connected_elements_long_chain(self):
+        association = self.cl.association(self.cl, "* -> *")
+        objects = [CObject(self.cl, f"o{i!s}") for i in range(5000)]
+        for source, target in zip(objects, objects[1:]):
+            add_links({source: target}, association=association)
+        eq_(objects[0].get_connected_elements(), objects)
+        eq_(objects[-1].get_connected_elements(), list(reversed(objects)))
+
     def test_get_connected_elements_stop_elements_inclusive_wrong_types(self):
         o1 = CObject(self.cl, "o1")
         try:
@@ -10,6 +10,33 @@ class TestObjectAttributeValues:
         self.mcl = CMetaclass("MCL")
         self.cl = CClass(self.mcl, "CL")
 
+    def test_attribute_resolution_after_attribute_and_superclass_changes(self):
+        super_cl = CClass(self.mcl, "Super", attributes={"x": 1})
+        cl = CClass(self.mcl, "C", superclasses=super_cl)
+        o = CObject(cl, "o")
+        eq_(o.get_value("x"), 1)
+        cl.attributes = {"x": "a"}
+        eq_(o.get_value("x"), "a")
+        eq_(o.get_value("x", super_cl), 1)
+        cl.attributes = {}
+        eq_(o.get_value("x"), 1)
+        super_cl.attributes = {"y": 2}
+        eq_(o.get_value("y"), 2)
+        try:
+            o.get_value("x")
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "attribute 'x' unknown for 'o'")
+        other_super_cl = CClass(self.mcl, "Other", attributes={"z": 3})
+        cl.superclasses = other_super_cl
+        o.set_value("z", 4)
+        eq_(o.get_value("z"), 4)
+        try:
+            o.get_value("y")
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "attribute 'y' unknown for 'o'")
+
     def test_values_on_primitive_type_attributes(self):
         cl = CClass(self.mcl, "C", attributes={
             "isBoolean": True,
@@ -458,6 +458,69 @@ class TestObjectLinks:
         eq_(o1.get_links_for_association(a1), links_a1)
         eq_(o1.get_links_for_association(a2), links_a2)
 
+    def test_add_links_after_association_changes(self):
+        a1 = self.c1.association(self.c2, "a1: * -> [x] *")
+        o1 = CObject(self.c1, "o1")
+        o2 = CObject(self.c2, "o2")
+        o3 = CObject(self.c2, "o3")
+        links = add_links({o1: o2})
+        eq_(links[0].association, a1)
+        links = add_links({o1: o3}, role_name="x")
+        eq_(links[0].association, a1)
+        a1.role_name = "y"
+        try:
+            add_links({o1: o3}, role_name="x")
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "matching association not found for source 'o1' and targets '['o3']'")
+        a2 = self.c2.association(self.c1, "a2: [x] * -> *")
+        links = add_links({o1: o3}, role_name="x")
+        eq_(links[0].association, a2)
+        eq_(links[0].source, o3)
+        try:
+            add_links({o1: o3})
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "link specification ambiguous, multiple matching associations found " +
+                "for source 'o1' and targets '['o3']'")
+        a2.delete()
+        links = add_links({o1: o3})
+        eq_(links[0].association, a1)
+        c3 = CClass(self.mcl, "C3")
+        o4 = CObject(c3, "o4")
+        try:
+            add_links({o1: o4})
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "matching association not found for source 'o1' and targets '['o4']'")
+        c3.superclasses = self.c2
+        links = add_links({o1: o4})
+        eq_(links[0].association, a1)
+
+    def test_get_linked_by_role_name_over_multiple_associations(self):
+        a1 = self.c1.association(self.c2, "a1: [source] * -> [target] *")
+        a2 = self.c1.association(self.c2, "a2: [source] * -> [target] *")
+        o1 = CObject(self.c1, "o1")
+        o2 = CObject(self.c2, "o2")
+        o3 = CObject(self.c2, "o3")
+        o4 = CObject(self.c2, "o4")
+
+        add_links({o1: o2}, association=a1)
+        add_links({o1: o3}, association=a2)
+        add_links({o1: o4}, association=a1)
+
+        eq_(o1.get_linked(role_name="target"), [o2, o3, o4])
+        eq_(o1.get_linked(role_name="source"), [])
+        eq_(o3.get_linked(role_name="source"), [o1])
+        eq_(o1.get_linked(association=a1, role_name="target"), [o2, o4])
+
+        delete_links({o1: o2})
+        eq_(o1.get_linked(role_name="target"), [o3, o4])
+        eq_(o2.get_linked(), [])
+        add_links({o1: o2}, association=a1)
+        eq_(o1.get_linked(association=a1), [o4, o2])
+        eq_(len(o1.get_links_for_association(a2)), 1)
+
     def test_link_with_inheritance_in_classifier_targets(self):
         sub_class = CClass(self.mcl, superclasses=self.c2)
         a1 = self.c1.association(sub_class, name="a1", multiplicity="*")
@@ -1244,6 +1307,24 @@ class TestObjectLinks:
         add_links({obj_a: [obj_b1, obj_b2]}, role_name="b")
         eq_(set(obj_a.get_linked(role_name="b")), {obj_b1, obj_b2})
 
+    def test_links_after_removing_all_links(self):
+        a = self.c1.association(self.c2, "* -> *")
+        o1 = CObject(self.c1, "o1")
+        o2 = CObject(self.c2, "o2")
+        eq_(o1.links, [])
+        eq_(o1.get_links_for_association(a), [])
+        eq_(o1.get_linked(association=a), [])
+        link = add_links({o1: o2}, association=a)[0]
+        eq_(link.stereotype_instances, [])
+        eq_(link.tagged_values, {})
+        delete_links({o1: o2})
+        eq_(o1.links, [])
+        eq_(o2.get_linked(), [])
+        eq_(o1.get_links_for_association(a), [])
+        add_links({o1: o2}, association=a)
+        eq_(o1.get_linked(association=a), [o2])
+        eq_(o2.get_linked(), [o1])
+
 
 if __name__ == "__main__":
     nose.main()
@@ -0,0 +1,124 @@
+import os
+import shutil
+import sys
+import tempfile
+
+import nose
+from nose.tools import ok_, eq_
+
+from codeable_models import CMetaclass, CClass, CBundle, CException
+from plant_uml_renderer import PlantUMLGenerator, PlantUMLWorkerPool
+from tests.testing_commons import exception_expected_
+
+# a stub for java running PlantUML in pipe mode: each diagram is "rendered" as the output format and the number
+# of the diagram rendered by the process, and diagrams containing "ERROR_TRIGGER" are reported as errors
+JAVA_STUB = '''import sys
+args = sys.argv[1:]
+output_format = next(arg for arg in args if arg.startswith("-t"))[2:]
+delimiter = args[args.index("-pipedelimitor") + 1]
+with open(sys.argv[0] + ".log", "a") as log:
+    log.write(output_format + "\\n")
+number, lines = 0, []
+for line in sys.stdin.buffer:
+    lines.append(line)
+    if line.strip() == b"@enduml":
+        number += 1
+        if any(b"ERROR_TRIGGER" in line for line in lines):
+            sys.stderr.write("ERROR\\n2\\nSyntax Error?\\n")
+            sys.stderr.flush()
+        sys.stdout.buffer.write(f"{output_format!s}:{number!s}\\n{delimiter!s}\\n".encode("ascii"))
+        sys.stdout.buffer.flush()
+        lines = []
+'''
+
+
+class TestPlantUMLWorkerPool:
+    def setup(self):
+        if os.name != "posix":
+            raise nose.SkipTest("the java stub requires a POSIX shell")
+        self.directory = tempfile.mkdtemp()
+        self.java = os.path.join(self.directory, "java")
+        with open(self.java, "w") as file:
+            file.write(f"#!{sys.executable!s}\n" + JAVA_STUB)
+        os.chmod(self.java, 0o755)
+        self.path = os.environ["PATH"]
+        os.environ["PATH"] = self.directory + os.pathsep + self.path
+
+    def teardown(self):
+        os.environ["PATH"] = self.path
+        shutil.rmtree(self.directory)
+
+    def write_source(self, name, source="class A"):
+        file_name = os.path.join(self.directory, name + ".txt")
+        with open(file_name, "w") as file:
+            file.write(f"@startuml\n{source!s}\n@enduml\n")
+        return file_name
+
+    def read(self, name):
+        with open(os.path.join(self.directory, name)) as file:
+            return file.read()
+
+    def get_started_processes(self):
+        return self.read("java.log").split()
+
+    def test_render_in_pipe_mode(self):
+        with PlantUMLWorkerPool("plantuml.jar", workers=1) as pool:
+            futures = [pool.submit(self.write_source(f"d{i!s}"), ["png", "svg"]) for i in range(3)]
+            eq_(futures[0].result(), "@startuml\nclass A\n@enduml\n")
+        eq_([self.read(f"d{i!s}.png") for i in range(3)], ["png:1\n", "png:2\n", "png:3\n"])
+        eq_([self.read(f"d{i!s}.svg") for i in range(3)], ["svg:1\n", "svg:2\n", "svg:3\n"])
+        # one process per format renders all diagrams
+        eq_(self.get_started_processes(), ["png", "svg"])
+
+    def test_concurrent_workers(self):
+        with PlantUMLWorkerPool("plantuml.jar", workers=3) as pool:
+            for i in range(12):
+                pool.submit(self.write_source(f"d{i!s}"), ["svg"])
+        ok_(1 <= len(self.get_started_processes()) <= 3)
+        numbers = [int(self.read(f"d{i!s}.svg").split(":")[1]) for i in range(12)]
+        eq_(len(numbers), 12)
+        ok_(max(numbers) <= 12)
+
+    def test_errors_fail_the_rendering(self):
+        pool = PlantUMLWorkerPool("plantuml.jar", workers=1)
+        error = pool.submit(self.write_source("error", "ERROR_TRIGGER"), ["png"])
+        rendered = pool.submit(self.write_source("ok"), ["png"])
+        try:
+            pool.close()
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, f"PlantUML error in '{self.directory!s}/error.txt': 2 Syntax Error?")
+        eq_(error.exception().value, f"PlantUML error in '{self.directory!s}/error.txt': 2 Syntax Error?")
+        # the error image is written, and the process renders further diagrams
+        eq_(self.read("error.png"), "png:1\n")
+        eq_(rendered.exception(), None)
+        eq_(self.read("ok.png"), "png:2\n")
+
+    def test_illegal_number_of_workers(self):
+        try:
+            PlantUMLWorkerPool("plantuml.jar", workers=0)
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "number of PlantUML workers must be a positive integer, but got: '0'")
+
+    def test_generator_with_workers(self):
+        mcl = CMetaclass("MCL")
+        views = []
+        for name in ["A", "B", "C"]:
+            views += [CBundle(f"view {name!s}", elements=[CClass(mcl, name)]), {}]
+        with PlantUMLGenerator(workers=2) as generator:
+            generator.directory = os.path.join(self.directory, "gen")
+            generator.generate_class_models("classes", views)
+        for name in ["A", "B", "C"]:
+            ok_(self.read(f"gen/classes/view_{name!s}.png").startswith("png:"))
+            ok_(self.read(f"gen/classes/view_{name!s}.svg").startswith("svg:"))
+        # unchanged figures are not rendered again
+        started = len(self.get_started_processes())
+        with PlantUMLGenerator(workers=2) as generator:
+            generator.directory = os.path.join(self.directory, "gen")
+            generator.generate_class_models("classes", views)
+        eq_(len(self.get_started_processes()), started)
+
+
+if __name__ == "__main__":
+    nose.main()
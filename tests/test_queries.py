@@ -0,0 +1,140 @@
+import nose
+from nose.tools import eq_
+
+from codeable_models import CMetaclass, CClass, CException
+from tests.testing_commons import exception_expected_
+
+
+class TestQueries:
+    def setup(self):
+        self.mcl = CMetaclass("MCL")
+        self.item = CClass(self.mcl, "Item", attributes={
+            "category": str,
+            "price": float,
+            "quantity": int,
+            "available": True,
+            "tags": list
+        })
+        self.special_item = CClass(self.mcl, "SpecialItem", superclasses=self.item, columnar=True)
+        self.items = self.item.create_objects(["i1", "i2", "i3", "i4"], columns={
+            "category": ["pen", "pen", "paper", None],
+            "price": [1.5, 12.0, 3.0, 20.0],
+            "quantity": [10, 2, None, 5],
+            "available": [True, True, False, True]
+        })
+        self.special_items = self.special_item.create_objects(["s1", "s2"], columns={
+            "category": ["paper", "pen"],
+            "price": [30.0, 0.5],
+            "quantity": [1, 100]
+        })
+
+    def test_select(self):
+        eq_(self.item.select(), self.items + self.special_items)
+        eq_(self.item.select(("price", ">", 10.0)), [self.items[1], self.items[3], self.special_items[0]])
+        eq_(self.item.select([("price", ">", 10.0), ("category", "==", "pen")]), [self.items[1]])
+        eq_(self.item.select({"category": "paper"}), [self.items[2], self.special_items[0]])
+        eq_(self.item.select(("category", "in", ["pen", "pencil"]), include_subclasses=False),
+            [self.items[0], self.items[1]])
+        eq_(self.item.select(("available", "!=", True)), [self.items[2]])
+        eq_(self.special_item.select(("quantity", "<=", 1)), [self.special_items[0]])
+
+    def test_select_unset_values(self):
+        eq_(self.item.select(("quantity", ">=", 0)),
+            [self.items[0], self.items[1], self.items[3]] + self.special_items)
+        eq_(self.item.select(("category", "!=", "pen")), [self.items[2], self.special_items[0]])
+        eq_(self.item.select(("tags", "==", ["a"])), [])
+
+    def test_aggregate(self):
+        eq_(self.item.aggregate("count"), 6)
+        eq_(self.item.aggregate("count", where=("price", ">", 10.0)), 3)
+        eq_(self.item.aggregate("count", "quantity"), 5)
+        eq_(self.item.aggregate("sum", "quantity"), 118)
+        eq_(self.item.aggregate("sum", "quantity", include_subclasses=False), 17)
+        eq_(self.item.aggregate("min", "price"), 0.5)
+        eq_(self.item.aggregate("max", "price", where={"category": "pen"}), 12.0)
+        eq_(self.item.aggregate("mean", "quantity", where=("category", "==", "paper")), 1.0)
+        eq_(self.item.aggregate("sum", "quantity", where=("price", ">", 100.0)), 0)
+        eq_(self.item.aggregate("mean", "quantity", where=("price", ">", 100.0)), None)
+        eq_(self.special_item.aggregate("sum", "price"), 30.5)
+
+    def test_aggregate_group_by(self):
+        eq_(self.item.aggregate("count", group_by="category"), {"pen": 3, "paper": 2, None: 1})
+        eq_(self.item.aggregate("sum", "quantity", group_by="category"), {"pen": 112, "paper": 1, None: 5})
+        eq_(self.item.aggregate("max", "price", where=("available", "==", True), group_by="category"),
+            {"pen": 12.0, "paper": 30.0, None: 20.0})
+        eq_(self.item.aggregate("mean", "quantity", group_by="available", include_subclasses=False),
+            {True: 17 / 3, False: None})
+
+    def test_query_errors(self):
+        try:
+            self.item.select(("x", "==", 1))
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "attribute 'x' unknown for 'Item'")
+        try:
+            self.item.select(("price", "~", 1))
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "unknown query operator '~'")
+        try:
+            self.item.select(("price", ">"))
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "malformed query condition: '('price', '>')'")
+        try:
+            self.item.select("price")
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "malformed query condition: 'price'")
+        try:
+            self.item.select(("category", ">", 1))
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "cannot compare values of attribute 'category' using '>' with '1'")
+        try:
+            self.item.aggregate("median", "price")
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "unknown aggregate function 'median'")
+        try:
+            self.item.aggregate("sum")
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "aggregate function 'sum' requires an attribute")
+        try:
+            self.item.aggregate("sum", "category")
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "cannot compute 'sum' of the attribute values")
+        self.items[0].set_value("tags", ["a"])
+        try:
+            self.item.aggregate("count", group_by="tags")
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "cannot group by values of attribute 'tags': '['a']' is not hashable")
+
+    def test_query_subclass_redefining_attribute(self):
+        a = CClass(self.mcl, "A", attributes={"x": int, "y": str})
+        b = CClass(self.mcl, "B", superclasses=a, attributes={"x": int}, columnar=True)
+        a1 = a.create_objects(["a1"], columns={"x": [1], "y": ["u"]})[0]
+        b1, b2 = b.create_objects(["b1", "b2"], columns={"x": [5, 7], "y": ["u", "v"]})
+        eq_(b1.get_value("x"), 5)
+        eq_(a.select({"x": 5}), [b1])
+        eq_(a.select(("x", ">", 0)), [a1, b1, b2])
+        eq_(a.aggregate("sum", "x"), 13)
+        eq_(a.aggregate("max", "x", where={"y": "u"}), 5)
+        eq_(a.aggregate("count", "y", group_by="x"), {1: 1, 5: 1, 7: 1})
+        eq_(b.aggregate("count", group_by="x"), {5: 1, 7: 1})
+
+    def test_query_on_deleted_class(self):
+        cl = CClass(self.mcl, "C")
+        cl.delete()
+        try:
+            cl.select()
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "cannot access named element that has been deleted")
+
+
+if __name__ == "__main__":
+    nose.main()
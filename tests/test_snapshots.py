@@ -0,0 +1,127 @@
+import os
+import pickle
+import struct
+import tempfile
+
+import nose
+from nose.tools import ok_, eq_
+
+from codeable_models import CMetaclass, CClass, CObject, CException, CStereotype, CBundle, CEnum, CLayer, \
+    add_links, save_snapshot, load_snapshot
+from codeable_models.csnapshot import SNAPSHOT_MAGIC
+from tests.testing_commons import exception_expected_
+
+
+class TestSnapshots:
+    def setup(self):
+        file_descriptor, self.file_name = tempfile.mkstemp(suffix=".cmsnap")
+        os.close(file_descriptor)
+        self.mcl = CMetaclass("MCL", attributes={"version": 1})
+        self.stereotype = CStereotype("S", extended=self.mcl, attributes={"tag": str, "level": 2})
+        self.colors = CEnum("Colors", values=["red", "blue"])
+        self.cart = CClass(self.mcl, "Cart", attributes={"size": int, "color": self.colors, "tags": list},
+                           stereotype_instances=self.stereotype, values={"version": 3},
+                           tagged_values={"tag": "t"})
+        self.item = CClass(self.mcl, "Item", attributes={"price": 1.5})
+        self.special_item = CClass(self.mcl, "SpecialItem", superclasses=self.item, columnar=True)
+        self.link_stereotype = CStereotype("LS", attributes={"weight": 1})
+        self.association = self.cart.association(self.item, "contains: 1 -> *")
+        self.link_stereotype.extended = self.association
+        self.c1 = CObject(self.cart, "c1", values={"size": 1, "color": "red", "tags": ["a", 1]})
+        self.i1 = CObject(self.item, "i1", values={"price": 2.0})
+        self.s1, self.s2 = self.special_item.create_objects(["s1", "s2"], columns={"price": [3.0, None]})
+        self.links = add_links({self.c1: [self.s1, self.i1, self.s2]}, stereotype_instances=self.link_stereotype)
+        self.bundle = CBundle("B", elements=[self.cart, self.c1, self.links[0]])
+        self.layer = CLayer("L1", sub_layer=CLayer("L2"))
+
+    def teardown(self):
+        os.remove(self.file_name)
+
+    def test_save_and_load_model(self):
+        save_snapshot(self.file_name, [self.bundle, self.layer])
+        bundle, layer = load_snapshot(self.file_name)
+        ok_(bundle is not self.bundle)
+        eq_([e.name for e in bundle.elements], ["Cart", "c1", None])
+        cart, c1, link = bundle.elements
+        mcl = cart.metaclass
+        eq_([cl.name for cl in mcl.classes], ["Cart", "Item", "SpecialItem"])
+        _, item, special_item = mcl.classes
+        eq_(special_item.superclasses, [item])
+        eq_(item.all_subclasses, {special_item})
+        eq_(cart.values, {"version": 3})
+        eq_(cart.stereotype_instances, mcl.stereotypes)
+        eq_(cart.tagged_values, {"tag": "t", "level": 2})
+        eq_(c1.values, {"size": 1, "color": "red", "tags": ["a", 1]})
+        eq_(cart.get_attribute("color").type.values, ["red", "blue"])
+        eq_([o.name for o in c1.linked], ["s1", "i1", "s2"])
+        eq_(c1.links[0], link)
+        eq_(link.stereotype_instances[0].name, "LS")
+        eq_(link.get_tagged_value("weight"), 1)
+        eq_(link.bundles, [bundle])
+        ok_(special_item.columnar)
+        eq_(special_item.get_column("price"), [3.0, 1.5])
+        eq_(layer.sub_layer.name, "L2")
+        eq_(layer.sub_layer.super_layer, layer)
+
+    def test_change_loaded_model(self):
+        save_snapshot(self.file_name, self.cart)
+        cart, = load_snapshot(self.file_name)
+        c1 = cart.get_object("c1")
+        item = cart.metaclass.get_class("Item")
+        i2 = CObject(item, "i2")
+        eq_(i2.get_value("price"), 1.5)
+        add_links({c1: i2})
+        eq_([o.name for o in c1.linked], ["s1", "i1", "s2", "i2"])
+        c1.set_value("size", 2)
+        try:
+            c1.set_value("size", "2")
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "value type for attribute 'size' does not match attribute type")
+        cart.attributes = {"count": 0}
+        eq_(c1.values, {"count": 0})
+        c1.delete()
+        eq_(cart.objects, [])
+        eq_(i2.linked, [])
+        # the saved model is not affected
+        eq_(self.c1.linked, [self.s1, self.i1, self.s2])
+        eq_(self.cart.objects, [self.c1])
+
+    def test_save_errors(self):
+        try:
+            save_snapshot(self.file_name, [self.cart, "x"])
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "'x' is not a model element")
+        try:
+            save_snapshot(self.file_name, "x")
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "elements requires a list or a named element as input")
+        self.i1.delete()
+        try:
+            save_snapshot(self.file_name, self.i1)
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "cannot access named element that has been deleted")
+
+    def test_load_errors(self):
+        with open(self.file_name, "wb") as file:
+            file.write(b"not a snapshot")
+        try:
+            load_snapshot(self.file_name)
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, f"'{self.file_name!s}' is not a model snapshot")
+        with open(self.file_name, "wb") as file:
+            file.write(SNAPSHOT_MAGIC)
+            file.write(pickle.dumps(os.system) + struct.pack("<Q", len(SNAPSHOT_MAGIC)))
+        try:
+            load_snapshot(self.file_name)
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, f"cannot load '{os.system.__module__!s}.system' from a model snapshot")
+
+
+if __name__ == "__main__":
+    nose.main()
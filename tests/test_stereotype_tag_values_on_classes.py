@@ -43,6 +43,25 @@ class TestStereotypeTagValuesOnClasses:
         cl.set_tagged_value("list", [1, 2, 3])
         eq_(cl.get_tagged_value("list"), [1, 2, 3])
 
+    def test_tagged_value_resolution_after_stereotype_changes(self):
+        super_st = CStereotype("SuperST", attributes={"a": 1})
+        self.st.superclasses = super_st
+        eq_(self.cl.get_tagged_value("a"), None)
+        self.cl.set_tagged_value("a", 2)
+        eq_(self.cl.get_tagged_value("a"), 2)
+        super_st.attributes = {"a": 1, "b": "x"}
+        self.cl.set_tagged_value("b", "y")
+        eq_(self.cl.get_tagged_value("b"), "y")
+        self.st.superclasses = []
+        try:
+            self.cl.get_tagged_value("b")
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "tagged value 'b' unknown for 'C'")
+        other_st = CStereotype("OtherST", extended=self.mcl, attributes={"c": True})
+        self.cl.stereotype_instances = [self.st, other_st]
+        eq_(self.cl.get_tagged_value("c"), True)
+
     def test_attribute_of_tagged_value_unknown(self):
         try:
             self.cl.get_tagged_value("x")
@@ -0,0 +1,219 @@
+import nose
+from nose.tools import ok_, eq_
+
+from codeable_models import CMetaclass, CClass, CObject, CException, CStereotype, CBundle, add_links, set_links, \
+    delete_links, model_transaction
+from tests.testing_commons import exception_expected_
+
+
+class TestTransactions:
+    def setup(self):
+        self.mcl = CMetaclass("MCL")
+        self.cart = CClass(self.mcl, "Cart", attributes={"size": int, "label": "cart"})
+        self.item = CClass(self.mcl, "Item")
+        self.a = self.cart.association(self.item, "contains: 1 -> 1..3")
+        self.c1 = CObject(self.cart, "c1")
+        self.c2 = CObject(self.cart, "c2")
+        self.i1 = CObject(self.item, "i1")
+        self.i2 = CObject(self.item, "i2")
+        self.i3 = CObject(self.item, "i3")
+
+    def test_deferred_multiplicity_checks(self):
+        add_links({self.c1: [self.i1, self.i2]})
+        add_links({self.c2: self.i3})
+        try:
+            # the link from c2 is deleted first, leaving c2 without items
+            delete_links({self.c2: self.i3})
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "links of object 'c2' have wrong multiplicity '0': should be '1..3'")
+        with model_transaction():
+            delete_links({self.c2: self.i3})
+            delete_links({self.c1: self.i2})
+            add_links({self.c2: [self.i2, self.i3]})
+        eq_(self.c1.linked, [self.i1])
+        eq_(self.c2.linked, [self.i2, self.i3])
+        eq_(self.i2.linked, [self.c2])
+
+    def test_failed_commit_rolls_back_links(self):
+        links = add_links({self.c1: [self.i1, self.i2]})
+        add_links({self.c2: self.i3})
+        try:
+            with model_transaction():
+                delete_links({self.c1: self.i1})
+                # also removes the link from c1 to i2
+                set_links({self.c2: [self.i1, self.i2]})
+                eq_(self.c1.linked, [])
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "links of object 'c1' have wrong multiplicity '0': should be '1..3'")
+        eq_(self.c1.links, links)
+        eq_(self.c1.linked, [self.i1, self.i2])
+        eq_(self.c2.linked, [self.i3])
+        eq_(self.i1.linked, [self.c1])
+        eq_(self.i2.linked, [self.c1])
+        eq_(self.i3.linked, [self.c2])
+        eq_(self.c1.get_links_for_association(self.a), links)
+        ok_(not links[0].is_deleted)
+        eq_(links[0].classifier, self.a)
+
+    def test_exception_in_transaction_rolls_back(self):
+        add_links({self.c1: self.i1})
+        self.c1.set_value("size", 1)
+        try:
+            with model_transaction():
+                add_links({self.c1: self.i2})
+                self.c1.set_value("size", 2)
+                self.c1.delete_value("label")
+                raise CException("abort")
+        except CException as e:
+            eq_(e.value, "abort")
+        eq_(self.c1.linked, [self.i1])
+        eq_(self.i2.links, [])
+        eq_(self.c1.values, {"size": 1, "label": "cart"})
+
+    def test_deferred_value_type_checks(self):
+        with model_transaction():
+            self.c1.set_value("size", "two")
+            eq_(self.c1.get_value("size"), "two")
+            self.c1.set_value("size", 2)
+            add_links({self.c1: self.i1})
+        eq_(self.c1.get_value("size"), 2)
+        try:
+            with model_transaction():
+                self.c1.set_value("size", 3)
+                self.c2.set_value("label", 1)
+                add_links({self.c2: self.i2})
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "value type for attribute 'label' does not match attribute type")
+        eq_(self.c1.get_value("size"), 2)
+        eq_(self.c2.get_value("label"), "cart")
+        eq_(self.c2.links, [])
+
+    def test_rollback_restores_stereotypes_and_bundles_of_links(self):
+        s = CStereotype("S", extended=self.a)
+        b = CBundle("B")
+        link = add_links({self.c1: self.i1}, stereotype_instances=s)[0]
+        b.add(link)
+        with model_transaction() as transaction:
+            delete_links({self.c1: self.i1})
+            ok_(link.is_deleted)
+            eq_(s.extended_instances, [])
+            transaction.rollback()
+        ok_(not link.is_deleted)
+        eq_(link.stereotype_instances, [s])
+        eq_(s.extended_instances, [link])
+        eq_(b.elements, [link])
+        eq_(self.c1.links, [link])
+
+    def test_links_of_deleted_objects_are_not_restored(self):
+        link = add_links({self.c1: self.i1})[0]
+        try:
+            with model_transaction():
+                self.i1.delete()
+                raise CException("abort")
+        except CException:
+            pass
+        ok_(link.is_deleted)
+        eq_(self.c1.links, [])
+
+    def test_rollback_deletes_created_elements(self):
+        try:
+            with model_transaction():
+                obj = CObject(self.cart, "c3", values={"size": 3})
+                eq_(obj.values, {"size": 3, "label": "cart"})
+                cl = CClass(self.mcl, "Box", superclasses=self.cart, attributes={"width": 1})
+                box = CObject(cl, "b1", values={"width": 2, "label": "box"})
+                add_links({obj: self.i1, box: self.i2})
+                self.c1.set_value("size", 1)
+                raise CException("abort")
+        except CException as e:
+            eq_(e.value, "abort")
+        ok_(obj.is_deleted)
+        ok_(cl.is_deleted)
+        ok_(box.is_deleted)
+        eq_(self.cart.objects, [self.c1, self.c2])
+        eq_(self.cart.subclasses, [])
+        eq_(self.mcl.classes, [self.cart, self.item])
+        eq_(self.i1.links, [])
+        eq_(self.i2.links, [])
+        eq_(self.c1.values, {"label": "cart"})
+
+    def test_failed_commit_deletes_created_objects(self):
+        try:
+            with model_transaction():
+                obj = CObject(self.cart, "c3", values={"size": 3})
+                add_links({obj: [self.i1, self.i2]})
+                add_links({self.c1: self.i1})
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "links of object 'i1' have wrong multiplicity '2': should be '1'")
+        ok_(obj.is_deleted)
+        eq_(self.cart.objects, [self.c1, self.c2])
+        eq_(self.i1.links, [])
+        eq_(self.c1.links, [])
+        # objects created in a committed transaction keep their values
+        with model_transaction():
+            obj = CObject(self.cart, "c3", values={"size": 3})
+            add_links({obj: self.i1})
+        eq_(obj.values, {"size": 3, "label": "cart"})
+        eq_(obj.linked, [self.i1])
+
+    def test_deferred_checks_only(self):
+        with model_transaction(deferred_checks_only=True):
+            add_links({self.c1: self.i1})
+            add_links({self.c1: self.i2})
+            try:
+                self.c1.set_value("size", "two")
+                exception_expected_()
+            except CException as e:
+                eq_(e.value, "value type for attribute 'size' does not match attribute type")
+        eq_(self.c1.linked, [self.i1, self.i2])
+        try:
+            with model_transaction(deferred_checks_only=True):
+                obj = CObject(self.cart, "c3", values={"size": 3})
+                add_links({obj: self.i1})
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "links of object 'i1' have wrong multiplicity '2': should be '1'")
+        # the changes are not rolled back
+        ok_(not obj.is_deleted)
+        eq_(obj.values, {"size": 3, "label": "cart"})
+        eq_(self.i1.linked, [self.c1, obj])
+
+    def test_nested_transactions(self):
+        try:
+            with model_transaction() as outer:
+                with model_transaction() as inner:
+                    add_links({self.c1: self.i1})
+                    ok_(outer.is_active)
+                    ok_(not inner.is_active)
+                eq_(self.c1.linked, [self.i1])
+                add_links({self.c1: [self.i2, self.i3]})
+                add_links({self.c2: self.i2})
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "links of object 'i2' have wrong multiplicity '2': should be '1'")
+        eq_(self.c1.links, [])
+        ok_(not outer.is_active)
+
+    def test_commit_inactive_transaction(self):
+        transaction = model_transaction()
+        try:
+            transaction.commit()
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "transaction is not active")
+        with transaction:
+            add_links({self.c1: self.i1})
+        try:
+            transaction.rollback()
+            exception_expected_()
+        except CException as e:
+            eq_(e.value, "transaction is not active")
+        eq_(self.c1.linked, [self.i1])
+
+
+if __name__ == "__main__":
+    nose.main()